@@ -1,29 +1,82 @@
-import allure
+from functools import partial
+from typing import AsyncIterator, Iterator
+
 from httpx import Response
 
-from models.posts import DefaultPost, UpdatePost
-from utils.clients.http.client import APIClient
+from models.posts import DefaultPost, DefaultPostsList, UpdatePost
+from utils.clients.http.client import APIClient, AsyncAPIClient
+from utils.clients.http.pagination import aiter_pages, iter_pages, pagination_params
+from utils.clients.http.responses import parse_response
 from utils.constants.routes import APIRoutes
+from utils.steps import async_step, step
 
 
 class PostsClient(APIClient):
-    @allure.step('Getting all posts')
-    def get_all_posts_api(self) -> Response:
-        return self.client.get(APIRoutes.POSTS)
+    @step('Getting all posts')
+    def get_all_posts_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return self.client.get(APIRoutes.POSTS, params=pagination_params(page, per_page))
+
+    def iter_posts(self, per_page: int = 100, prefetch: int = 2) -> Iterator[DefaultPost]:
+        """Stream every post page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_all_posts_api, per_page=per_page)
+        for response in iter_pages(fetch_page, prefetch=prefetch):
+            yield from parse_response(response, DefaultPostsList).root
     
-    @allure.step('Getting all posts for user "{user_id}"')
+    @step('Getting all posts for user "{user_id}"')
     def get_posts_api(self, user_id: int) -> Response:
         return self.client.get(f'{APIRoutes.USERS}/{user_id}/posts')
 
-    @allure.step('Creating post for user "{user_id}"')
+    @step('Creating post for user "{user_id}"')
     def create_post_api(self, user_id: int, payload: DefaultPost) -> Response:
-        return self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload.model_dump(by_alias=True))
+        response = self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.POSTS, response)
     
-    @allure.step('Creating post for user "{user_id}" with raw payload')
+    @step('Creating post for user "{user_id}" with raw payload')
     def create_post_api_raw(self, user_id: int, payload: dict) -> Response:
-        return self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload)    
+        response = self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload)
+        return self._track(APIRoutes.POSTS, response)
+
+    @step('Deleting post with id "{post_id}"')
+    def delete_post_api(self, post_id: int) -> Response:
+        return self.client.delete(f'{APIRoutes.POSTS}/{post_id}')
 
     def create_post(self, user_id: int) -> DefaultPost:
         payload = DefaultPost()
         response = self.create_post_api(user_id, payload)
-        return DefaultPost(**response.json())
\ No newline at end of file
+        return parse_response(response, DefaultPost)
+
+
+class AsyncPostsClient(AsyncAPIClient):
+    @async_step('Getting all posts')
+    async def get_all_posts_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return await self.client.get(APIRoutes.POSTS, params=pagination_params(page, per_page))
+
+    async def iter_posts(self, per_page: int = 100, prefetch: int = 2) -> AsyncIterator[DefaultPost]:
+        """Stream every post page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_all_posts_api, per_page=per_page)
+        async for response in aiter_pages(fetch_page, prefetch=prefetch):
+            for item in parse_response(response, DefaultPostsList).root:
+                yield item
+    
+    @async_step('Getting all posts for user "{user_id}"')
+    async def get_posts_api(self, user_id: int) -> Response:
+        return await self.client.get(f'{APIRoutes.USERS}/{user_id}/posts')
+
+    @async_step('Creating post for user "{user_id}"')
+    async def create_post_api(self, user_id: int, payload: DefaultPost) -> Response:
+        response = await self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.POSTS, response)
+    
+    @async_step('Creating post for user "{user_id}" with raw payload')
+    async def create_post_api_raw(self, user_id: int, payload: dict) -> Response:
+        response = await self.client.post(f'{APIRoutes.USERS}/{user_id}/posts', json=payload)
+        return self._track(APIRoutes.POSTS, response)
+
+    @async_step('Deleting post with id "{post_id}"')
+    async def delete_post_api(self, post_id: int) -> Response:
+        return await self.client.delete(f'{APIRoutes.POSTS}/{post_id}')
+
+    async def create_post(self, user_id: int) -> DefaultPost:
+        payload = DefaultPost()
+        response = await self.create_post_api(user_id, payload)
+        return parse_response(response, DefaultPost)
\ No newline at end of file
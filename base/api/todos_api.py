@@ -1,29 +1,82 @@
-import allure
+from functools import partial
+from typing import AsyncIterator, Iterator
+
 from httpx import Response
 
-from models.todos import DefaultTodo, UpdateTodo
-from utils.clients.http.client import APIClient
+from models.todos import DefaultTodo, DefaultTodosList, UpdateTodo
+from utils.clients.http.client import APIClient, AsyncAPIClient
+from utils.clients.http.pagination import aiter_pages, iter_pages, pagination_params
+from utils.clients.http.responses import parse_response
 from utils.constants.routes import APIRoutes
+from utils.steps import async_step, step
 
 
 class TodosClient(APIClient):
-    @allure.step('Getting all todos')
-    def get_all_todos_api(self) -> Response:
-        return self.client.get(APIRoutes.TODOS)
+    @step('Getting all todos')
+    def get_all_todos_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return self.client.get(APIRoutes.TODOS, params=pagination_params(page, per_page))
+
+    def iter_todos(self, per_page: int = 100, prefetch: int = 2) -> Iterator[DefaultTodo]:
+        """Stream every todo page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_all_todos_api, per_page=per_page)
+        for response in iter_pages(fetch_page, prefetch=prefetch):
+            yield from parse_response(response, DefaultTodosList).root
     
-    @allure.step('Getting all todos for user "{user_id}"')
+    @step('Getting all todos for user "{user_id}"')
     def get_todos_api(self, user_id: int) -> Response:
         return self.client.get(f'{APIRoutes.USERS}/{user_id}/todos')
 
-    @allure.step('Creating todo for user "{user_id}"')
+    @step('Creating todo for user "{user_id}"')
     def create_todo_api(self, user_id: int, payload: UpdateTodo) -> Response:
-        return self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload.model_dump(by_alias=True))
+        response = self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.TODOS, response)
     
-    @allure.step('Creating todo for user "{user_id}" with raw payload')
+    @step('Creating todo for user "{user_id}" with raw payload')
     def create_todo_api_raw(self, user_id: int, payload: dict) -> Response:
-        return self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload)
+        response = self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload)
+        return self._track(APIRoutes.TODOS, response)
     
+    @step('Deleting todo with id "{todo_id}"')
+    def delete_todo_api(self, todo_id: int) -> Response:
+        return self.client.delete(f'{APIRoutes.TODOS}/{todo_id}')
+
     def create_todo(self, user_id: int) -> DefaultTodo:
         payload = UpdateTodo()
         response = self.create_todo_api(user_id, payload)
-        return DefaultTodo(**response.json())
\ No newline at end of file
+        return parse_response(response, DefaultTodo)
+
+
+class AsyncTodosClient(AsyncAPIClient):
+    @async_step('Getting all todos')
+    async def get_all_todos_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return await self.client.get(APIRoutes.TODOS, params=pagination_params(page, per_page))
+
+    async def iter_todos(self, per_page: int = 100, prefetch: int = 2) -> AsyncIterator[DefaultTodo]:
+        """Stream every todo page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_all_todos_api, per_page=per_page)
+        async for response in aiter_pages(fetch_page, prefetch=prefetch):
+            for item in parse_response(response, DefaultTodosList).root:
+                yield item
+    
+    @async_step('Getting all todos for user "{user_id}"')
+    async def get_todos_api(self, user_id: int) -> Response:
+        return await self.client.get(f'{APIRoutes.USERS}/{user_id}/todos')
+
+    @async_step('Creating todo for user "{user_id}"')
+    async def create_todo_api(self, user_id: int, payload: UpdateTodo) -> Response:
+        response = await self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.TODOS, response)
+    
+    @async_step('Creating todo for user "{user_id}" with raw payload')
+    async def create_todo_api_raw(self, user_id: int, payload: dict) -> Response:
+        response = await self.client.post(f'{APIRoutes.USERS}/{user_id}/todos', json=payload)
+        return self._track(APIRoutes.TODOS, response)
+    
+    @async_step('Deleting todo with id "{todo_id}"')
+    async def delete_todo_api(self, todo_id: int) -> Response:
+        return await self.client.delete(f'{APIRoutes.TODOS}/{todo_id}')
+
+    async def create_todo(self, user_id: int) -> DefaultTodo:
+        payload = UpdateTodo()
+        response = await self.create_todo_api(user_id, payload)
+        return parse_response(response, DefaultTodo)
\ No newline at end of file
@@ -1,37 +1,50 @@
-import allure
+from functools import partial
+from typing import AsyncIterator, Iterator
+
 from httpx import Response
 
-from models.users import DefaultUser, UpdateUser 
-from utils.clients.http.client import APIClient
+from models.users import DefaultUser, DefaultUsersList, UpdateUser
+from utils.clients.http.client import APIClient, AsyncAPIClient
+from utils.clients.http.pagination import aiter_pages, iter_pages, pagination_params
+from utils.clients.http.responses import parse_response
 from utils.constants.routes import APIRoutes
+from utils.steps import async_step, step
 
 
 class UsersClient(APIClient):
-    @allure.step('Getting all users')
-    def get_users_api(self) -> Response:
-        return self.client.get(APIRoutes.USERS)
+    @step('Getting all users')
+    def get_users_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return self.client.get(APIRoutes.USERS, params=pagination_params(page, per_page))
+
+    def iter_users(self, per_page: int = 100, prefetch: int = 2) -> Iterator[DefaultUser]:
+        """Stream every user page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_users_api, per_page=per_page)
+        for response in iter_pages(fetch_page, prefetch=prefetch):
+            yield from parse_response(response, DefaultUsersList).root
 
-    @allure.step('Getting user with id "{user_id}"')
+    @step('Getting user with id "{user_id}"')
     def get_user_api(self, user_id: int) -> Response:
         return self.client.get(f'{APIRoutes.USERS}/{user_id}')
 
-    @allure.step('Creating user')
+    @step('Creating user')
     def create_user_api(self, payload: DefaultUser) -> Response:
         print("APIRoutes.USERS", APIRoutes.USERS)
-        return self.client.post(APIRoutes.USERS, json=payload.model_dump(by_alias=True))
+        response = self.client.post(APIRoutes.USERS, json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.USERS, response)
     
-    @allure.step('Creating user with raw payload')
+    @step('Creating user with raw payload')
     def create_user_api_raw(self, payload: dict) -> Response:
-        return self.client.post(APIRoutes.USERS, json=payload)
+        response = self.client.post(APIRoutes.USERS, json=payload)
+        return self._track(APIRoutes.USERS, response)
     
-    @allure.step('Updating user with id "{user_id}"')
+    @step('Updating user with id "{user_id}"')
     def update_user_api(self, user_id: int, payload: UpdateUser) -> Response:
         return self.client.patch(
             f'{APIRoutes.USERS}/{user_id}',
             json=payload.model_dump(by_alias=True)
         )
 
-    @allure.step('Deleting user with id "{user_id}"')
+    @step('Deleting user with id "{user_id}"')
     def delete_user_api(self, user_id: int) -> Response:
         return self.client.delete(f'{APIRoutes.USERS}/{user_id}')
 
@@ -40,4 +53,48 @@ class UsersClient(APIClient):
         print("def create_user(self)", payload)
         response = self.create_user_api(payload)
         response.raise_for_status()
-        return DefaultUser(**response.json())
\ No newline at end of file
+        return parse_response(response, DefaultUser)
+
+
+class AsyncUsersClient(AsyncAPIClient):
+    @async_step('Getting all users')
+    async def get_users_api(self, page: int | None = None, per_page: int | None = None) -> Response:
+        return await self.client.get(APIRoutes.USERS, params=pagination_params(page, per_page))
+
+    async def iter_users(self, per_page: int = 100, prefetch: int = 2) -> AsyncIterator[DefaultUser]:
+        """Stream every user page by page, prefetching the next ``prefetch`` pages."""
+        fetch_page = partial(self.get_users_api, per_page=per_page)
+        async for response in aiter_pages(fetch_page, prefetch=prefetch):
+            for item in parse_response(response, DefaultUsersList).root:
+                yield item
+
+    @async_step('Getting user with id "{user_id}"')
+    async def get_user_api(self, user_id: int) -> Response:
+        return await self.client.get(f'{APIRoutes.USERS}/{user_id}')
+
+    @async_step('Creating user')
+    async def create_user_api(self, payload: DefaultUser) -> Response:
+        response = await self.client.post(APIRoutes.USERS, json=payload.model_dump(by_alias=True))
+        return self._track(APIRoutes.USERS, response)
+    
+    @async_step('Creating user with raw payload')
+    async def create_user_api_raw(self, payload: dict) -> Response:
+        response = await self.client.post(APIRoutes.USERS, json=payload)
+        return self._track(APIRoutes.USERS, response)
+    
+    @async_step('Updating user with id "{user_id}"')
+    async def update_user_api(self, user_id: int, payload: UpdateUser) -> Response:
+        return await self.client.patch(
+            f'{APIRoutes.USERS}/{user_id}',
+            json=payload.model_dump(by_alias=True)
+        )
+
+    @async_step('Deleting user with id "{user_id}"')
+    async def delete_user_api(self, user_id: int) -> Response:
+        return await self.client.delete(f'{APIRoutes.USERS}/{user_id}')
+
+    async def create_user(self) -> DefaultUser:
+        payload = DefaultUser()
+        response = await self.create_user_api(payload)
+        response.raise_for_status()
+        return parse_response(response, DefaultUser)
\ No newline at end of file
@@ -1,62 +1,132 @@
-import os
+from typing import TYPE_CHECKING, Iterator
+
 import pytest
-import httpx
-import respx
 from settings import base_settings
-from utils.mocks.api_mocks import setup_api_mocks, reset_deleted_users
+from utils.clients.http.probe import api_verdict
+
+if TYPE_CHECKING:
+    import respx
 
 pytest_plugins = (
+    'utils.plugins.parallel',
+    'utils.plugins.durations',
+    'utils.plugins.sharding',
+    'utils.plugins.cassettes',
+    'utils.fixtures.clients',
     'utils.fixtures.users',
     'utils.fixtures.posts',
     'utils.fixtures.todos',
     'utils.fixtures.authentication',
 )
 
-# Global flag to track if we should use mocking
+# Global flag to track if we should use mocking, and what decided it
 USE_MOCKING = False
+API_MODE_SOURCE = ''
 
 
-def _check_api_accessibility():
+def _check_api_accessibility(config: pytest.Config) -> None:
     """Check if API is accessible or blocked by Cloudflare."""
-    global USE_MOCKING
-    
-    # Check if we're in CI environment
-    if os.getenv('CI') or os.getenv('GITHUB_ACTIONS'):
-        try:
-            headers = {'Authorization': f'Bearer {base_settings.test_user_token}'}
-            response = httpx.get(f'{base_settings.api_url}posts', headers=headers, timeout=10)
-            
-            # Check if Cloudflare is blocking us
-            if 'Just a moment' in response.text or 'cloudflare' in response.text.lower():
-                USE_MOCKING = True
-                return
-        except httpx.RequestError:
-            USE_MOCKING = True
-            return
+    global USE_MOCKING, API_MODE_SOURCE
+
+    # xdist workers get the controller's verdict instead of probing again
+    worker_input = getattr(config, 'workerinput', None)
+    if worker_input is not None and 'use_mocking' in worker_input:
+        USE_MOCKING = worker_input['use_mocking']
+        API_MODE_SOURCE = 'verdict of the xdist controller'
+        return
+
+    if base_settings.api_mode != 'auto':
+        USE_MOCKING = base_settings.api_mode == 'mock'
+        API_MODE_SOURCE = f'API_MODE={base_settings.api_mode}'
+        return
+
+    # outside CI a blocked API should fail loudly, not quietly switch to the mocks
+    if not base_settings.ci:
+        API_MODE_SOURCE = 'API_MODE=auto outside CI'
+        return
+
+    verdict = api_verdict()
+    USE_MOCKING = verdict.blocked
+    API_MODE_SOURCE = verdict.describe()
+    if USE_MOCKING:
+        print(f"\n⚠️  API unavailable ({API_MODE_SOURCE}) - running with mocked responses")
 
 
 def pytest_configure(config):
     """Configure pytest - check API accessibility."""
-    _check_api_accessibility()
-    if USE_MOCKING:
-        print("\n⚠️  API blocked by Cloudflare - running with mocked responses")
+    global API_MODE_SOURCE
 
+    if base_settings.cassette_mode == 'replay':
+        API_MODE_SOURCE = 'CASSETTE_MODE=replay'
+        print("\n📼 Replaying recorded API responses")
+        return
 
-@pytest.fixture(autouse=True)
-def reset_mock_state():
-    """Reset mock state before each test."""
-    reset_deleted_users()
-    yield
+    _check_api_accessibility(config)
 
 
-@pytest.fixture(autouse=True)
-def mock_api_if_needed(request):
-    """Automatically mock API responses when Cloudflare blocks access."""
+def pytest_report_header(config: pytest.Config) -> str:
+    if base_settings.cassette_mode == 'replay':
+        mode = f'replay of {base_settings.cassette_path}'
+    else:
+        mode = 'mock' if USE_MOCKING else 'live'
+
+    return f'gorest API: {mode} ({API_MODE_SOURCE})'
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    # wall-clock benchmarks are slow and machine dependent, so they are opt-in
+    if 'startup' in (config.getoption('markexpr') or ''):
+        return
+
+    skip = pytest.mark.skip(reason='startup benchmark, run with -m startup')
+    for item in items:
+        if item.get_closest_marker('startup') is not None:
+            item.add_marker(skip)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node) -> None:
+    node.workerinput['use_mocking'] = USE_MOCKING
+
+
+@pytest.fixture(scope='session')
+def use_mocking() -> bool:
+    return USE_MOCKING
+
+
+@pytest.fixture(scope='session')
+def anyio_backend() -> str:
+    """Run async tests on asyncio so they can use ``asyncio.gather``."""
+    return 'asyncio'
+
+
+@pytest.fixture(scope='session', autouse=True)
+def mock_api_if_needed() -> Iterator['respx.MockRouter | None']:
+    """Mock API responses for the whole session when Cloudflare blocks access."""
     if not USE_MOCKING:
-        yield
+        yield None
         return
-    
+
+    # respx and the fake backend are only worth importing when they are used
+    import respx
+    from utils.mocks.api_mocks import setup_api_mocks
+
     with respx.mock(assert_all_called=False) as respx_mock:
         setup_api_mocks(respx_mock)
         yield respx_mock
 
+
+@pytest.fixture(autouse=True)
+def reset_mock_state(mock_api_if_needed: 'respx.MockRouter | None'):
+    """Roll the mock store back to its state before the test."""
+    if mock_api_if_needed is None:
+        yield
+        return
+
+    from utils.mocks.fake_server import fake_gorest
+
+    snapshot = fake_gorest.snapshot()
+    yield
+    fake_gorest.restore(snapshot)
+    mock_api_if_needed.reset()
+
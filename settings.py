@@ -16,6 +16,29 @@ class Settings(BaseSettings):
 
     base_url: str = ""
     test_user_token: str = ""
+    ci: bool = False  # set by CI services
+    api_mode: str = "auto"  # "auto" (probe the API in CI, live elsewhere), "live" or "mock"
+    probe_cache_path: str = ".pytest_cache/gorest/probe.json"
+    probe_cache_ttl: int = 600  # seconds an API probe verdict is reused across runs
+    user_pool_size: int = 5
+    mock_latency_ms: int = 0  # delay of every mocked response, to emulate the live API
+    cleanup_batch_size: int = 10  # concurrent deletes when draining created resources
+    latency_report_path: str = ""  # JSON p50/p95/p99 per route for the whole run, not written when empty
+    cassette_mode: str = "off"  # "off", "record" or "replay"
+    cassette_path: str = "cassettes/gorest.cassette"
+    instrumentation_level: str = ""  # "off", "sampled" or "full"; default: "full" with --alluredir
+    instrumentation_sample_every: int = 10
+    startup_budget_ms: int = 3000  # `pytest --collect-only` wall clock, checked by `pytest -m startup`
+    circuit_breaker_mode: str = "fail_fast"  # "off", "fail_fast" or "fallback" (to the fake backend, fails the run)
+    circuit_breaker_cooldown: float = 30.0
+    retry_max_attempts: int = 3
+    retry_budget_ratio: float = 0.2  # retries allowed per request sent, on top of a small floor
+    http_coalescing_enabled: bool = True
+    http_cache_enabled: bool = False
+    http_cache_max_bytes: int = 8 * 1024 * 1024
+    http_cache_heuristic_ttl: float = 0.0  # seconds entries are served without revalidation, whatever the API says
+    xdist_group_size: int = 0  # tests per resource group when running with -n, 0 disables grouping
+    longest_first_scheduling: bool = True  # with -n, hand out the longest tests of the last run first
 
     @property
     def api_url(self) -> str:
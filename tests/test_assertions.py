@@ -0,0 +1,87 @@
+import allure
+import pytest
+
+from models.users import DefaultUser, UpdateUser
+from utils.assertions.base.expect import expect
+from utils.assertions.base.structural import structural_diff
+
+USER = {'id': 7, 'name': 'Ada', 'email': 'ada@example.com', 'gender': 'female', 'status': 'active'}
+
+
+@allure.feature('Assertions')
+class TestStructuralAssertions:
+
+    @allure.story('Records')
+    @allure.title('Masked fields are not compared')
+    def test_mask(self):
+        expect({**USER, 'status': 'inactive'}) \
+            .set_description('User') \
+            .to_match(DefaultUser(**USER), mask=['status'])
+
+    @allure.story('Records')
+    @allure.title('Coercion converts expected values to the actual type')
+    def test_coerce(self):
+        expected = {**USER, 'id': '7'}
+
+        assert structural_diff(expected, DefaultUser(**USER)) == ["id: expected '7', actual 7"]
+        expect(expected).set_description('User').to_match(DefaultUser(**USER), coerce=True)
+
+    @allure.story('Records')
+    @allure.title('Fields of the actual model decide what is compared')
+    def test_update_model_skips_id(self):
+        payload = UpdateUser(**{field: USER[field] for field in ('name', 'email', 'gender', 'status')})
+
+        expect({**USER, 'id': 8}).set_description('User').to_match(payload)
+
+    @allure.story('Lists')
+    @allure.title('Lists are matched by key in any order')
+    def test_keyed_list(self):
+        users = [DefaultUser(**USER), DefaultUser(**{**USER, 'id': 8, 'name': 'Bob'})]
+        expected = [{**USER, 'id': 8, 'name': 'Bob'}, {**USER, 'name': 'Eve'}, {**USER, 'id': 9}]
+
+        expect(expected[:1] + [USER]).set_description('Users').to_match(users)
+        assert structural_diff(expected, users) == [
+            'id=9: unexpected',
+            "id=7: name: expected 'Eve', actual 'Ada'",
+        ]
+
+    @allure.story('Lists')
+    @allure.title('Records sharing a key are reported, not collapsed')
+    def test_duplicate_keys(self):
+        assert structural_diff([{'id': 1, 'a': 1}, {'id': 1, 'a': 1}], [{'id': 1, 'a': 1}]) == [
+            'id=1: 2 records in expected',
+            "unexpected: {'id': 1, 'a': 1}",
+        ]
+        assert structural_diff([{'id': 1, 'a': 1}, {'id': 1, 'a': 2}], [{'id': 1, 'a': 2}, {'id': 1, 'a': 1}]) == [
+            'id=1: 2 records in expected',
+            'id=1: 2 records in actual',
+        ]
+
+    @allure.story('Lists')
+    @allure.title('Lists without a key are matched as multisets')
+    def test_unkeyed_list(self):
+        assert structural_diff([{'a': 1}, {'a': 2}], [{'a': 2}, {'a': 1}], key=None) == []
+        assert structural_diff([{'a': 1}], [{'a': 1, 'b': 2}], key=None) == [
+            "missing: {'a': 1, 'b': 2}",
+            "unexpected: {'a': 1, 'b': <missing>}",
+        ]
+        # lists and dicts cannot be counted, they are matched pairwise
+        assert structural_diff([{'tags': ['x']}, {'tags': ['y']}], [{'tags': ['y']}, {'tags': ['x']}], key=None) == []
+        assert structural_diff([{'tags': ['x']}], [{'tags': ['z']}], key=None) == [
+            "missing: {'tags': ['z']}",
+            "unexpected: {'tags': ['x']}",
+        ]
+
+    @allure.story('Records')
+    @allure.title('A mismatch fails with the diff and attaches it to the step')
+    def test_mismatch(self):
+        attachments = []
+        assertion = expect({**USER, 'name': 'Eve', 'email': 'eve@example.com'}).set_description('User')
+        assertion.attachment_provider = lambda body, name: attachments.append((name, body))
+
+        with pytest.raises(AssertionError) as error:
+            assertion.to_match(DefaultUser(**USER))
+
+        diff = "  name: expected 'Eve', actual 'Ada'\n  email: expected 'eve@example.com', actual 'ada@example.com'"
+        assert str(error.value).startswith(f'"User" does not match:\n{diff}')
+        assert attachments == [('Diff', diff)]
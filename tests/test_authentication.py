@@ -23,7 +23,7 @@ class TestBearerTokenAuth:
         json_response: list[UserDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultUsersList.model_json_schema())
+        validate_schema(json_response, DefaultUsersList)
 
     @allure.story('Bearer Token Auth')
     @allure.title('Invalid bearer token should return 401')
@@ -50,7 +50,7 @@ class TestQueryParameterAuth:
         json_response: list[UserDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultUsersList.model_json_schema())
+        validate_schema(json_response, DefaultUsersList)
 
     @allure.story('Query Parameter Auth')
     @allure.title('Invalid query param token should return 401')
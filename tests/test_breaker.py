@@ -0,0 +1,185 @@
+import asyncio
+from types import SimpleNamespace
+
+import allure
+import httpx
+import pytest
+
+import utils.clients.http.breaker as breaker_module
+from settings import base_settings
+from utils.clients.http.breaker import BreakerState, CircuitBreaker, CircuitBreakerTransport, CircuitOpenError
+
+URL = f'{base_settings.api_url}users'
+COOLDOWN = 30.0
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(breaker_module, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def opened_breaker(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, cooldown=COOLDOWN)
+    for failed in (True, False, True, False):
+        breaker.record(failed)
+
+    assert breaker.state is BreakerState.OPEN
+    return breaker
+
+
+def half_open_breaker(clock: Clock) -> CircuitBreaker:
+    breaker = opened_breaker(clock)
+    clock.now += COOLDOWN
+    return breaker
+
+
+def breaker_transport(breaker: CircuitBreaker, handler) -> CircuitBreakerTransport:
+    return CircuitBreakerTransport(httpx.MockTransport(handler), breaker=breaker)
+
+
+@allure.feature('Circuit breaker')
+class TestCircuitBreaker:
+
+    @allure.story('State machine')
+    @allure.title('The breaker opens once the failure ratio is reached over enough calls')
+    def test_opens_on_failure_ratio(self, clock: Clock):
+        breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, cooldown=COOLDOWN)
+
+        for failed in (True, True, True):
+            breaker.record(failed)
+        assert breaker.state is BreakerState.CLOSED
+
+        breaker.record(False)
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.opened == 1
+
+    @allure.story('State machine')
+    @allure.title('Failures below the ratio keep the breaker closed')
+    def test_stays_closed_below_ratio(self, clock: Clock):
+        breaker = CircuitBreaker(window=5, min_calls=5, failure_ratio=0.5, cooldown=COOLDOWN)
+
+        for failed in (True, False, True, False, False, False):
+            breaker.record(failed)
+
+        assert breaker.is_closed
+        assert breaker.allow()
+
+    @allure.story('State machine')
+    @allure.title('An open breaker refuses requests until the cooldown, then lets one trial through')
+    def test_cooldown_then_single_trial(self, clock: Clock):
+        breaker = opened_breaker(clock)
+
+        clock.now += COOLDOWN - 1
+        assert not breaker.allow()
+
+        clock.now += 1
+        assert [breaker.allow() for _ in range(3)] == [True, False, False]
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert breaker.short_circuited == 3
+
+    @allure.story('State machine')
+    @allure.title('The trial outcome closes the breaker or opens it again')
+    @pytest.mark.parametrize('failed,state', [(False, BreakerState.CLOSED), (True, BreakerState.OPEN)])
+    def test_trial_outcome(self, clock: Clock, failed: bool, state: BreakerState):
+        breaker = half_open_breaker(clock)
+
+        assert breaker.allow()
+        breaker.record(failed)
+
+        assert breaker.state is state
+        assert breaker.allow() is (state is BreakerState.CLOSED)
+
+    @allure.story('State machine')
+    @allure.title('A trial that raises an unexpected error hands the trial on')
+    def test_trial_unexpected_error(self, clock: Clock):
+        breaker = half_open_breaker(clock)
+
+        def broken(request: httpx.Request) -> httpx.Response:
+            raise RuntimeError('bug in a lower transport')
+
+        with pytest.raises(RuntimeError):
+            httpx.Client(transport=breaker_transport(breaker, broken)).get(URL)
+
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert breaker.allow()
+
+    @allure.story('State machine')
+    @allure.title('A cancelled trial hands the trial on')
+    @pytest.mark.anyio
+    async def test_trial_cancelled(self):
+        # the async test runs on the real clock, so a zero cooldown half-opens right away
+        breaker = CircuitBreaker(window=1, min_calls=1, failure_ratio=1.0, cooldown=0)
+        breaker.record(True)
+        started = asyncio.Event()
+
+        async def hanging(request: httpx.Request) -> httpx.Response:
+            started.set()
+            await asyncio.Event().wait()
+
+        async with httpx.AsyncClient(transport=breaker_transport(breaker, hanging)) as client:
+            trial = asyncio.create_task(client.get(URL))
+            await started.wait()
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert breaker.allow()
+
+    @allure.story('Transport')
+    @allure.title('Server errors and dropped connections open the breaker')
+    def test_transport_records_failures(self, clock: Clock):
+        breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, cooldown=COOLDOWN)
+        outcomes = iter([httpx.Response(200), httpx.Response(503), httpx.ConnectError('refused'), httpx.Response(201)])
+
+        def upstream(request: httpx.Request) -> httpx.Response:
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        client = httpx.Client(transport=breaker_transport(breaker, upstream))
+        client.get(URL), client.get(URL)
+        with pytest.raises(httpx.ConnectError):
+            client.get(URL)
+        client.get(URL)
+
+        assert breaker.state is BreakerState.OPEN
+
+    @allure.story('Modes')
+    @allure.title('fail_fast refuses requests while the breaker is open')
+    def test_fail_fast(self, clock: Clock, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(base_settings, 'circuit_breaker_mode', 'fail_fast')
+        breaker = opened_breaker(clock)
+        sent: list[httpx.Request] = []
+
+        client = httpx.Client(transport=breaker_transport(breaker, lambda request: sent.append(request)))
+        with pytest.raises(CircuitOpenError):
+            client.get(URL)
+
+        assert sent == []
+        assert breaker.fallback_served == 0
+
+    @allure.story('Modes')
+    @allure.title('fallback answers from the fake backend while the breaker is open, and counts it')
+    def test_fallback(self, clock: Clock, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(base_settings, 'circuit_breaker_mode', 'fallback')
+        breaker = opened_breaker(clock)
+        sent: list[httpx.Request] = []
+
+        client = httpx.Client(transport=breaker_transport(breaker, lambda request: sent.append(request)))
+        response = client.get(URL)
+
+        assert response.status_code == 200
+        assert sent == []
+        assert breaker.fallback_served == 1
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import allure
+import httpx
+import pytest
+
+from utils.clients.http.cassette import (CassetteMissError, CassetteReader, CassetteReplayTransport,
+                                         CassetteWriter, cassette_scope, merge_cassettes)
+
+URL = 'https://gorest.invalid/public/v2/users'
+
+
+def request(token: str = 'valid') -> httpx.Request:
+    return httpx.Request('GET', URL, headers={'Authorization': f'Bearer {token}'})
+
+
+def record(path: Path, calls: list[tuple[str, str, int, str]]) -> None:
+    """Record ``(scope, token, status, body)`` calls into a cassette."""
+    writer = CassetteWriter(path)
+    for scope, token, status, body in calls:
+        with cassette_scope(scope):
+            writer.record(request(token), httpx.Response(status, content=body.encode()))
+    writer.close()
+
+
+def replay(path: Path, scope: str, token: str = 'valid') -> httpx.Response:
+    with cassette_scope(scope):
+        return CassetteReplayTransport(CassetteReader(path)).handle_request(request(token))
+
+
+@allure.feature('Cassettes')
+class TestCassette:
+
+    @allure.story('Replay')
+    @allure.title('Requests with different credentials replay their own responses')
+    def test_replay_keys_on_credentials(self, tmp_path: Path):
+        path = tmp_path / 'gorest.cassette'
+        record(path, [('test-a', 'invalid', 401, 'denied'), ('test-a', 'valid', 200, 'users')])
+
+        assert replay(path, 'test-a').status_code == 200
+        assert replay(path, 'test-a', token='invalid').status_code == 401
+
+    @allure.story('Replay')
+    @allure.title('Repeated requests are counted per test, and a miss fails')
+    def test_replay_counts_per_scope(self, tmp_path: Path):
+        path = tmp_path / 'gorest.cassette'
+        record(path, [('test-a', 'valid', 200, 'a1'), ('test-a', 'valid', 200, 'a2'), ('test-b', 'valid', 200, 'b1')])
+        transport = CassetteReplayTransport(CassetteReader(path))
+
+        # test-b replays on its own, as in a run that deselected test-a
+        with cassette_scope('test-b'):
+            assert transport.handle_request(request()).content == b'b1'
+            with pytest.raises(CassetteMissError):
+                transport.handle_request(request())
+
+        with cassette_scope('test-a'):
+            assert [transport.handle_request(request()).content for _ in range(2)] == [b'a1', b'a2']
+
+    @allure.story('Record')
+    @allure.title('Worker cassettes merge into one, keeping the first copy of shared records')
+    def test_merge_cassettes(self, tmp_path: Path):
+        first, second, merged = tmp_path / 'g-gw0.cassette', tmp_path / 'g-gw1.cassette', tmp_path / 'g.cassette'
+        record(first, [('session:user_pool', 'valid', 201, 'pool'), ('test-a', 'valid', 200, 'a')])
+        record(second, [('session:user_pool', 'valid', 201, 'other pool'), ('test-b', 'valid', 200, 'b')])
+
+        assert merge_cassettes([first, second], merged) == 3
+        assert replay(merged, 'session:user_pool').content == b'pool'
+        assert replay(merged, 'test-a').content == b'a'
+        assert replay(merged, 'test-b').content == b'b'
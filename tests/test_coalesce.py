@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+import allure
+import httpx
+import pytest
+
+import utils.clients.http.coalesce as coalesce_module
+from models.users import DefaultUser
+from utils.clients.http.coalesce import COALESCE_EXTENSION, CoalescingTransport
+from utils.clients.http.responses import parse_response
+
+BASE_URL = 'https://gorest.invalid/public/v2'
+USER = b'{"id": 1, "name": "Ann", "email": "ann@example.com", "gender": "female", "status": "active"}'
+
+
+class Upstream:
+    """Holds every request until ``release`` is set, and counts what reaches it."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await self.release.wait()
+        return httpx.Response(200, content=USER)
+
+    async def reached(self, count: int) -> None:
+        async def wait() -> None:
+            while len(self.requests) < count:
+                await asyncio.sleep(0)
+
+        # a regression should fail the test, not hang it
+        await asyncio.wait_for(wait(), timeout=1)
+
+
+class Interrupted(BaseException):
+    """Stands in for a KeyboardInterrupt or a timeout raised in the leader's thread."""
+
+
+class ThreadedUpstream:
+    """Holds every request until ``release`` lets one through, answering with the next outcome."""
+
+    def __init__(self, *outcomes: BaseException) -> None:
+        self.outcomes = list(outcomes)
+        self.requests: list[httpx.Request] = []
+        self._gate = threading.Semaphore(0)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        assert self._gate.acquire(timeout=5), 'never released'
+        if self.outcomes:
+            raise self.outcomes.pop(0)
+
+        return httpx.Response(200, content=USER)
+
+    def release(self) -> None:
+        self._gate.release()
+
+
+class WaitCountingEvent(threading.Event):
+    def __init__(self, waits: list['WaitCountingEvent']) -> None:
+        super().__init__()
+        self._waits = waits
+
+    def wait(self, timeout: float | None = None) -> bool:
+        self._waits.append(self)
+        return super().wait(timeout)
+
+
+@pytest.fixture
+def follower_waits(monkeypatch: pytest.MonkeyPatch) -> list[WaitCountingEvent]:
+    """Every wait of a follower on a sync flight, so a test knows the followers are in place."""
+    waits: list[WaitCountingEvent] = []
+    flight = coalesce_module._Flight
+    monkeypatch.setattr(coalesce_module, '_Flight', lambda: flight(done=WaitCountingEvent(waits)))
+    return waits
+
+
+def until(condition: Callable[[], bool]) -> None:
+    # a regression should fail the test, not hang it
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.001)
+
+
+def coalescing_client(upstream: Upstream) -> tuple[httpx.AsyncClient, CoalescingTransport]:
+    transport = CoalescingTransport(httpx.MockTransport(upstream))
+    return httpx.AsyncClient(base_url=BASE_URL, transport=transport), transport
+
+
+@allure.feature('Coalescing')
+class TestCoalescing:
+
+    @allure.story('Single flight')
+    @allure.title('Concurrent identical GETs reach the API once')
+    @pytest.mark.anyio
+    async def test_concurrent_gets(self):
+        upstream = Upstream()
+        client, transport = coalescing_client(upstream)
+
+        requests = [asyncio.create_task(client.get('/users/1')) for _ in range(5)]
+        await upstream.reached(1)
+        upstream.release.set()
+        responses = await asyncio.gather(*requests)
+
+        assert len(upstream.requests) == 1
+        assert transport.coalesced == 4
+        assert [response.content for response in responses] == [USER] * 5
+        assert sum(bool(response.extensions.get(COALESCE_EXTENSION)) for response in responses) == 4
+
+    @allure.story('Single flight')
+    @allure.title('Different requests and writes are not coalesced')
+    @pytest.mark.anyio
+    async def test_distinct_requests(self):
+        upstream = Upstream()
+        upstream.release.set()
+        client, transport = coalescing_client(upstream)
+
+        await asyncio.gather(
+            client.get('/users/1'),
+            client.get('/users/1', headers={'Authorization': 'Bearer other'}),
+            client.get('/users/2'),
+            client.post('/users/1'),
+            client.post('/users/1'),
+        )
+
+        assert len(upstream.requests) == 5
+        assert transport.coalesced == 0
+
+    @allure.story('Single flight')
+    @allure.title('Every caller parses its own copy of the body')
+    @pytest.mark.anyio
+    async def test_parsed_body_is_not_shared(self):
+        upstream = Upstream()
+        client, _ = coalescing_client(upstream)
+
+        leader = asyncio.create_task(client.get('/users/1'))
+        await upstream.reached(1)
+        follower = asyncio.create_task(client.get('/users/1'))
+        await asyncio.sleep(0)
+        upstream.release.set()
+        leader_response = await leader
+        # the leader's caller parses before the follower gets its copy
+        user = parse_response(leader_response, DefaultUser)
+        follower_response = await follower
+
+        assert follower_response.extensions[COALESCE_EXTENSION]
+        assert parse_response(follower_response, DefaultUser) is not user
+
+    @allure.story('Cancellation')
+    @allure.title('Cancelling the leader fails only the leader')
+    @pytest.mark.anyio
+    async def test_leader_cancelled(self):
+        upstream = Upstream()
+        client, transport = coalescing_client(upstream)
+
+        leader = asyncio.create_task(client.get('/users/1'))
+        await upstream.reached(1)
+        followers = [asyncio.create_task(client.get('/users/1')) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        # one of the followers goes upstream in its place
+        await upstream.reached(2)
+        upstream.release.set()
+        responses = await asyncio.gather(*followers)
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert [response.status_code for response in responses] == [200] * 3
+        assert len(upstream.requests) == 2
+        assert transport.coalesced == 2
+
+    @allure.story('Cancellation')
+    @allure.title('A cancelled follower does not affect the others')
+    @pytest.mark.anyio
+    async def test_follower_cancelled(self):
+        upstream = Upstream()
+        client, _ = coalescing_client(upstream)
+
+        leader = asyncio.create_task(client.get('/users/1'))
+        await upstream.reached(1)
+        follower, other = asyncio.create_task(client.get('/users/1')), asyncio.create_task(client.get('/users/1'))
+        await asyncio.sleep(0)
+        follower.cancel()
+        upstream.release.set()
+
+        assert (await leader).status_code == 200
+        assert (await other).status_code == 200
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        assert len(upstream.requests) == 1
+
+
+@allure.feature('Coalescing')
+class TestThreadedCoalescing:
+
+    @staticmethod
+    def start(upstream: ThreadedUpstream, waits: list[WaitCountingEvent], followers: int):
+        """Send the leader's GET, then the followers' once it is upstream, and wait until they are all parked."""
+        transport = CoalescingTransport(httpx.MockTransport(upstream))
+        client = httpx.Client(base_url=BASE_URL, transport=transport)
+        executor = ThreadPoolExecutor(max_workers=followers + 1)
+
+        leader = executor.submit(client.get, '/users/1')
+        until(lambda: len(upstream.requests) == 1)
+        others = [executor.submit(client.get, '/users/1') for _ in range(followers)]
+        until(lambda: len(waits) == followers)
+        executor.shutdown(wait=False)
+
+        return transport, leader, others
+
+    @staticmethod
+    def results(futures: list[Future]) -> list[int | type[BaseException]]:
+        """Status code of every response, or the class of what was raised instead."""
+        outcomes = []
+        for future in futures:
+            error = future.exception(timeout=5)
+            outcomes.append(type(error) if error is not None else future.result().status_code)
+
+        return outcomes
+
+    @allure.story('Single flight')
+    @allure.title('Threads sending the same GET wait for the leader and get copies of its response')
+    def test_followers(self, follower_waits: list[WaitCountingEvent]):
+        upstream = ThreadedUpstream()
+        transport, leader, followers = self.start(upstream, follower_waits, followers=3)
+
+        upstream.release()
+        responses = [future.result(timeout=5) for future in [leader, *followers]]
+
+        assert len(upstream.requests) == 1
+        assert transport.coalesced == 3
+        assert [response.content for response in responses] == [USER] * 4
+        assert [bool(response.extensions.get(COALESCE_EXTENSION)) for response in responses] == [False, True, True, True]
+
+    @allure.story('Single flight')
+    @allure.title('The leader\'s error is raised to every thread waiting on it')
+    def test_leader_error(self, follower_waits: list[WaitCountingEvent]):
+        upstream = ThreadedUpstream(httpx.ConnectError('refused'))
+        transport, leader, followers = self.start(upstream, follower_waits, followers=3)
+
+        upstream.release()
+
+        assert self.results([leader, *followers]) == [httpx.ConnectError] * 4
+        assert len(upstream.requests) == 1
+        assert transport.coalesced == 0
+
+    @allure.story('Cancellation')
+    @allure.title('An interrupted leader fails alone and a follower takes over')
+    def test_leader_interrupted(self, follower_waits: list[WaitCountingEvent]):
+        upstream = ThreadedUpstream(Interrupted())
+        transport, leader, followers = self.start(upstream, follower_waits, followers=3)
+
+        upstream.release()
+        # one follower goes upstream in the leader's place, the other two wait for it
+        until(lambda: len(upstream.requests) == 2 and len(follower_waits) == 5)
+        upstream.release()
+
+        assert self.results([leader, *followers]) == [Interrupted, 200, 200, 200]
+        assert len(upstream.requests) == 2
+        assert transport.coalesced == 2
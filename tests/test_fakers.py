@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import allure
+import pytest
+
+import utils.fakers
+from utils.fakers import generate_posts, generate_todos, generate_users
+
+
+class LaterDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None) -> datetime:
+        return datetime(2031, 6, 1, 12, 30, 45)
+
+
+@allure.feature('Test data')
+class TestFakers:
+
+    @allure.story('Bulk generation')
+    @allure.title('The same seed generates the same payloads')
+    @pytest.mark.parametrize('generate', [generate_users, generate_posts, generate_todos])
+    def test_seed_is_deterministic(self, monkeypatch: pytest.MonkeyPatch, generate):
+        first = [item.model_dump() for item in generate(50, seed=1)]
+        # a later clock must not change seeded payloads
+        monkeypatch.setattr(utils.fakers, 'datetime', LaterDatetime)
+        second = [item.model_dump() for item in generate(50, seed=1)]
+
+        assert first == second
+        assert first != [item.model_dump() for item in generate(50, seed=2)]
+
+    @allure.story('Bulk generation')
+    @allure.title('Todos are due within a year of the given start')
+    def test_todos_due_after_start(self):
+        start = datetime(2031, 1, 1)
+        due_dates = [todo.due_on[:10] for todo in generate_todos(100, seed=1, start=start)]
+
+        assert all('2031-01-02' <= due_on <= '2032-01-01' for due_on in due_dates)
+
+    @allure.story('Bulk generation')
+    @allure.title('Seeded emails change from one run to the next')
+    def test_emails_salted_per_run(self, monkeypatch: pytest.MonkeyPatch):
+        first = [user.email for user in generate_users(50, seed=1)]
+        monkeypatch.setattr(utils.fakers, 'RUN_SALT', 'next-run')
+        second = [user.email for user in generate_users(50, seed=1)]
+
+        assert len(set(first)) == 50
+        assert not set(first) & set(second)
+        assert all('.next-run@' in email for email in second)
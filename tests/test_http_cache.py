@@ -0,0 +1,193 @@
+from types import SimpleNamespace
+
+import allure
+import httpx
+import pytest
+
+import utils.clients.http.cache as cache_module
+from utils.clients.http.cache import CACHE_EXTENSION, CachingTransport, HTTPCache
+
+BASE_URL = 'https://gorest.invalid/public/v2'
+
+
+class Upstream:
+    """Answers every GET with its path as the body and counts what reaches it."""
+
+    def __init__(self, cache_control: str = 'max-age=60') -> None:
+        self.cache_control = cache_control
+        self.requests: list[httpx.Request] = []
+        self.on_write = lambda request: None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method != 'GET':
+            self.on_write(request)
+            return httpx.Response(204)
+
+        etag = f'W/"{request.url.path}"'
+        if request.headers.get('If-None-Match') == etag:
+            return httpx.Response(304, headers={'ETag': etag, 'Cache-Control': self.cache_control})
+
+        return httpx.Response(
+            200, content=request.url.path.encode(), headers={'ETag': etag, 'Cache-Control': self.cache_control}
+        )
+
+    def gets(self, path: str) -> int:
+        return sum(1 for request in self.requests if request.method == 'GET' and request.url.path.endswith(path))
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def caching_client(upstream: Upstream, max_bytes: int = 1024, heuristic_ttl: float = 0.0) -> httpx.Client:
+    cache = HTTPCache(max_bytes=max_bytes, heuristic_ttl=heuristic_ttl)
+    return httpx.Client(base_url=BASE_URL, transport=CachingTransport(httpx.MockTransport(upstream), cache=cache))
+
+
+@allure.feature('HTTP cache')
+class TestHTTPCache:
+
+    @allure.story('Hit')
+    @allure.title('A fresh entry is served without calling the API')
+    def test_fresh_hit(self):
+        upstream = Upstream()
+        client = caching_client(upstream)
+
+        first, second = client.get('/users'), client.get('/users')
+
+        assert upstream.gets('/users') == 1
+        assert second.extensions[CACHE_EXTENSION] == 'hit'
+        assert second.content == first.content
+
+    @allure.story('Revalidation')
+    @allure.title('A stale entry is revalidated and a 304 is answered from the cache')
+    def test_revalidation(self):
+        upstream = Upstream(cache_control='no-cache')
+        client = caching_client(upstream)
+
+        client.get('/users')
+        response = client.get('/users')
+
+        assert upstream.gets('/users') == 2
+        assert upstream.requests[-1].headers['If-None-Match'] == 'W/"/public/v2/users"'
+        assert response.status_code == 200
+        assert response.extensions[CACHE_EXTENSION] == 'revalidated'
+        assert response.content == b'/public/v2/users'
+
+    @allure.story('Revalidation')
+    @allure.title('A 304 refreshes the freshness and headers of the entry')
+    def test_revalidation_refreshes(self, clock: Clock):
+        upstream = Upstream(cache_control='max-age=60')
+        client = caching_client(upstream)
+
+        client.get('/users')
+        clock.now += 61
+        upstream.cache_control = 'max-age=120'
+        revalidated = client.get('/users')
+        clock.now += 61
+        hit = client.get('/users')
+
+        assert upstream.gets('/users') == 2
+        assert revalidated.extensions[CACHE_EXTENSION] == 'revalidated'
+        assert revalidated.headers['Cache-Control'] == 'max-age=120'
+        assert hit.extensions[CACHE_EXTENSION] == 'hit'
+
+    @allure.story('Revalidation')
+    @allure.title('A heuristic freshness period skips revalidating what the API marks as stale')
+    def test_heuristic_ttl(self, clock: Clock):
+        upstream = Upstream(cache_control='max-age=0, must-revalidate')
+        client = caching_client(upstream, heuristic_ttl=30)
+
+        client.get('/users')
+        clock.now += 29
+        assert client.get('/users').extensions[CACHE_EXTENSION] == 'hit'
+        clock.now += 1
+        assert client.get('/users').extensions[CACHE_EXTENSION] == 'revalidated'
+        assert upstream.gets('/users') == 2
+
+    @allure.story('Counters')
+    @allure.title('Hits, revalidations and misses are counted')
+    def test_counters(self):
+        upstream = Upstream(cache_control='no-cache')
+        cache = HTTPCache(max_bytes=1024)
+        client = httpx.Client(base_url=BASE_URL, transport=CachingTransport(httpx.MockTransport(upstream), cache=cache))
+
+        client.get('/users'), client.get('/users'), client.get('/posts')
+
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 1, 2)
+
+    @allure.story('Eviction')
+    @allure.title('The least recently used entry is evicted when the cache is full')
+    def test_lru_eviction(self):
+        upstream = Upstream()
+        # room for two of the three bodies
+        client = caching_client(upstream, max_bytes=2 * len(b'/public/v2/posts'))
+
+        client.get('/posts')
+        client.get('/todos')
+        client.get('/posts')
+        client.get('/users')
+
+        assert client.get('/posts').extensions.get(CACHE_EXTENSION) == 'hit'
+        assert client.get('/todos').extensions.get(CACHE_EXTENSION) is None
+        assert upstream.gets('/todos') == 2
+
+    @allure.story('Invalidation')
+    @allure.title('Writes invalidate the cached path')
+    @pytest.mark.parametrize('method,write_path,cached_path', [
+        ('POST', '/users', '/users'),
+        ('PUT', '/users/1', '/users/1'),
+        ('PATCH', '/users/1', '/users'),
+        ('DELETE', '/users/1', '/users/1'),
+        ('POST', '/users/1/posts', '/posts'),
+    ])
+    def test_write_invalidates(self, method: str, write_path: str, cached_path: str):
+        upstream = Upstream()
+        client = caching_client(upstream)
+
+        client.get(cached_path)
+        client.request(method, write_path)
+        response = client.get(cached_path)
+
+        assert upstream.gets(cached_path) == 2
+        assert response.extensions.get(CACHE_EXTENSION) is None
+
+    @allure.story('Invalidation')
+    @allure.title('A read answered while a write is in flight is not cached')
+    def test_read_during_write(self):
+        upstream = Upstream()
+        client = caching_client(upstream)
+        # the read reaches the API before the write is applied, and is answered with the old body
+        upstream.on_write = lambda request: client.get('/users')
+
+        client.post('/users')
+        response = client.get('/users')
+
+        assert upstream.gets('/users') == 2
+        assert response.extensions.get(CACHE_EXTENSION) is None
+
+    @allure.story('Invalidation')
+    @allure.title('A read that was sent before a write and answered after it is not cached')
+    def test_read_spanning_write(self):
+        upstream = Upstream()
+        cache = HTTPCache(max_bytes=1024)
+        client = httpx.Client(base_url=BASE_URL, transport=CachingTransport(httpx.MockTransport(upstream), cache=cache))
+        request = client.build_request('GET', '/users')
+        generation = cache.generation
+
+        client.post('/users')
+        cache.store(request, upstream(request), generation)
+
+        assert cache.lookup(request) is None
@@ -0,0 +1,40 @@
+import random
+
+import allure
+import pytest
+
+from utils.clients.http.metrics import LatencyHistogram, RequestMetrics
+
+
+@allure.feature('Latency report')
+class TestRequestMetrics:
+
+    @allure.story('Histogram')
+    @allure.title('Percentiles stay within the histogram precision')
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+
+        # under 2% relative error with the default precision
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.02)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.02)
+        assert histogram.max == 1_000_000
+
+    @allure.story('Workers')
+    @allure.title('Merged worker histograms give the same report as one process')
+    def test_merge_workers(self):
+        samples = [('GET', '/users', 200 if index % 5 else 404, random.uniform(0.01, 2.0)) for index in range(500)]
+        single, controller = RequestMetrics(), RequestMetrics()
+        workers = [RequestMetrics(), RequestMetrics(), RequestMetrics()]
+        for index, sample in enumerate(samples):
+            single.record(*sample)
+            workers[index % len(workers)].record(*sample)
+        workers[0].record('POST', '/users', 201, 0.3)
+        single.record('POST', '/users', 201, 0.3)
+
+        for worker in workers:
+            controller.add_counters(worker.counters())
+
+        assert controller.summary() == single.summary()
+
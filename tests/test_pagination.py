@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import allure
+import httpx
+import pytest
+
+from utils.clients.http.pagination import PAGES_HEADER, aiter_pages, iter_pages
+
+URL = 'https://gorest.invalid/public/v2/users'
+PER_PAGE = 3
+
+
+class Pages:
+    """A paginated collection that records which pages were asked for."""
+
+    def __init__(self, pages: int, failing_page: int | None = None, header: bool = True) -> None:
+        self.pages = pages
+        self.failing_page = failing_page
+        self.header = header
+        self.requested: list[int] = []
+        self._lock = threading.Lock()
+
+    def response(self, page: int) -> httpx.Response:
+        with self._lock:
+            self.requested.append(page)
+
+        request = httpx.Request('GET', URL, params={'page': page, 'per_page': PER_PAGE})
+        if page == self.failing_page:
+            return httpx.Response(500, request=request)
+
+        items = [{'id': (page - 1) * PER_PAGE + index} for index in range(1, PER_PAGE + 1)] if page <= self.pages else []
+        headers = {PAGES_HEADER: str(self.pages)} if self.header else {}
+        return httpx.Response(200, json=items, headers=headers, request=request)
+
+    def fetch(self, page: int) -> httpx.Response:
+        # later pages answer first, so ordering has to come from the iterator
+        time.sleep(0.002 * (self.pages - page + 1))
+        return self.response(page)
+
+    async def afetch(self, page: int) -> httpx.Response:
+        await asyncio.sleep(0.002 * (self.pages - page + 1))
+        return self.response(page)
+
+
+def ids(responses: list[httpx.Response]) -> list[int]:
+    return [item['id'] for response in responses for item in response.json()]
+
+
+@allure.feature('Pagination')
+class TestPagination:
+
+    @allure.story('Page boundaries')
+    @allure.title('Every page is yielded once, in order, and nothing past the last page is fetched')
+    @pytest.mark.parametrize('pages', [1, 2, 5])
+    @pytest.mark.parametrize('prefetch', [0, 1, 3, 10])
+    def test_iter_pages(self, pages: int, prefetch: int):
+        collection = Pages(pages)
+
+        responses = list(iter_pages(collection.fetch, prefetch=prefetch))
+
+        assert ids(responses) == list(range(1, pages * PER_PAGE + 1))
+        assert sorted(collection.requested) == list(range(1, pages + 1))
+
+    @allure.story('Page boundaries')
+    @allure.title('Without the pages header the first page is the only one')
+    def test_no_pages_header(self):
+        collection = Pages(3, header=False)
+
+        assert len(list(iter_pages(collection.fetch, prefetch=2))) == 1
+        assert collection.requested == [1]
+
+    @allure.story('Prefetch')
+    @allure.title('No more than "prefetch" pages are fetched ahead of the consumer')
+    @pytest.mark.parametrize('prefetch', [0, 1, 2])
+    def test_prefetch_window(self, prefetch: int):
+        collection = Pages(6)
+
+        for page, _ in enumerate(iter_pages(collection.fetch, prefetch=prefetch), start=1):
+            assert max(collection.requested) <= page + prefetch
+
+    @allure.story('Prefetch')
+    @allure.title('A failing page raises after the pages before it')
+    def test_failing_page(self):
+        collection = Pages(5, failing_page=3)
+        responses = []
+
+        with pytest.raises(httpx.HTTPStatusError):
+            for response in iter_pages(collection.fetch, prefetch=2):
+                responses.append(response)
+
+        assert ids(responses) == list(range(1, 2 * PER_PAGE + 1))
+
+    @allure.story('Page boundaries')
+    @allure.title('Async pages are yielded once, in order, and nothing past the last page is fetched')
+    @pytest.mark.parametrize('pages', [1, 2, 5])
+    @pytest.mark.parametrize('prefetch', [0, 1, 3, 10])
+    @pytest.mark.anyio
+    async def test_aiter_pages(self, pages: int, prefetch: int):
+        collection = Pages(pages)
+
+        responses = [response async for response in aiter_pages(collection.afetch, prefetch=prefetch)]
+
+        assert ids(responses) == list(range(1, pages * PER_PAGE + 1))
+        assert sorted(collection.requested) == list(range(1, pages + 1))
+
+    @allure.story('Prefetch')
+    @allure.title('Async prefetch stays within "prefetch" pages of the consumer')
+    @pytest.mark.parametrize('prefetch', [0, 1, 2])
+    @pytest.mark.anyio
+    async def test_aprefetch_window(self, prefetch: int):
+        collection = Pages(6)
+        page = 0
+
+        async for _ in aiter_pages(collection.afetch, prefetch=prefetch):
+            page += 1
+            assert max(collection.requested) <= page + prefetch
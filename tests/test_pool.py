@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Iterator
+
+import allure
+import pytest
+
+from utils.clients.http.pool import ClientPool, PoolStats
+
+if TYPE_CHECKING:
+    import respx
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'[]')
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url(mock_api_if_needed: 'respx.MockRouter | None') -> Iterator[str]:
+    """A local keep-alive server, let through the API mocks: connections are what is counted."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    if mock_api_if_needed is not None:
+        mock_api_if_needed.route(name='local-server', host='127.0.0.1').pass_through()
+
+    yield f'http://127.0.0.1:{server.server_address[1]}/public/v2/'
+
+    if mock_api_if_needed is not None:
+        mock_api_if_needed.routes.pop('local-server')
+    server.shutdown()
+    server.server_close()
+
+
+@allure.feature('HTTP client pool')
+class TestClientPool:
+
+    @allure.story('Connections')
+    @allure.title('Requests on kept-alive connections count as reused, prewarmed ones included')
+    def test_reuse(self, server_url: str):
+        pool = ClientPool()
+        pool.prewarm(base_url=server_url, connections=2)
+        client = pool.get_client(base_url=server_url)
+
+        for _ in range(5):
+            client.get('users')
+        pool.close()
+
+        assert (pool.stats.prewarmed, pool.stats.connections, pool.stats.reused_connections) == (2, 0, 5)
+        assert str(pool.stats) == 'clients: 0 hits / 1 misses, connections: 2 prewarmed, 0 opened / 5 reused over 5 requests'
+
+    @allure.story('Connections')
+    @allure.title('A new connection is counted as opened, not reused')
+    def test_opened(self, server_url: str):
+        pool = ClientPool()
+        client = pool.get_client(base_url=server_url)
+
+        client.get('users'), client.get('users')
+        pool.close()
+
+        assert (pool.stats.connections, pool.stats.reused_connections) == (1, 1)
+
+    @allure.story('Connections')
+    @allure.title('Without network traffic no reuse is claimed')
+    def test_mocked(self):
+        stats = PoolStats(hits=100, misses=1, requests=101)
+
+        assert str(stats) == 'clients: 100 hits / 1 misses, no connections over 101 requests (mocked or replayed)'
@@ -23,7 +23,7 @@ class TestPosts:
         json_response: list[PostDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultPostsList.model_json_schema())
+        validate_schema(json_response, DefaultPostsList)
     
     @allure.story('Get Posts')
     @allure.title('Get all posts for user')
@@ -38,7 +38,7 @@ class TestPosts:
         json_response: list[PostDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultPostsList.model_json_schema())
+        validate_schema(json_response, DefaultPostsList)
     
     @allure.story('Create Posts')
     @allure.title("Create a user's post")
@@ -51,7 +51,7 @@ class TestPosts:
         json_response: PostDict = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.CREATED)
-        validate_schema(json_response, DefaultPost.model_json_schema())
+        validate_schema(json_response, DefaultPost)
     
     @allure.story('Create Posts')
     @allure.title('Create a user post - negative test - missing required fields')
@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING
+
+import allure
+import httpx
+import pytest
+
+import utils.clients.http.rate_limit as rate_limit
+from utils.clients.http.rate_limit import RateLimiter, RateLimitingTransport
+from utils.clients.http.retry import RetryBudget, RetryPolicy, RetryTransport
+
+if TYPE_CHECKING:
+    import respx
+
+URL = 'https://gorest.invalid/public/v2/users'
+
+
+def budget(remaining: int, limit: int = 2, reset: int = 60) -> dict[str, str]:
+    return {'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Reset': str(reset)}
+
+
+@pytest.fixture
+def router() -> 'respx.Router':
+    # imported here so collecting the suite does not load respx, see test_startup
+    import respx
+
+    return respx.Router(assert_all_called=False)
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record the waits of the limiter and the retries instead of sleeping."""
+    waits: list[float] = []
+    monkeypatch.setattr(rate_limit.time, 'sleep', waits.append)
+    return waits
+
+
+def limited_client(router: 'respx.Router', limiter: RateLimiter) -> httpx.Client:
+    transport = RetryTransport(
+        RateLimitingTransport(httpx.MockTransport(router.handler), limiter=limiter),
+        policy=RetryPolicy(max_attempts=3),
+        budget=RetryBudget()
+    )
+    return httpx.Client(transport=transport)
+
+
+@allure.feature('Rate limiting')
+class TestRateLimit:
+
+    @allure.story('Budget')
+    @allure.title('Nothing waits until the API has reported a budget')
+    def test_no_budget(self, router: 'respx.Router', sleeps: list[float]):
+        router.get(URL).mock(return_value=httpx.Response(200))
+        client = limited_client(router, RateLimiter())
+
+        for _ in range(5):
+            client.get(URL)
+
+        assert sleeps == []
+
+    @allure.story('Budget')
+    @allure.title('Requests wait for the window to reset once the budget is spent')
+    def test_budget_spent(self, router: 'respx.Router', sleeps: list[float]):
+        router.get(URL).mock(side_effect=[httpx.Response(200, headers=budget(remaining=1))] + [httpx.Response(200)] * 2)
+        client = limited_client(router, RateLimiter())
+
+        client.get(URL), client.get(URL), client.get(URL)
+
+        # the first sets the budget, the second spends its last token
+        assert sleeps == [pytest.approx(60, abs=1)]
+
+    @allure.story('Retries')
+    @allure.title('Every retried attempt takes a token and reports the budget it was answered with')
+    def test_retries_spend_budget(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(side_effect=[
+            httpx.Response(503, headers={**budget(remaining=0), 'Retry-After': '1'}),
+            httpx.Response(200, headers=budget(remaining=1)),
+        ])
+        limiter = RateLimiter()
+
+        assert limited_client(router, limiter).get(URL).status_code == 200
+
+        # the retry waits for Retry-After, then for the window the 503 said was spent
+        assert route.call_count == 2
+        assert sleeps == [1, pytest.approx(60, abs=1)]
+        assert limiter.acquire() == 0
+        assert limiter.acquire() > 0
+
+    @allure.story('Budget')
+    @allure.title('A worker only spends its share of the budget')
+    def test_share(self, router: 'respx.Router', sleeps: list[float]):
+        router.get(URL).mock(return_value=httpx.Response(200, headers=budget(remaining=10, limit=10)))
+        limiter = RateLimiter(share=0.5)
+        client = limited_client(router, limiter)
+
+        client.get(URL)
+        for _ in range(5):
+            assert limiter.acquire() == 0
+
+        assert limiter.acquire() > 0
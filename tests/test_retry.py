@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import TYPE_CHECKING
+
+import allure
+import httpx
+import pytest
+
+import utils.clients.http.retry as retry
+from utils.clients.http.retry import RetryBudget, RetryPolicy, RetryTransport
+
+if TYPE_CHECKING:
+    import respx
+
+URL = 'https://gorest.invalid/public/v2/users'
+
+
+@pytest.fixture
+def router() -> 'respx.Router':
+    # imported here so collecting the suite does not load respx, see test_startup
+    import respx
+
+    return respx.Router(assert_all_called=False)
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record the waits between attempts instead of sleeping."""
+    waits: list[float] = []
+    monkeypatch.setattr(retry.time, 'sleep', waits.append)
+    return waits
+
+
+def retrying_client(router: 'respx.Router', budget: RetryBudget | None = None) -> httpx.Client:
+    transport = RetryTransport(
+        httpx.MockTransport(router.handler),
+        policy=RetryPolicy(max_attempts=3),
+        budget=budget or RetryBudget()
+    )
+    return httpx.Client(transport=transport)
+
+
+@allure.feature('Retries')
+class TestRetry:
+
+    @allure.story('Transient failures')
+    @allure.title('Transient statuses are retried until the API recovers')
+    @pytest.mark.parametrize('status', [429, 500, 502, 503, 504])
+    def test_retried_statuses(self, router: 'respx.Router', sleeps: list[float], status: int):
+        route = router.get(URL).mock(side_effect=[httpx.Response(status), httpx.Response(status), httpx.Response(200)])
+
+        response = retrying_client(router).get(URL)
+
+        assert response.status_code == 200
+        assert route.call_count == 3
+        assert len(sleeps) == 2
+
+    @allure.story('Transient failures')
+    @allure.title('The last response is returned once the attempts run out')
+    def test_attempts_exhausted(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(return_value=httpx.Response(503))
+
+        response = retrying_client(router).get(URL)
+
+        assert response.status_code == 503
+        assert route.call_count == 3
+
+    @allure.story('Transient failures')
+    @allure.title('Dropped connections are retried')
+    def test_connect_error(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(side_effect=[httpx.ConnectError('refused'), httpx.Response(200)])
+
+        assert retrying_client(router).get(URL).status_code == 200
+        assert route.call_count == 2
+
+    @allure.story('Transient failures')
+    @allure.title('Other errors are not retried')
+    def test_client_error(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(return_value=httpx.Response(404))
+
+        assert retrying_client(router).get(URL).status_code == 404
+        assert route.call_count == 1
+        assert sleeps == []
+
+    @allure.story('Retry-After')
+    @allure.title('Retry-After is honored, in seconds or as a date')
+    @pytest.mark.parametrize('as_date', [False, True], ids=['seconds', 'http-date'])
+    def test_retry_after(self, router: 'respx.Router', sleeps: list[float], as_date: bool):
+        retry_after = '5'
+        if as_date:
+            retry_after = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+        router.get(URL).mock(side_effect=[httpx.Response(429, headers={'Retry-After': retry_after}), httpx.Response(200)])
+
+        assert retrying_client(router).get(URL).status_code == 200
+        # an HTTP date has whole-second precision
+        assert sleeps == [pytest.approx(5, abs=1)]
+
+    @allure.story('Retry-After')
+    @allure.title('A Retry-After beyond the longest wait is not waited for')
+    def test_retry_after_too_long(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(return_value=httpx.Response(429, headers={'Retry-After': '3600'}))
+
+        assert retrying_client(router).get(URL).status_code == 429
+        assert route.call_count == 1
+        assert sleeps == []
+
+    @allure.story('Budget')
+    @allure.title('Retries stop once the run-wide budget is spent')
+    def test_budget_exhausted(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.get(URL).mock(side_effect=[httpx.Response(503), httpx.Response(200), httpx.Response(503)])
+        budget = RetryBudget(ratio=0, min_retries=1)
+        client = retrying_client(router, budget)
+
+        assert client.get(URL).status_code == 200
+        assert client.get(URL).status_code == 503
+        assert route.call_count == 3
+        assert (budget.requests, budget.retries) == (2, 1)
+
+    @allure.story('Idempotency')
+    @allure.title('Non-idempotent methods are not retried')
+    @pytest.mark.parametrize('method', ['POST', 'PUT', 'PATCH'])
+    def test_non_idempotent(self, router: 'respx.Router', sleeps: list[float], method: str):
+        route = router.route(method=method, url=URL).mock(return_value=httpx.Response(503))
+
+        assert retrying_client(router).request(method, URL).status_code == 503
+        assert route.call_count == 1
+
+    @allure.story('Idempotency')
+    @allure.title('Non-idempotent methods are not retried after a dropped connection')
+    def test_non_idempotent_connect_error(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.post(URL).mock(side_effect=httpx.ConnectError('refused'))
+
+        with pytest.raises(httpx.ConnectError):
+            retrying_client(router).post(URL)
+        assert route.call_count == 1
+
+    @allure.story('Idempotency')
+    @allure.title('A request can opt in to retries')
+    def test_opt_in(self, router: 'respx.Router', sleeps: list[float]):
+        route = router.post(URL).mock(side_effect=[httpx.Response(503), httpx.Response(201)])
+
+        response = retrying_client(router).post(URL, extensions={'retry': True})
+
+        assert response.status_code == 201
+        assert route.call_count == 2
+
+    @allure.story('Transient failures')
+    @allure.title('Async requests are retried too')
+    @pytest.mark.anyio
+    async def test_async(self, router: 'respx.Router'):
+        route = router.get(URL).mock(side_effect=[httpx.Response(503), httpx.Response(200)])
+        transport = RetryTransport(
+            httpx.MockTransport(router.async_handler),
+            policy=RetryPolicy(base_delay=0.001, max_delay=0.01),
+            budget=RetryBudget()
+        )
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert (await client.get(URL)).status_code == 200
+        assert route.call_count == 2
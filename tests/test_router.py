@@ -0,0 +1,57 @@
+import allure
+
+from utils.mocks.router import Router
+
+
+def handler(name: str):
+    def handle(*args, **kwargs) -> str:
+        return name
+
+    handle.__name__ = name
+    return handle
+
+
+def routes() -> Router:
+    router = Router()
+    router.add('GET', '/users', handler('list_users'))
+    router.add('POST', '/users/search', handler('search_users'))
+    router.add('GET', '/users/{user_id:int}', handler('get_user'))
+    router.add('GET', '/users/{slug}', handler('get_user_by_slug'))
+    router.add('GET', '/users/{user_id:int}/posts', handler('list_user_posts'))
+    return router
+
+
+def matched(router: Router, method: str, path: str) -> tuple[str, dict] | None:
+    match = router.match(method, path)
+    return None if match is None else (match[0].__name__, match[1])
+
+
+@allure.feature('Mocks')
+class TestRouter:
+
+    @allure.story('Dispatch')
+    @allure.title('Static segments win over parameters, which are converted')
+    def test_match(self):
+        router = routes()
+
+        assert matched(router, 'GET', '/users') == ('list_users', {})
+        assert matched(router, 'GET', '/users/7') == ('get_user', {'user_id': 7})
+        assert matched(router, 'GET', '/users/ada') == ('get_user_by_slug', {'slug': 'ada'})
+        assert matched(router, 'GET', '/users/7/posts/') == ('list_user_posts', {'user_id': 7})
+        assert matched(router, 'POST', '/users/search') == ('search_users', {})
+
+    @allure.story('Dispatch')
+    @allure.title('A path whose best match lacks the method falls back to the next route')
+    def test_backtracks_on_method(self):
+        router = routes()
+
+        assert matched(router, 'GET', '/users/search') == ('get_user_by_slug', {'slug': 'search'})
+
+    @allure.story('Dispatch')
+    @allure.title('Unknown paths and methods do not match')
+    def test_no_match(self):
+        router = routes()
+
+        assert router.match('DELETE', '/users/7') is None
+        assert router.match('GET', '/users/ada/posts') is None
+        assert router.match('GET', '/todos') is None
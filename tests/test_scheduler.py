@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from utils.plugins.durations import DurationHistory, history_nodeid, makespan
+from utils.plugins.scheduler import LongestFirstLoadScheduling, LongestFirstScheduling, supports_longest_first
+
+# work units: the "posts-0" group, the "users-0" group and two ungrouped tests
+COLLECTION = [
+    'tests/test_posts.py::test_a@posts-0',
+    'tests/test_posts.py::test_b@posts-0',
+    'tests/test_users.py::test_c@users-0',
+    'tests/test_todos.py::test_short',
+    'tests/test_todos.py::test_new',
+]
+HISTORY = {
+    'tests/test_posts.py::test_a': [0.0, 1.0, 0.0],
+    'tests/test_posts.py::test_b': [0.0, 1.0, 0.0],
+    'tests/test_users.py::test_c': [0.5, 4.0, 0.5],
+    'tests/test_todos.py::test_short': [0.0, 0.1, 0.0],
+}
+
+
+class Node:
+    """Stands in for xdist's WorkerController, recording what it is sent."""
+
+    def __init__(self, name: str, collection: list[str]) -> None:
+        self.gateway = SimpleNamespace(id=name)
+        self.collection = collection
+        self.shutting_down = False
+        self.sent: list[list[str]] = []
+
+    def send_runtest_some(self, indexes: list[int]) -> None:
+        self.sent.append([self.collection[index] for index in indexes])
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+def schedule(workers: int, scheduling: type = LongestFirstScheduling, collection: list[str] = COLLECTION):
+    history = DurationHistory(SimpleNamespace(get=lambda key, default: HISTORY))
+    config = SimpleNamespace(
+        getvalue=lambda name: [f'{workers}*popen'],
+        getoption=lambda name: None,
+        option=SimpleNamespace(loadscopereorder=False)
+    )
+    scheduler = scheduling(config, history=history)
+    nodes = [Node(f'gw{index}', collection) for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+    for node in nodes:
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+
+    return scheduler, nodes, history
+
+
+@allure.feature('Parallel runs')
+class TestLongestFirstScheduling:
+
+    @allure.story('Scheduling')
+    @allure.title('The installed pytest-xdist supports longest-first scheduling')
+    def test_supported(self):
+        assert supports_longest_first()
+
+    @allure.story('Scheduling')
+    @allure.title('Work units are handed out longest first')
+    def test_longest_first(self):
+        scheduler, (node,), history = schedule(workers=1)
+
+        # users-0 (5.0s), posts-0 (2.0s), test_new (mean of the history, 1.775s), test_short (0.1s);
+        # xdist sends two units up front and the rest as they finish
+        assert node.sent == [
+            ['tests/test_users.py::test_c@users-0'],
+            ['tests/test_posts.py::test_a@posts-0', 'tests/test_posts.py::test_b@posts-0'],
+        ]
+        assert list(scheduler.workqueue) == ['tests/test_todos.py::test_new', 'tests/test_todos.py::test_short']
+        assert history.predicted == sum(sum(phases) for phases in HISTORY.values()) + history.predict('test_new')
+
+    @allure.story('Scheduling')
+    @allure.title('Every worker starts on one of the longest units')
+    def test_longest_units_start_first(self):
+        _, nodes, history = schedule(workers=2)
+
+        assert [node.sent[0] for node in nodes] == [
+            ['tests/test_users.py::test_c@users-0'],
+            ['tests/test_posts.py::test_a@posts-0', 'tests/test_posts.py::test_b@posts-0'],
+        ]
+        assert history.predicted == 5.0
+
+    @allure.story('Scheduling')
+    @allure.title('Under --dist load single tests are sent longest first, in chunks')
+    def test_load_longest_first(self):
+        collection = [nodeid.partition('@')[0] for nodeid in COLLECTION]
+        scheduler, (node,), history = schedule(workers=1, scheduling=LongestFirstLoadScheduling, collection=collection)
+
+        # test_c (5.0s), test_new (1.775s), test_a and test_b (1.0s), test_short (0.1s);
+        # xdist sends two tests up front and the rest as they finish
+        assert node.sent == [['tests/test_users.py::test_c', 'tests/test_todos.py::test_new']]
+        assert [collection[index] for index in scheduler.pending] == [
+            'tests/test_posts.py::test_a', 'tests/test_posts.py::test_b', 'tests/test_todos.py::test_short'
+        ]
+        assert history.predicted == pytest.approx(sum(sum(phases) for phases in HISTORY.values()) + 1.775)
+
+    @allure.story('Scheduling')
+    @allure.title('The critical path is predicted by longest-first assignment')
+    def test_makespan(self):
+        assert makespan([3, 3, 5, 3, 4], workers=2) == (10, [10, 8])
+        assert makespan([1.0], workers=4) == (1.0, [1.0, 0.0, 0.0, 0.0])
+
+    @allure.story('Scheduling')
+    @allure.title('History ignores the xdist group suffix')
+    def test_history_nodeid(self):
+        assert history_nodeid('tests/test_posts.py::test_a@posts-0') == 'tests/test_posts.py::test_a'
+        assert history_nodeid('tests/test_users.py::test_b[a@b.c]') == 'tests/test_users.py::test_b[a@b.c]'
@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import allure
+import pytest
+
+from utils.merge_shards import cache_value_path, main as merge_shards
+from utils.plugins.durations import HISTORY_KEY
+from utils.plugins.sharding import SHARD_SLACK, SHARD_TIMINGS_KEY, parse_shard, pytest_collection_modifyitems
+
+NODEIDS = [f'tests/test_{resource}.py::Test::test_{index}[case-{case}]'
+           for resource in ('users', 'posts', 'todos') for index in range(8) for case in range(3)]
+# every other test has history, the rest are weighted at the mean
+HISTORY = {nodeid: [0.01, 0.1 * (position % 7 + 1), 0.01] for position, nodeid in enumerate(NODEIDS[::2])}
+
+
+def select(value: str, history: dict[str, list[float]] = HISTORY) -> list[str]:
+    """Run the ``--shard`` collection hook over ``NODEIDS`` and return what it keeps."""
+    config = SimpleNamespace(
+        getoption=lambda name: value,
+        cache=SimpleNamespace(get=lambda key, default: history if key == HISTORY_KEY else default),
+        hook=SimpleNamespace(pytest_deselected=lambda items: None)
+    )
+    items = [SimpleNamespace(nodeid=nodeid) for nodeid in NODEIDS]
+    pytest_collection_modifyitems(config, items)
+    return [item.nodeid for item in items]
+
+
+def write_cache(cache_dir: Path, key: str, value: dict) -> None:
+    path = cache_value_path(cache_dir, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(value))
+
+
+@allure.feature('Sharding')
+class TestSharding:
+
+    @allure.story('Shard')
+    @allure.title('Shards are disjoint and together run every test')
+    @pytest.mark.parametrize('total', [1, 2, 3, 7])
+    def test_shards_partition_the_suite(self, total: int):
+        shards = [select(f'{index}/{total}') for index in range(1, total + 1)]
+
+        assert sorted(nodeid for shard in shards for nodeid in shard) == sorted(NODEIDS)
+        assert all(shards)
+
+    @allure.story('Shard')
+    @allure.title('Shards are balanced by recorded duration')
+    def test_shards_are_balanced(self):
+        total = 3
+        durations = {nodeid: sum(HISTORY.get(nodeid, [0.4])) for nodeid in NODEIDS}
+        fair_share = sum(durations.values()) / total
+
+        for index in range(1, total + 1):
+            load = sum(durations[nodeid] for nodeid in select(f'{index}/{total}'))
+            assert load <= (1 + SHARD_SLACK) * fair_share + max(durations.values())
+
+    @allure.story('Shard')
+    @allure.title('Invalid --shard values are rejected')
+    @pytest.mark.parametrize('value', ['0/2', '3/2', '1', 'a/b'])
+    def test_invalid_shard(self, value: str):
+        with pytest.raises(pytest.UsageError):
+            parse_shard(value)
+
+    @allure.story('Merge')
+    @allure.title('Shard timings and allure results merge into one run')
+    def test_merge_shards(self, tmp_path: Path):
+        output = tmp_path / '.pytest_cache'
+        write_cache(output, HISTORY_KEY, {'test_a': [0, 9, 0], 'test_stale': [0, 1, 0]})
+        caches = []
+        for shard, timings in enumerate([{'test_a': [0, 1, 0]}, {'test_b': [0, 2, 0]}], start=1):
+            cache_dir = tmp_path / f'shard-{shard}' / '.pytest_cache'
+            write_cache(cache_dir, SHARD_TIMINGS_KEY, timings)
+            results = tmp_path / f'shard-{shard}' / 'allure-results'
+            results.mkdir()
+            (results / f'{shard}-result.json').write_text('{}')
+            (results / 'environment.properties').write_text(f'shard={shard}')
+            caches.append(cache_dir)
+
+        merge_shards([
+            '--caches', *map(str, caches), '--cache-output', str(output),
+            '--allure-results', *(str(cache.parent / 'allure-results') for cache in caches),
+            '--allure-output', str(tmp_path / 'allure-results'),
+        ])
+
+        assert json.loads(cache_value_path(output, HISTORY_KEY).read_text()) == {
+            'test_a': [0, 1, 0], 'test_b': [0, 2, 0], 'test_stale': [0, 1, 0]
+        }
+        assert sorted(path.name for path in (tmp_path / 'allure-results').iterdir()) == [
+            '1-result.json', '2-result.json', 'environment.properties'
+        ]
+        assert (tmp_path / 'allure-results' / 'environment.properties').read_text() == 'shard=1'
@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import allure
+import pytest
+
+from settings import base_settings
+
+ROOT = Path(__file__).resolve().parent.parent
+# allure is left out: the test modules import it, so collection always pays for it
+HEAVY_MODULES = ('faker', 'jsonschema', 'respx')
+# a real `pytest --collect-only`, entry-point plugins and pytest.ini addopts included
+STARTUP_SCRIPT = f'''
+import json, sys, time
+start = time.perf_counter()
+import pytest
+
+code = pytest.main(['--collect-only', '-q', '-p', 'no:cacheprovider'])
+print(json.dumps({{
+    'code': int(code),
+    'ms': (time.perf_counter() - start) * 1000,
+    'loaded': [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+'''
+
+
+def measure_startup() -> dict:
+    """Start and collect the suite in a fresh interpreter, like every xdist worker does."""
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    measurement = json.loads(result.stdout.splitlines()[-1])
+    assert measurement['code'] == pytest.ExitCode.OK, result.stdout
+
+    return measurement
+
+
+@pytest.mark.startup
+@allure.feature('Startup')
+class TestStartup:
+    """Wall-clock benchmarks: opt-in with ``-m startup``."""
+
+    @allure.story('Startup Time')
+    @allure.title('Heavy dependencies are not imported by collection')
+    def test_heavy_modules_are_lazy(self):
+        assert measure_startup()['loaded'] == []
+
+    @allure.story('Startup Time')
+    @allure.title('Collecting the suite stays within budget')
+    def test_startup_budget(self):
+        # best of three keeps a busy machine from failing the run
+        startup_ms = min(measure_startup()['ms'] for _ in range(3))
+        allure.attach(f'{startup_ms:.1f} ms', name='Startup time')
+
+        assert startup_ms <= base_settings.startup_budget_ms, (
+            f'Collecting the suite took {startup_ms:.1f} ms, '
+            f'budget is {base_settings.startup_budget_ms} ms'
+        )
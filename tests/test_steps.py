@@ -0,0 +1,48 @@
+import asyncio
+
+import allure
+import pytest
+from allure_commons import model2
+from allure_commons.model2 import Status
+
+import utils.steps
+from utils.steps import async_step
+
+
+@async_step('Outer {name}')
+async def outer(name: str) -> None:
+    await asyncio.sleep(0)
+    await inner(name)
+
+
+@async_step('Inner {name}')
+async def inner(name: str) -> None:
+    # let the other task open its steps in between
+    await asyncio.sleep(0)
+    if name == 'broken':
+        raise ValueError(name)
+
+
+def tree(item) -> list:
+    return [(step.name, step.status, tree(step)) for step in item.steps]
+
+
+@allure.feature('Steps')
+class TestAsyncSteps:
+
+    @allure.story('Async steps')
+    @allure.title('Concurrent coroutines keep their steps apart')
+    @pytest.mark.anyio
+    async def test_concurrent_steps_do_not_nest(self, monkeypatch: pytest.MonkeyPatch):
+        test_result = model2.TestResult(name='test')
+        monkeypatch.setattr(utils.steps, '_current_item', lambda: test_result)
+        monkeypatch.setattr(utils.steps, '_enabled', True)
+
+        results = await asyncio.gather(outer('a'), outer('b'), outer('broken'), return_exceptions=True)
+
+        assert isinstance(results[2], ValueError)
+        assert tree(test_result) == [
+            ("Outer 'a'", Status.PASSED, [("Inner 'a'", Status.PASSED, [])]),
+            ("Outer 'b'", Status.PASSED, [("Inner 'b'", Status.PASSED, [])]),
+            ("Outer 'broken'", Status.BROKEN, [("Inner 'broken'", Status.BROKEN, [])]),
+        ]
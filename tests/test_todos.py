@@ -24,7 +24,7 @@ class TestTodos:
         json_response: list[TodoDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultTodosList.model_json_schema())
+        validate_schema(json_response, DefaultTodosList)
     
     @allure.story('Get Todos')
     @allure.title('Get all todos for user')
@@ -39,7 +39,7 @@ class TestTodos:
         json_response: list[TodoDict] = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        validate_schema(json_response, DefaultTodosList.model_json_schema())
+        validate_schema(json_response, DefaultTodosList)
     
     @allure.story('Create Todos')
     @allure.title('Create todo for user')
@@ -51,7 +51,7 @@ class TestTodos:
         json_response: TodoDict = response.json()
 
         assert_status_code(response.status_code, HTTPStatus.CREATED)
-        validate_schema(json_response, DefaultTodo.model_json_schema())   
+        validate_schema(json_response, DefaultTodo)   
 
     @allure.story('Create Todos')
     @allure.title('Create a user todo - negative test - missing required fields')
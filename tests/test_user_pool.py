@@ -0,0 +1,75 @@
+from contextlib import asynccontextmanager
+
+import allure
+import pytest
+
+import utils.user_pool as user_pool_module
+from models.users import DefaultUser
+from utils.user_pool import UserPool
+
+
+class FakeUsersClient:
+    """Creates users in memory, failing the ``failing``-th create."""
+
+    def __init__(self, failing: int | None = None) -> None:
+        self.failing = failing
+        self.creates = 0
+        self.created: list[int] = []
+        self.deleted: list[int] = []
+
+    def __call__(self, client: None) -> 'FakeUsersClient':
+        return self
+
+    async def create_user(self) -> DefaultUser:
+        self.creates += 1
+        user_id = self.creates
+        if user_id == self.failing:
+            raise RuntimeError('422 Unprocessable Entity')
+
+        self.created.append(user_id)
+        return DefaultUser(id=user_id, name='Ada', email=f'ada{user_id}@example.com', gender='female', status='active')
+
+    async def delete_user_api(self, user_id: int) -> None:
+        self.created.remove(user_id)
+        self.deleted.append(user_id)
+
+
+@pytest.fixture
+def users_client(monkeypatch: pytest.MonkeyPatch) -> FakeUsersClient:
+    users_client = FakeUsersClient()
+
+    @asynccontextmanager
+    async def http_client(auth):
+        yield None
+
+    monkeypatch.setattr(user_pool_module, 'AsyncUsersClient', users_client)
+    monkeypatch.setattr(user_pool_module, 'get_async_http_client', http_client)
+    monkeypatch.setattr(user_pool_module, 'Authentication', lambda: None)
+    return users_client
+
+
+@allure.feature('User pool')
+class TestUserPool:
+
+    @allure.story('Lifecycle')
+    @allure.title('The pool creates its users once and deletes them on release')
+    def test_fill_and_release(self, users_client: FakeUsersClient):
+        pool = UserPool(size=3)
+
+        leased = [pool.lease().id for _ in range(4)]
+        pool.release()
+
+        assert leased == [1, 2, 3, 1]
+        assert (users_client.created, sorted(users_client.deleted)) == ([], [1, 2, 3])
+
+    @allure.story('Lifecycle')
+    @allure.title('A failed create deletes the users created alongside it')
+    def test_failed_create(self, users_client: FakeUsersClient):
+        users_client.failing = 2
+        pool = UserPool(size=3)
+
+        with pytest.raises(RuntimeError, match='422'):
+            pool.fill()
+
+        assert users_client.created == []
+        assert sorted(users_client.deleted) == [1, 3]
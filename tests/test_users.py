@@ -1,14 +1,17 @@
+import asyncio
 from http import HTTPStatus
+from itertools import islice
 
 import allure
 import pytest
 
-from base.api.users_api import UsersClient 
+from base.api.users_api import AsyncUsersClient, UsersClient 
 from models.users import (DefaultUser, DefaultUsersList,
                               UserDict, UpdateUser)
 from utils.assertions.api.users import assert_user
 from utils.assertions.base.solutions import assert_status_code
 from utils.assertions.schema import validate_schema
+from utils.clients.http.responses import parse_response
 
 
 @pytest.mark.users
@@ -23,8 +26,16 @@ class TestUsers:
 
         assert_status_code(response.status_code, HTTPStatus.OK)
 
-        validate_schema(
-            json_response, DefaultUsersList.model_json_schema())
+        validate_schema(json_response, DefaultUsersList)
+
+    @allure.story('Get Users')
+    @allure.title('Stream users page by page')
+    def test_iter_users(self, class_users_client: UsersClient):
+        users = list(islice(class_users_client.iter_users(per_page=5, prefetch=2), 20))
+
+        assert users
+        for user in users:
+            assert user.id > 0
 
     @allure.story('Create user')
     @allure.title('Create user - positive')
@@ -39,8 +50,41 @@ class TestUsers:
             actual_user=payload
         )
 
-        validate_schema(json_response, DefaultUser.model_json_schema())
+        validate_schema(json_response, DefaultUser)
     
+    @allure.story('Create user')
+    @allure.title('Decode created user from response bytes')
+    def test_create_user_typed_response(self, class_users_client: UsersClient):
+        payload = UpdateUser()
+        response = class_users_client.create_user_api(payload)
+        user = parse_response(response, DefaultUser)
+
+        assert_status_code(response.status_code, HTTPStatus.CREATED)
+        assert_user(expected_user=response.json(), actual_user=user)
+        assert parse_response(response, DefaultUser) is user
+
+        class_users_client.delete_user_api(user.id)
+
+    @allure.story('Create user')
+    @allure.title('Create users concurrently')
+    @pytest.mark.anyio
+    async def test_create_users_concurrently(self, async_users_client: AsyncUsersClient):
+        payloads = [UpdateUser() for _ in range(5)]
+        responses = await asyncio.gather(
+            *(async_users_client.create_user_api(payload) for payload in payloads)
+        )
+
+        for payload, response in zip(payloads, responses):
+            json_response: UserDict = response.json()
+
+            assert_status_code(response.status_code, HTTPStatus.CREATED)
+            assert_user(expected_user=json_response, actual_user=payload)
+            validate_schema(json_response, DefaultUser)
+
+        await asyncio.gather(
+            *(async_users_client.delete_user_api(response.json()['id']) for response in responses)
+        )
+
     @allure.story('Create user')
     @allure.title('Create user - negative')
     @pytest.mark.parametrize("payload,expected_status", [
@@ -65,7 +109,7 @@ class TestUsers:
 
         assert_status_code(response.status_code, HTTPStatus.OK)
         assert json_response['id'] == function_user.id
-        validate_schema(json_response, DefaultUser.model_json_schema())
+        validate_schema(json_response, DefaultUser)
     
     @allure.story('Get User by ID')
     @allure.title('Get user by ID - user not found')
@@ -78,6 +122,7 @@ class TestUsers:
         assert_status_code(response.status_code, HTTPStatus.NOT_FOUND)
         assert response.json()['message'] == 'Resource not found'
     
+    @pytest.mark.mutates_user
     @allure.story('Update User')
     @allure.title('Update user - positive')
     def test_update_user(
@@ -97,7 +142,7 @@ class TestUsers:
             expected_user=json_response,
             actual_user=payload
         )
-        validate_schema(json_response, DefaultUser.model_json_schema())
+        validate_schema(json_response, DefaultUser)
     
     @allure.story('Update User')
     @allure.title('Update user - user not found')
@@ -111,6 +156,7 @@ class TestUsers:
         assert_status_code(response.status_code, HTTPStatus.NOT_FOUND)
         assert response.json()['message'] == 'Resource not found'
     
+    @pytest.mark.mutates_user
     @allure.story('Delete User')
     @allure.title('Delete user - positive')
     def test_delete_user(
@@ -130,6 +176,7 @@ class TestUsers:
             get_user_response.status_code, HTTPStatus.NOT_FOUND
         )
     
+    @pytest.mark.mutates_user
     @allure.story('Delete User')
     @allure.title('Delete updated user')
     def test_delete_updated_user(
@@ -147,7 +194,7 @@ class TestUsers:
             expected_user=updated_user,
             actual_user=update_payload
         )
-        validate_schema(updated_user, DefaultUser.model_json_schema())
+        validate_schema(updated_user, DefaultUser)
         
         # Delete the updated user
         delete_response = class_users_client.delete_user_api(function_user.id)
@@ -187,6 +234,7 @@ class TestUsers:
         
         assert_status_code(response.status_code, HTTPStatus.UNPROCESSABLE_ENTITY)
 
+    @pytest.mark.mutates_user
     @allure.story('Update user')
     @allure.title('Update user with overflow payload')
     @pytest.mark.parametrize("overflow_size,field_name", [
@@ -1,10 +1,11 @@
-from contextlib import contextmanager
-from typing import Callable, ContextManager, TypeVar
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, TypeVar
 
 from utils.assertions.base.assertion_types import AssertionTypes
 
 T = TypeVar('T')
 StepProvider = Callable[[str], ContextManager]
+AttachmentProvider = Callable[..., None]
 
 
 @contextmanager
@@ -12,11 +13,16 @@ def default_step_provider(step: str):
     yield
 
 
+def default_attachment_provider(body: str, name: str) -> None:
+    pass
+
+
 class AssertionBase:
     def __init__(self, expected: T) -> None:
         self.expected = expected
         self._description: str | None = None
         self._step_provider: StepProvider = default_step_provider
+        self._attachment_provider: AttachmentProvider = default_attachment_provider
 
     def _error_template(self, actual: T, method: AssertionTypes):
         return f"""
@@ -27,6 +33,19 @@ class AssertionBase:
         Expression: assert {self.expected} {method} {actual}
         """
 
+    def _step(self, template: str, **values: Any) -> ContextManager:
+        """Open a step, formatting its name only if a real step provider is set."""
+        if self._step_provider is default_step_provider:
+            return nullcontext()
+
+        return self._step_provider(
+            template.format(description=self._description, expected=self.expected, **values)
+        )
+
+    def _attach(self, body: str, name: str) -> None:
+        """Attach ``body`` to the step that is open, if a real attachment provider is set."""
+        self._attachment_provider(body, name=name)
+
     def set_description(self, description: str):
         self._description = description
         return self
@@ -38,3 +57,11 @@ class AssertionBase:
     @step_provider.setter
     def step_provider(self, provider: StepProvider):
         self._step_provider = provider
+
+    @property
+    def attachment_provider(self) -> AttachmentProvider:
+        return self._attachment_provider
+
+    @attachment_provider.setter
+    def attachment_provider(self, provider: AttachmentProvider):
+        self._attachment_provider = provider
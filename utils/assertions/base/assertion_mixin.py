@@ -1,7 +1,8 @@
-from typing import TypeVar
+from typing import Any, Iterable, TypeVar
 
 from utils.assertions.base.assertion_base import AssertionBase
 from utils.assertions.base.assertion_types import AssertionTypes
+from utils.assertions.base.structural import format_diff, structural_diff
 
 T = TypeVar('T')
 
@@ -9,39 +10,55 @@ T = TypeVar('T')
 class AssertionMixin(AssertionBase):
 
     def is_length(self, length: int):
-        step_name = f'Checking that "{self._description}" has {length} length'
-        with self.step_provider(step_name):
+        with self._step('Checking that "{description}" has {length} length', length=length):
 
             if not hasattr(self.expected, '__len__'):
                 raise NotImplementedError(
                     f'The expected value "{self.expected}" {type(self.expected)} has no length attribute'
                 )
 
-            template = self._error_template(length, AssertionTypes.LENGTH)
-            assert length == len(self.expected), template
+            assert length == len(self.expected), self._error_template(length, AssertionTypes.LENGTH)
 
         return self
 
     def to_be_equal(self, actual: T):
-        step_name = f'Checking that "{self._description}" equals to "{self.expected}"'
-        with self.step_provider(step_name):
-            template = self._error_template(actual, AssertionTypes.EQUAL)
-            assert self.expected == actual, template
+        with self._step('Checking that "{description}" equals to "{expected}"'):
+            assert self.expected == actual, self._error_template(actual, AssertionTypes.EQUAL)
 
         return self
 
     def not_to_be_equal(self, actual: T):
-        step_name = f'Checking that "{self._description}" not equals to "{self.expected}"'
-        with self.step_provider(step_name):
-            template = self._error_template(actual, AssertionTypes.NOT_EQUAL)
-            assert self.expected != actual, template
+        with self._step('Checking that "{description}" not equals to "{expected}"'):
+            assert self.expected != actual, self._error_template(actual, AssertionTypes.NOT_EQUAL)
 
         return self
 
     def in_(self, actual: T):
-        step_name = f'Checking that "{self._description}" in "{self.expected}"'
-        with self.step_provider(step_name):
-            template = self._error_template(actual, AssertionTypes.IN_)
-            assert self.expected != actual, template
+        with self._step('Checking that "{description}" in "{expected}"'):
+            assert self.expected != actual, self._error_template(actual, AssertionTypes.IN_)
+
+        return self
+
+    def to_match(
+        self,
+        actual: Any,
+        mask: Iterable[str] = (),
+        coerce: bool = False,
+        key: str | None = 'id'
+    ):
+        """
+        Compare every field of ``actual`` (a model, a dict or a list of them) in one step.
+
+        ``mask`` leaves fields out, ``coerce`` converts expected values to the
+        actual value's type before comparing, and lists are matched by ``key``.
+        """
+        differences = structural_diff(self.expected, actual, mask=mask, coerce=coerce, key=key)
+        diff = format_diff(differences)
+        with self._step('Checking that "{description}" {method} ({count} differences)',
+                        method=AssertionTypes.MATCH.value, count=len(differences)):
+            if differences:
+                self._attach(diff, name='Diff')
+
+            assert not differences, f'"{self._description}" does not match:\n{diff}'
 
         return self
@@ -6,3 +6,4 @@ class AssertionTypes(str, Enum):
     NOT_EQUAL = '!='
     LENGTH = 'is length'
     IN_ = 'is in'
+    MATCH = 'matches'
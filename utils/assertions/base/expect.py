@@ -1,14 +1,17 @@
 from typing import TypeVar
 
-import allure
-
 from utils.assertions.base.assertion_mixin import AssertionMixin
+from utils.steps import steps_enabled
 
 T = TypeVar('T')
 
 
 def expect(expected: T) -> AssertionMixin:
     assertion = AssertionMixin(expected=expected)
-    assertion.step_provider = allure.step
+    if steps_enabled():
+        import allure
+
+        assertion.step_provider = allure.step
+        assertion.attachment_provider = allure.attach
 
     return assertion
@@ -0,0 +1,188 @@
+"""
+Structural comparison behind ``expect(...).to_match``.
+
+Both sides are turned into plain records (pydantic models are dumped by
+alias, lists of models in one call). The compared fields are those of the
+``actual`` side minus ``mask``, so ``UpdateUser`` checks everything but
+``id`` while ``DefaultUser`` checks ``id`` too. Every record is first
+compared as one ``itemgetter`` tuple; per-field work only happens for
+records that differ. Lists are matched by ``key`` (or as multisets when
+``key`` is ``None`` or not unique, pairwise if a value is unhashable), so
+their order does not matter; duplicated keys are reported. Fields missing
+on either side are reported, not raised.
+"""
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Callable, Iterable
+
+from pydantic import BaseModel, RootModel
+
+from utils.clients.http.responses import get_adapter
+
+Record = dict[str, Any]
+DIFF_LIMIT = 20
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+
+def as_records(value: Any) -> Record | list[Record]:
+    if isinstance(value, RootModel):
+        value = value.root
+
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        return get_adapter(list[type(value[0])]).dump_python(value, by_alias=True)
+
+    return value
+
+
+def _coerce(value: Any, like: Any) -> Any:
+    if like is None or value is None or type(value) is type(like):
+        return value
+
+    try:
+        return type(like)(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _getter(fields: tuple[str, ...]) -> Callable[[Record], tuple]:
+    if not fields:
+        return lambda record: ()
+
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda record: (record[field],)
+
+    return itemgetter(*fields)
+
+
+def _same(getter: Callable[[Record], tuple], expected: Record, actual: Record) -> bool:
+    try:
+        return getter(expected) == getter(actual)
+    except KeyError:
+        return False
+
+
+def _rows(records: list[Record], fields: tuple[str, ...]) -> list[tuple]:
+    try:
+        return list(map(_getter(fields), records))
+    except KeyError:
+        return [tuple(record.get(field, MISSING) for field in fields) for record in records]
+
+
+def diff_record(expected: Record, actual: Record, fields: tuple[str, ...], coerce: bool, prefix: str = '') -> list[str]:
+    lines = []
+    for field in fields:
+        expected_value, actual_value = expected.get(field, MISSING), actual.get(field, MISSING)
+        if expected_value is MISSING or actual_value is MISSING:
+            if expected_value is not actual_value:
+                lines.append(f'{prefix}{field}: expected {expected_value!r}, actual {actual_value!r}')
+            continue
+
+        value = _coerce(expected_value, actual_value) if coerce else expected_value
+        if value != actual_value:
+            lines.append(f'{prefix}{field}: expected {expected_value!r}, actual {actual_value!r}')
+
+    return lines
+
+
+def _duplicates(records: list[Record], key: str, side: str) -> list[str]:
+    counts = Counter(record.get(key, MISSING) for record in records)
+    return [f'{key}={value}: {count} records in {side}' for value, count in counts.items() if count > 1]
+
+
+def _diff_keyed(expected: list[Record], actual: list[Record], fields: tuple[str, ...], key: str, coerce: bool) -> list[str]:
+    duplicates = _duplicates(expected, key, 'expected') + _duplicates(actual, key, 'actual')
+    if duplicates:
+        # matching by key would collapse the duplicates into one record
+        return duplicates + _diff_unkeyed(expected, actual, fields)
+
+    getter = _getter(fields)
+    expected_by_key = {record.get(key, MISSING): record for record in expected}
+    actual_by_key = {record.get(key, MISSING): record for record in actual}
+
+    lines = [f'{key}={value}: missing' for value in actual_by_key.keys() - expected_by_key.keys()]
+    lines += [f'{key}={value}: unexpected' for value in expected_by_key.keys() - actual_by_key.keys()]
+    for value, actual_record in actual_by_key.items():
+        expected_record = expected_by_key.get(value)
+        if expected_record is not None and not _same(getter, expected_record, actual_record):
+            lines += diff_record(expected_record, actual_record, fields, coerce, prefix=f'{key}={value}: ')
+
+    return lines
+
+
+def _unmatched_pairwise(expected_rows: list[tuple], actual_rows: list[tuple]) -> tuple[list[tuple], list[tuple]]:
+    """Quadratic matching by equality, for rows holding lists or dicts."""
+    unexpected, missing = list(expected_rows), []
+    for row in actual_rows:
+        try:
+            unexpected.remove(row)
+        except ValueError:
+            missing.append(row)
+
+    return missing, unexpected
+
+
+def _diff_unkeyed(expected: list[Record], actual: list[Record], fields: tuple[str, ...]) -> list[str]:
+    expected_rows, actual_rows = _rows(expected, fields), _rows(actual, fields)
+    try:
+        expected_counts, actual_counts = Counter(expected_rows), Counter(actual_rows)
+    except TypeError:
+        missing, unexpected = _unmatched_pairwise(expected_rows, actual_rows)
+    else:
+        missing = list((actual_counts - expected_counts).elements())
+        unexpected = list((expected_counts - actual_counts).elements())
+
+    lines = [f'missing: {dict(zip(fields, values))}' for values in missing]
+    lines += [f'unexpected: {dict(zip(fields, values))}' for values in unexpected]
+    return lines
+
+
+def structural_diff(
+    expected: Any,
+    actual: Any,
+    mask: Iterable[str] = (),
+    coerce: bool = False,
+    key: str | None = 'id'
+) -> list[str]:
+    """Return the differences between ``expected`` and ``actual``; empty when they match."""
+    expected, actual = as_records(expected), as_records(actual)
+    masked = frozenset(mask)
+
+    if isinstance(actual, dict):
+        fields = tuple(field for field in actual if field not in masked)
+        if isinstance(expected, dict) and _same(_getter(fields), expected, actual):
+            return []
+        if not isinstance(expected, dict):
+            return [f'expected a record, got {type(expected).__name__}']
+
+        return diff_record(expected, actual, fields, coerce)
+
+    if not isinstance(expected, list):
+        return [f'expected a list, got {type(expected).__name__}']
+
+    if not actual:
+        return [f'{len(expected)} unexpected records'] if expected else []
+
+    fields = tuple(field for field in actual[0] if field not in masked)
+    if key is not None and key in actual[0]:
+        return _diff_keyed(expected, actual, fields, key, coerce)
+
+    return _diff_unkeyed(expected, actual, fields)
+
+
+def format_diff(lines: list[str], limit: int = DIFF_LIMIT) -> str:
+    shown = '\n'.join(f'  {line}' for line in lines[:limit])
+    if len(lines) > limit:
+        shown += f'\n  ... and {len(lines) - limit} more'
+
+    return shown
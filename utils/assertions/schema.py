@@ -1,7 +1,35 @@
-import allure
-from jsonschema import validate
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+from pydantic import BaseModel
 
-@allure.step('Validating schema')
-def validate_schema(instance: dict, schema: dict) -> None:
-    validate(instance=instance, schema=schema)
\ No newline at end of file
+from utils.steps import step
+
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+
+@lru_cache(maxsize=None)
+def get_validator(model: type[BaseModel]) -> 'Validator':
+    """Build the JSON schema of ``model`` and compile its validator once per process."""
+    from jsonschema.validators import validator_for
+
+    schema = model.model_json_schema()
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+
+    return validator_class(schema)
+
+
+@step('Validating schema')
+def validate_schema(instance: dict | list, schema: type[BaseModel] | dict) -> None:
+    from jsonschema import validate
+    from jsonschema.exceptions import best_match
+
+    if isinstance(schema, dict):
+        validate(instance=instance, schema=schema)
+        return
+
+    error = best_match(get_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import httpx
+
+from utils.clients.http.client import HTTPClient
+from utils.constants.routes import APIRoutes
+
+# children first: deleting a user would otherwise cascade and hide leaked posts/todos
+DELETE_ORDER = (APIRoutes.TODOS, APIRoutes.POSTS, APIRoutes.USERS)
+
+
+@dataclass(frozen=True)
+class Leak:
+    route: str
+    resource_id: int
+    reason: str
+
+    def __str__(self) -> str:
+        return f'{self.route}/{self.resource_id}: {self.reason}'
+
+
+class CleanupRegistry:
+    """
+    Resources created by tests, deleted in bulk by ``drain``: todos, then
+    posts, then users, each kind ``batch_size`` deletes at a time. A ``404``
+    means the test already deleted the resource itself; anything else that
+    fails is kept in ``leaks``.
+    """
+
+    def __init__(self, client: HTTPClient, batch_size: int = 10) -> None:
+        self._client = client
+        self._batch_size = max(batch_size, 1)
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[int]] = {route: [] for route in DELETE_ORDER}
+        self.deleted = 0
+        self.leaks: list[Leak] = []
+
+    def register(self, route: str, resource_id: int) -> None:
+        with self._lock:
+            self._pending[APIRoutes(route)].append(resource_id)
+
+    def drain(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {route: [] for route in DELETE_ORDER}
+
+        if not any(pending.values()):
+            return
+
+        with ThreadPoolExecutor(max_workers=self._batch_size) as executor:
+            for route in DELETE_ORDER:
+                # wait for every todo before deleting posts, and so on
+                for result in executor.map(lambda resource_id: self._delete(route, resource_id), pending[route]):
+                    if isinstance(result, Leak):
+                        self.leaks.append(result)
+                    else:
+                        self.deleted += result
+
+    def _delete(self, route: str, resource_id: int) -> Leak | bool:
+        """Return whether the resource was deleted now, or a ``Leak`` if it could not be."""
+        try:
+            response = self._client.delete(f'{route}/{resource_id}')
+        except httpx.HTTPError as error:
+            return Leak(route, resource_id, repr(error))
+
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return False
+
+        if response.is_error:
+            return Leak(route, resource_id, f'HTTP {response.status_code}')
+
+        return True
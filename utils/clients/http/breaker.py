@@ -0,0 +1,231 @@
+"""
+Circuit breaker between the clients and the live API.
+
+Connection errors, 5xx responses and Cloudflare block pages count as
+failures. Once at least ``min_calls`` of the last ``window`` requests were
+made and ``failure_ratio`` of them failed, the breaker opens: for
+``cooldown`` seconds nothing is sent upstream and requests either fail
+fast with ``CircuitOpenError`` (the default) or, with
+``circuit_breaker_mode=fallback``, are answered by the in-memory fake
+backend. After the cooldown a single request is let through (half-open);
+its outcome closes the breaker or opens it again. A trial that ends
+without an outcome (cancelled, or an unexpected error) hands the trial to
+the next request.
+
+Fallback is opt-in: ids created upstream before the breaker opened do not
+exist in the fake store, so a run that used it fails even if every test
+passed.
+"""
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+import httpx
+
+from settings import base_settings
+from utils.clients.http.probe import HEAD_BYTES, looks_blocked
+
+_BLOCK_STATUSES = frozenset({403, 429, 503})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling an API the breaker considers down."""
+
+
+class BreakerState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        cooldown: float = 30.0
+    ) -> None:
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._min_calls = min_calls
+        self._failure_ratio = failure_ratio
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probing = False
+        self.state = BreakerState.CLOSED
+        self.opened = 0
+        self.short_circuited = 0
+        self.fallback_served = 0
+
+    def allow(self) -> bool:
+        """Whether a request may go upstream; in half-open state only one may."""
+        with self._lock:
+            if self.state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self._cooldown:
+                self.state = BreakerState.HALF_OPEN
+
+            if self.state is BreakerState.CLOSED:
+                return True
+
+            if self.state is BreakerState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            if self.state is BreakerState.HALF_OPEN and self._probing:
+                self._probing = False
+                if failed:
+                    self._open()
+                else:
+                    self.state = BreakerState.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if (
+                self.state is BreakerState.CLOSED
+                and len(self._outcomes) >= self._min_calls
+                and sum(self._outcomes) >= self._failure_ratio * len(self._outcomes)
+            ):
+                self._open()
+
+    def abandon(self) -> None:
+        """Forget a request that ended without an outcome, so it cannot hold the half-open trial."""
+        with self._lock:
+            if self.state is BreakerState.HALF_OPEN:
+                self._probing = False
+
+    def served_fallback(self) -> None:
+        with self._lock:
+            self.fallback_served += 1
+
+    def counters(self) -> dict[str, int]:
+        return {
+            'opened': self.opened,
+            'short_circuited': self.short_circuited,
+            'fallback_served': self.fallback_served,
+        }
+
+    def add_counters(self, counters: dict[str, int]) -> None:
+        """Add the counters of another process' breaker (an xdist worker)."""
+        with self._lock:
+            self.opened += counters['opened']
+            self.short_circuited += counters['short_circuited']
+            self.fallback_served += counters['fallback_served']
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state is BreakerState.CLOSED
+
+    def _open(self) -> None:
+        self.state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+
+
+circuit_breaker = CircuitBreaker(cooldown=base_settings.circuit_breaker_cooldown)
+
+
+def _failed(response: httpx.Response) -> bool:
+    if response.status_code in _BLOCK_STATUSES:
+        head = response.content[:HEAD_BYTES]
+        return response.status_code == 503 or looks_blocked(response.status_code, response.headers, head)
+
+    return response.status_code >= 500
+
+
+def _fallback_transport() -> httpx.BaseTransport | httpx.AsyncBaseTransport | None:
+    if base_settings.circuit_breaker_mode != 'fallback':
+        return None
+
+    from utils.mocks.fake_server import FakeGoRestTransport, fake_gorest
+
+    return FakeGoRestTransport(fake_gorest)
+
+
+class CircuitBreakerTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        breaker: CircuitBreaker = circuit_breaker
+    ) -> None:
+        self._transport = transport
+        self._breaker = breaker
+        self._fallback = _fallback_transport()
+
+    def _short_circuit(self, request: httpx.Request) -> httpx.Response:
+        if self._fallback is None:
+            raise CircuitOpenError(f'Circuit open, not sending {request.method} {request.url}', request=request)
+
+        self._breaker.served_fallback()
+        return self._fallback.handle_request(request)
+
+    async def _short_circuit_async(self, request: httpx.Request) -> httpx.Response:
+        if self._fallback is None:
+            raise CircuitOpenError(f'Circuit open, not sending {request.method} {request.url}', request=request)
+
+        self._breaker.served_fallback()
+        return await self._fallback.handle_async_request(request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._breaker.allow():
+            return self._short_circuit(request)
+
+        try:
+            response = self._transport.handle_request(request)
+            if response.status_code in _BLOCK_STATUSES:
+                response.read()
+        except httpx.TransportError:
+            self._breaker.record(True)
+            if self._fallback is None or self._breaker.is_closed:
+                raise
+            return self._short_circuit(request)
+        except BaseException:
+            # cancelled, or not the API's fault
+            self._breaker.abandon()
+            raise
+
+        failed = _failed(response)
+        self._breaker.record(failed)
+        if failed and self._fallback is not None and not self._breaker.is_closed:
+            response.close()
+            return self._short_circuit(request)
+
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._breaker.allow():
+            return await self._short_circuit_async(request)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+            if response.status_code in _BLOCK_STATUSES:
+                await response.aread()
+        except httpx.TransportError:
+            self._breaker.record(True)
+            if self._fallback is None or self._breaker.is_closed:
+                raise
+            return await self._short_circuit_async(request)
+        except BaseException:
+            # cancelled, or not the API's fault
+            self._breaker.abandon()
+            raise
+
+        failed = _failed(response)
+        self._breaker.record(failed)
+        if failed and self._fallback is not None and not self._breaker.is_closed:
+            await response.aclose()
+            return await self._short_circuit_async(request)
+
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -1,9 +1,10 @@
 from enum import Enum
+from typing import Any
 
 from base.api.authentication_api import AuthenticationClient
 from models.authentication import Authentication
 from settings import base_settings
-from utils.clients.http.client import HTTPClient
+from utils.clients.http.client import AsyncHTTPClient, HTTPClient
 
 
 class AuthMethod(Enum):
@@ -12,23 +13,39 @@ class AuthMethod(Enum):
     QUERY_PARAM = "query_param"
 
 
-def get_http_client(
-    auth: Authentication | None = None,
-    base_url: str = base_settings.api_url,
-    auth_method: AuthMethod = AuthMethod.BEARER_TOKEN
-) -> HTTPClient:
+def get_client_kwargs(
+    auth: Authentication | None,
+    base_url: str,
+    auth_method: AuthMethod
+) -> dict[str, Any]:
     if auth is None:
-        return HTTPClient(base_url=base_url, trust_env=True)
+        return {'base_url': base_url, 'trust_env': True}
 
     headers: dict[str, str] = {}
     params: dict[str, str] = {}
 
     if auth_method == AuthMethod.BEARER_TOKEN:
         headers = {**headers, 'Authorization': f'Bearer {auth.user.token}'}
-        return HTTPClient(base_url=base_url, headers=headers, trust_env=True)
-    
+        return {'base_url': base_url, 'headers': headers, 'trust_env': True}
+
     elif auth_method == AuthMethod.QUERY_PARAM:
         params = {'access_token': auth.user.token}
-        return HTTPClient(base_url=base_url, params=params, trust_env=True)
+        return {'base_url': base_url, 'params': params, 'trust_env': True}
+
+    return {'base_url': base_url, 'headers': headers, 'trust_env': True}
+
+
+def get_http_client(
+    auth: Authentication | None = None,
+    base_url: str = base_settings.api_url,
+    auth_method: AuthMethod = AuthMethod.BEARER_TOKEN
+) -> HTTPClient:
+    return HTTPClient(**get_client_kwargs(auth, base_url, auth_method))
 
-    return HTTPClient(base_url=base_url, headers=headers, trust_env=True)
\ No newline at end of file
+
+def get_async_http_client(
+    auth: Authentication | None = None,
+    base_url: str = base_settings.api_url,
+    auth_method: AuthMethod = AuthMethod.BEARER_TOKEN
+) -> AsyncHTTPClient:
+    return AsyncHTTPClient(**get_client_kwargs(auth, base_url, auth_method))
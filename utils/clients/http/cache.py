@@ -0,0 +1,269 @@
+"""
+Opt-in cache for GET responses (``http_cache_enabled``).
+
+Responses carrying an ``ETag`` or ``Cache-Control: max-age`` are kept in a
+size-bounded LRU keyed by URL and credentials. A fresh entry is served
+without touching the network; a stale one is revalidated with
+``If-None-Match`` and a ``304`` is answered from the cache, refreshing the
+entry's headers and freshness.
+
+GoRest answers with ``Cache-Control: max-age=0, must-revalidate``, so on the
+live API every cached read still costs one conditional request; only the
+body is saved. ``http_cache_heuristic_ttl`` opts in to serving entries
+without revalidation for that many seconds regardless, at the price of
+missing changes made outside this run.
+
+Any other method invalidates the path it writes to, that path's ancestors
+and descendants, and the top-level collection of every resource in it, e.g.
+``POST /users/1/posts`` drops ``/users``, ``/users/1``, ``/users/1/posts``
+and ``/posts``, once before the write is sent and again once it is answered.
+A read that was in flight during a write is not stored. Server-side cascades
+beyond those paths are not tracked.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import httpx
+
+from settings import base_settings
+
+CACHE_EXTENSION = 'http_cache'
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+_SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+_SKIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+CacheKey = tuple[str, str]
+
+
+@dataclass
+class CachedResponse:
+    path: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    etag: str | None
+    expires_at: float
+
+    def to_response(self, request: httpx.Request, state: str) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={CACHE_EXTENSION: state}
+        )
+
+
+def _cache_key(request: httpx.Request) -> CacheKey:
+    return str(request.url), request.headers.get('Authorization', '')
+
+
+def _max_age(response: httpx.Response) -> float:
+    cache_control = response.headers.get('Cache-Control', '')
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0.0
+
+    match = _MAX_AGE.search(cache_control)
+    return float(match.group(1)) if match else 0.0
+
+
+def _invalidated_paths(path: str) -> tuple[set[str], list[str]]:
+    """Exact paths (ancestors and collections) and prefixes (descendants) a write to ``path`` touches."""
+    segments = [segment for segment in path.split('/') if segment]
+    exact = {'/' + '/'.join(segments[:end]) for end in range(1, len(segments) + 1)}
+    resource_start = next((index for index, segment in enumerate(segments) if segment.isdigit()), len(segments)) - 1
+    base = segments[:max(resource_start, 0)]
+    for segment in segments[max(resource_start, 0):]:
+        if not segment.isdigit():
+            exact.add('/' + '/'.join([*base, segment]))
+
+    return exact, [path.rstrip('/') + '/']
+
+
+class HTTPCache:
+    def __init__(self, max_bytes: int, heuristic_ttl: float = 0.0) -> None:
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._heuristic_ttl = heuristic_ttl
+        self._size = 0
+        # bumped by every invalidation, so reads that overlap a write are not stored
+        self.generation = 0
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def lookup(self, request: httpx.Request) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(_cache_key(request))
+            if entry is not None:
+                self._entries.move_to_end(_cache_key(request))
+
+            return entry
+
+    def count(self, outcome: str) -> None:
+        """Add one to the ``hits``, ``revalidated`` or ``misses`` counter."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def _expires_at(self, response: httpx.Response) -> float:
+        max_age = _max_age(response)
+        if 'no-store' not in response.headers.get('Cache-Control', ''):
+            max_age = max(max_age, self._heuristic_ttl)
+
+        return time.monotonic() + max_age
+
+    def store(self, request: httpx.Request, response: httpx.Response, generation: int) -> None:
+        """Keep ``response`` unless the cache was invalidated since ``generation`` was read."""
+        etag = response.headers.get('ETag')
+        if response.status_code != 200 or (etag is None and _max_age(response) == 0):
+            return
+
+        entry = CachedResponse(
+            path=request.url.path,
+            status_code=response.status_code,
+            headers=[(name, value) for name, value in response.headers.items() if name.lower() not in _SKIPPED_HEADERS],
+            content=response.content,
+            etag=etag,
+            expires_at=self._expires_at(response)
+        )
+        if len(entry.content) > self._max_bytes:
+            return
+
+        key = _cache_key(request)
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self._drop(key)
+            self._entries[key] = entry
+            self._size += len(entry.content)
+            while self._size > self._max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def refresh(self, entry: CachedResponse, response: httpx.Response) -> None:
+        """Apply the headers and freshness of a ``304`` to the entry it revalidated."""
+        updated = {name.lower() for name in response.headers if name.lower() not in _SKIPPED_HEADERS}
+        with self._lock:
+            entry.headers = [(name, value) for name, value in entry.headers if name.lower() not in updated] + [
+                (name, value) for name, value in response.headers.items() if name.lower() in updated
+            ]
+            entry.etag = response.headers.get('ETag', entry.etag)
+            entry.expires_at = self._expires_at(response)
+            self.revalidated += 1
+
+    def invalidate(self, path: str) -> None:
+        exact, prefixes = _invalidated_paths(path)
+        with self._lock:
+            self.generation += 1
+            for key in [
+                key for key, entry in self._entries.items()
+                if entry.path.rstrip('/') in exact or entry.path.startswith(tuple(prefixes))
+            ]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+
+http_cache = HTTPCache(
+    max_bytes=base_settings.http_cache_max_bytes,
+    heuristic_ttl=base_settings.http_cache_heuristic_ttl
+)
+
+
+class CachingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve GETs from ``cache`` and invalidate it on writes."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        cache: HTTPCache = http_cache
+    ) -> None:
+        self._transport = transport
+        self._cache = cache
+
+    def _before(self, request: httpx.Request) -> tuple[CachedResponse | None, httpx.Response | None]:
+        """Return the cached entry to revalidate, or a response to serve right away."""
+        if request.method != 'GET':
+            if request.method not in _SAFE_METHODS:
+                self._cache.invalidate(request.url.path)
+            return None, None
+
+        if 'If-None-Match' in request.headers:
+            # the caller revalidates on its own and expects to see the 304
+            return None, None
+
+        entry = self._cache.lookup(request)
+        if entry is None:
+            self._cache.count('misses')
+            return None, None
+
+        if entry.expires_at > time.monotonic():
+            self._cache.count('hits')
+            return None, entry.to_response(request, 'hit')
+
+        if entry.etag is not None:
+            request.headers['If-None-Match'] = entry.etag
+
+        return entry, None
+
+    def _after(
+        self,
+        request: httpx.Request,
+        entry: CachedResponse | None,
+        response: httpx.Response,
+        generation: int
+    ) -> httpx.Response:
+        if request.method != 'GET':
+            if request.method not in _SAFE_METHODS:
+                # a read sent while the write was in flight may have stored the old body meanwhile
+                self._cache.invalidate(request.url.path)
+            return response
+
+        if entry is not None and response.status_code == 304:
+            self._cache.refresh(entry, response)
+            return entry.to_response(request, 'revalidated')
+
+        self._cache.store(request, response, generation)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self._before(request)
+        if cached is not None:
+            return cached
+
+        generation = self._cache.generation
+        response = self._transport.handle_request(request)
+        if request.method == 'GET':
+            response.read()
+
+        return self._after(request, entry, response, generation)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry, cached = self._before(request)
+        if cached is not None:
+            return cached
+
+        generation = self._cache.generation
+        response = await self._transport.handle_async_request(request)
+        if request.method == 'GET':
+            await response.aread()
+
+        return self._after(request, entry, response, generation)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
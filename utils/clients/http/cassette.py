@@ -0,0 +1,278 @@
+"""
+Record/replay of real API traffic.
+
+A cassette is a single binary file::
+
+    MAGIC | record... | index | footer
+
+Each record is ``status (u16) | headers length (u32) | body length (u32) |
+headers JSON | body``. The index holds fixed-width ``key (16 bytes) |
+offset (u64) | length (u32)`` entries sorted by key, and the footer points
+at it. Replay memory-maps the file and binary-searches the index in place,
+so opening a cassette costs the same no matter how large it is.
+
+Requests are keyed by method, URL (without the ``access_token`` query
+parameter), a hash of the credentials, the scope the request was made in
+and how many times that same request was seen before in that scope, so
+repeated calls such as GET before and after a DELETE replay in order.
+The scope is the test node id, or the fixture for requests made while a
+class or session fixture is set up or torn down, so a replay does not
+depend on which other tests run or on which xdist worker runs them.
+Bodies are not part of the key because payloads are randomly generated.
+
+Under xdist every worker records its own cassette; the controller merges
+them into ``cassette_path`` at the end of the run.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+from settings import base_settings
+
+MAGIC = b'GRCASS1\x00'
+_RECORD_HEADER = struct.Struct('<HII')
+_INDEX_ENTRY = struct.Struct('<16sQI')
+_FOOTER = struct.Struct('<QI8s')
+_SKIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection'})
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised when a replayed request was never recorded."""
+
+
+_scope = 'session'
+
+
+def set_cassette_scope(scope: str) -> str:
+    """Make ``scope`` the scope of the requests that follow and return the previous one."""
+    global _scope
+    previous, _scope = _scope, scope
+    return previous
+
+
+@contextmanager
+def cassette_scope(scope: str) -> Iterator[None]:
+    previous = set_cassette_scope(scope)
+    try:
+        yield
+    finally:
+        set_cassette_scope(previous)
+
+
+def fingerprint(request: httpx.Request) -> bytes:
+    params = sorted((key, value) for key, value in request.url.params.multi_items() if key != 'access_token')
+    url = request.url.copy_with(query=None, fragment=None)
+    # different tokens (e.g. an invalid one) get different answers for the same URL
+    credentials = request.headers.get('Authorization') or request.url.params.get('access_token') or ''
+    auth = hashlib.blake2b(credentials.encode(), digest_size=8).hexdigest() if credentials else '-'
+    return f'{request.method} {url}?{json.dumps(params)} auth={auth}'.encode()
+
+
+def _key(scope: str, request_fingerprint: bytes, occurrence: int) -> bytes:
+    return hashlib.blake2b(
+        b'%s\0%s#%d' % (scope.encode(), request_fingerprint, occurrence), digest_size=16
+    ).digest()
+
+
+class CassetteWriter:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = path.open('wb')
+        self._file.write(MAGIC)
+        self._entries: list[tuple[bytes, int, int]] = []
+        self._occurrences: Counter[tuple[str, bytes]] = Counter()
+        self._keys: set[bytes] = set()
+
+    def record(self, request: httpx.Request, response: httpx.Response) -> None:
+        headers = json.dumps([
+            [name, value] for name, value in response.headers.items() if name.lower() not in _SKIPPED_HEADERS
+        ]).encode()
+        body = response.content
+        counter = (_scope, fingerprint(request))
+
+        with self._lock:
+            occurrence = self._occurrences[counter]
+            self._occurrences[counter] += 1
+            self.write_record(
+                _key(*counter, occurrence),
+                _RECORD_HEADER.pack(response.status_code, len(headers), len(body)) + headers + body
+            )
+
+    def write_record(self, key: bytes, record: bytes) -> bool:
+        """Append an already packed record; the first record written under a key wins."""
+        if key in self._keys:
+            return False
+
+        self._keys.add(key)
+        offset = self._file.tell()
+        self._file.write(record)
+        self._entries.append((key, offset, len(record)))
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+
+            index_offset = self._file.tell()
+            for key, offset, length in sorted(self._entries):
+                self._file.write(_INDEX_ENTRY.pack(key, offset, length))
+
+            self._file.write(_FOOTER.pack(index_offset, len(self._entries), MAGIC))
+            self._file.close()
+
+
+class CassetteReader:
+    def __init__(self, path: Path) -> None:
+        with path.open('rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index_offset, self._count, magic = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC or self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'"{path}" is not a cassette file')
+
+        self._index_offset = index_offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def records(self) -> Iterator[tuple[bytes, bytes]]:
+        """Every ``(key, packed record)`` in key order."""
+        end = self._index_offset + self._count * _INDEX_ENTRY.size
+        for entry in range(self._index_offset, end, _INDEX_ENTRY.size):
+            key, offset, length = _INDEX_ENTRY.unpack_from(self._map, entry)
+            yield key, self._map[offset:offset + length]
+
+    def close(self) -> None:
+        self._map.close()
+
+    def get(self, key: bytes) -> httpx.Response | None:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._index_offset + middle * _INDEX_ENTRY.size
+            middle_key = self._map[entry:entry + 16]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                _, offset, _ = _INDEX_ENTRY.unpack_from(self._map, entry)
+                return self._read(offset)
+
+        return None
+
+    def _read(self, offset: int) -> httpx.Response:
+        status_code, headers_length, body_length = _RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + _RECORD_HEADER.size
+        headers = json.loads(self._map[start:start + headers_length])
+        start += headers_length
+        return httpx.Response(status_code, headers=headers, content=self._map[start:start + body_length])
+
+
+class CassetteReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve responses from a recorded cassette instead of the network."""
+
+    def __init__(self, reader: CassetteReader) -> None:
+        self._reader = reader
+        self._lock = threading.Lock()
+        self._occurrences: Counter[tuple[str, bytes]] = Counter()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        counter = (_scope, fingerprint(request))
+        with self._lock:
+            occurrence = self._occurrences[counter]
+            self._occurrences[counter] += 1
+
+        response = self._reader.get(_key(*counter, occurrence))
+        if response is None:
+            raise CassetteMissError(
+                f'No recorded response for {request.method} {request.url} '
+                f'(call #{occurrence + 1} in "{counter[0]}"); record the cassette again',
+                request=request
+            )
+
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return self.handle_request(request)
+
+
+_lock = threading.Lock()
+_writer: CassetteWriter | None = None
+_replay_transport: CassetteReplayTransport | None = None
+
+
+def _cassette_path() -> Path:
+    path = Path(base_settings.cassette_path)
+    worker = os.getenv('PYTEST_XDIST_WORKER')
+    if worker and base_settings.cassette_mode == 'record':
+        path = path.with_name(f'{path.stem}-{worker}{path.suffix}')
+
+    return path
+
+
+def worker_cassette_paths() -> list[Path]:
+    path = Path(base_settings.cassette_path)
+    return sorted(path.parent.glob(f'{path.stem}-gw*{path.suffix}'))
+
+
+def merge_cassettes(sources: list[Path], output: Path) -> int:
+    """Write the records of every cassette in ``sources`` into one; return how many there are."""
+    writer = CassetteWriter(output)
+    try:
+        for source in sources:
+            reader = CassetteReader(source)
+            try:
+                for key, record in reader.records():
+                    # session fixtures replay identically in every worker, keep one copy
+                    writer.write_record(key, record)
+            finally:
+                reader.close()
+    finally:
+        writer.close()
+
+    return len(writer)
+
+
+def get_cassette_writer() -> CassetteWriter | None:
+    global _writer
+    if base_settings.cassette_mode != 'record':
+        return None
+
+    with _lock:
+        if _writer is None:
+            _writer = CassetteWriter(_cassette_path())
+
+        return _writer
+
+
+def get_replay_transport() -> CassetteReplayTransport | None:
+    global _replay_transport
+    if base_settings.cassette_mode != 'replay':
+        return None
+
+    with _lock:
+        if _replay_transport is None:
+            _replay_transport = CassetteReplayTransport(CassetteReader(_cassette_path()))
+
+        return _replay_transport
+
+
+def close_cassette() -> None:
+    with _lock:
+        if _writer is not None:
+            _writer.close()
@@ -1,15 +1,71 @@
 import typing
 
-import allure
-from httpx import Client, Response
-from httpx._client import UseClientDefault
+from httpx import AsyncClient, Client, Request, Response
+from httpx._client import USE_CLIENT_DEFAULT, UseClientDefault
 from httpx._types import (AuthTypes, CookieTypes, HeaderTypes, QueryParamTypes,
                           RequestContent, RequestData, RequestExtensions,
                           RequestFiles, TimeoutTypes, URLTypes)
 
+from settings import base_settings
+from utils.clients.http.breaker import CircuitBreakerTransport
+from utils.clients.http.cache import CACHE_EXTENSION, CachingTransport
+from utils.clients.http.cassette import get_cassette_writer, get_replay_transport
+from utils.clients.http.coalesce import CoalescingTransport
+from utils.clients.http.metrics import request_metrics
+from utils.clients.http.rate_limit import RateLimitingTransport
+from utils.clients.http.retry import RetryTransport
+from utils.steps import async_step, step
+
+if typing.TYPE_CHECKING:
+    from utils.cleanup import CleanupRegistry
+
 
 class HTTPClient(Client):
-    @allure.step('Making GET request to "{url}"')
+    def __init__(self, **kwargs: typing.Any) -> None:
+        replay_transport = get_replay_transport()
+        if replay_transport is not None:
+            kwargs['transport'] = replay_transport
+
+        super().__init__(**kwargs)
+        if replay_transport is None:
+            # a replay must see exactly the requests that were recorded
+            self._transport = RetryTransport(RateLimitingTransport(self._transport))
+            if base_settings.http_coalescing_enabled:
+                self._transport = CoalescingTransport(self._transport)
+            if base_settings.circuit_breaker_mode != 'off':
+                self._transport = CircuitBreakerTransport(self._transport)
+        if base_settings.http_cache_enabled:
+            self._transport = CachingTransport(self._transport)
+
+        self.event_hooks = {
+            'request': [*self.event_hooks['request'], request_metrics.on_request],
+            'response': [*self.event_hooks['response'], request_metrics.on_response],
+        }
+
+    def send(
+        self,
+        request: Request,
+        *,
+        stream: bool = False,
+        auth: typing.Union[AuthTypes, UseClientDefault, None] = USE_CLIENT_DEFAULT,
+        follow_redirects: typing.Union[bool, UseClientDefault] = USE_CLIENT_DEFAULT
+    ) -> Response:
+        response = super().send(
+            request,
+            stream=stream,
+            auth=auth,
+            follow_redirects=follow_redirects
+        )
+        if response.extensions.get(CACHE_EXTENSION) == 'hit':
+            return response
+
+        cassette_writer = get_cassette_writer()
+        if cassette_writer is not None and not stream:
+            cassette_writer.record(request, response)
+
+        return response
+
+    @step('Making GET request to "{url}"')
     def get(
         self,
         url: URLTypes,
@@ -33,7 +89,7 @@ class HTTPClient(Client):
             extensions=extensions
         )
 
-    @allure.step('Making POST request to "{url}"')
+    @step('Making POST request to "{url}"')
     def post(
         self,
         url: URLTypes,
@@ -65,7 +121,7 @@ class HTTPClient(Client):
             extensions=extensions
         )
 
-    @allure.step('Making PATCH request to "{url}"')
+    @step('Making PATCH request to "{url}"')
     def patch(
         self,
         url: URLTypes,
@@ -97,7 +153,7 @@ class HTTPClient(Client):
             extensions=extensions
         )
 
-    @allure.step('Making DELETE request to "{url}"')
+    @step('Making DELETE request to "{url}"')
     def delete(
         self,
         url: URLTypes,
@@ -122,10 +178,193 @@ class HTTPClient(Client):
         )
 
 
+class AsyncHTTPClient(AsyncClient):
+    def __init__(self, **kwargs: typing.Any) -> None:
+        replay_transport = get_replay_transport()
+        if replay_transport is not None:
+            kwargs['transport'] = replay_transport
+
+        super().__init__(**kwargs)
+        if replay_transport is None:
+            # a replay must see exactly the requests that were recorded
+            self._transport = RetryTransport(RateLimitingTransport(self._transport))
+            if base_settings.http_coalescing_enabled:
+                self._transport = CoalescingTransport(self._transport)
+            if base_settings.circuit_breaker_mode != 'off':
+                self._transport = CircuitBreakerTransport(self._transport)
+        if base_settings.http_cache_enabled:
+            self._transport = CachingTransport(self._transport)
+
+        self.event_hooks = {
+            'request': [*self.event_hooks['request'], request_metrics.on_request_async],
+            'response': [*self.event_hooks['response'], request_metrics.on_response_async],
+        }
+
+    async def send(
+        self,
+        request: Request,
+        *,
+        stream: bool = False,
+        auth: typing.Union[AuthTypes, UseClientDefault, None] = USE_CLIENT_DEFAULT,
+        follow_redirects: typing.Union[bool, UseClientDefault] = USE_CLIENT_DEFAULT
+    ) -> Response:
+        response = await super().send(
+            request,
+            stream=stream,
+            auth=auth,
+            follow_redirects=follow_redirects
+        )
+        if response.extensions.get(CACHE_EXTENSION) == 'hit':
+            return response
+
+        cassette_writer = get_cassette_writer()
+        if cassette_writer is not None and not stream:
+            cassette_writer.record(request, response)
+
+        return response
+
+    @async_step('Making GET request to "{url}"')
+    async def get(
+        self,
+        url: URLTypes,
+        *,
+        params: typing.Optional[QueryParamTypes] = None,
+        headers: typing.Optional[HeaderTypes] = None,
+        cookies: typing.Optional[CookieTypes] = None,
+        auth: typing.Union[AuthTypes, UseClientDefault] = None,
+        follow_redirects: typing.Union[bool, UseClientDefault] = None,
+        timeout: typing.Union[TimeoutTypes, UseClientDefault] = None,
+        extensions: typing.Optional[RequestExtensions] = None
+    ) -> Response:
+        return await super().get(
+            url=url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+    @async_step('Making POST request to "{url}"')
+    async def post(
+        self,
+        url: URLTypes,
+        *,
+        content: typing.Optional[RequestContent] = None,
+        data: typing.Optional[RequestData] = None,
+        files: typing.Optional[RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        params: typing.Optional[QueryParamTypes] = None,
+        headers: typing.Optional[HeaderTypes] = None,
+        cookies: typing.Optional[CookieTypes] = None,
+        auth: typing.Union[AuthTypes, UseClientDefault] = None,
+        follow_redirects: typing.Union[bool, UseClientDefault] = None,
+        timeout: typing.Union[TimeoutTypes, UseClientDefault] = None,
+        extensions: typing.Optional[RequestExtensions] = None
+    ) -> Response:
+        return await super().post(
+            url=url,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+    @async_step('Making PATCH request to "{url}"')
+    async def patch(
+        self,
+        url: URLTypes,
+        *,
+        content: typing.Optional[RequestContent] = None,
+        data: typing.Optional[RequestData] = None,
+        files: typing.Optional[RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        params: typing.Optional[QueryParamTypes] = None,
+        headers: typing.Optional[HeaderTypes] = None,
+        cookies: typing.Optional[CookieTypes] = None,
+        auth: typing.Union[AuthTypes, UseClientDefault] = None,
+        follow_redirects: typing.Union[bool, UseClientDefault] = None,
+        timeout: typing.Union[TimeoutTypes, UseClientDefault] = None,
+        extensions: typing.Optional[RequestExtensions] = None
+    ) -> Response:
+        return await super().patch(
+            url=url,
+            content=content,
+            data=data,
+            files=files,
+            json=json,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+    @async_step('Making DELETE request to "{url}"')
+    async def delete(
+        self,
+        url: URLTypes,
+        *,
+        params: typing.Optional[QueryParamTypes] = None,
+        headers: typing.Optional[HeaderTypes] = None,
+        cookies: typing.Optional[CookieTypes] = None,
+        auth: typing.Union[AuthTypes, UseClientDefault] = None,
+        follow_redirects: typing.Union[bool, UseClientDefault] = None,
+        timeout: typing.Union[TimeoutTypes, UseClientDefault] = None,
+        extensions: typing.Optional[RequestExtensions] = None
+    ) -> Response:
+        return await super().delete(
+            url=url,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+
 class APIClient:
-    def __init__(self, client: HTTPClient) -> None:
+    def __init__(self, client: HTTPClient, cleanup: 'CleanupRegistry | None' = None) -> None:
         self._client = client
+        self._cleanup = cleanup
 
     @property
     def client(self) -> HTTPClient:
-        return self._client
\ No newline at end of file
+        return self._client
+
+    def _track(self, route: str, response: Response) -> Response:
+        """Queue the resource created by ``response`` for deletion by the cleanup registry."""
+        if self._cleanup is not None and response.status_code == 201:
+            self._cleanup.register(route, response.json()['id'])
+
+        return response
+
+
+class AsyncAPIClient:
+    def __init__(self, client: AsyncHTTPClient, cleanup: 'CleanupRegistry | None' = None) -> None:
+        self._client = client
+        self._cleanup = cleanup
+
+    @property
+    def client(self) -> AsyncHTTPClient:
+        return self._client
+
+    def _track(self, route: str, response: Response) -> Response:
+        """Queue the resource created by ``response`` for deletion by the cleanup registry."""
+        if self._cleanup is not None and response.status_code == 201:
+            self._cleanup.register(route, response.json()['id'])
+
+        return response
\ No newline at end of file
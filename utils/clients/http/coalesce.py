@@ -0,0 +1,141 @@
+"""
+Single-flight coalescing of identical in-flight reads.
+
+While a GET/HEAD is on the wire, identical requests (same method, URL with
+params, credentials and conditional headers) wait for it instead of going
+upstream themselves. Every caller gets its own ``Response`` built from the
+leader's status, headers and body, and parses it on its own. If the
+leader is interrupted before it has an answer, one of the waiting callers
+takes over instead of failing with it.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass, field
+
+import httpx
+
+from utils.clients.http.responses import PARSED_EXTENSION
+
+COALESCE_EXTENSION = 'coalesced'
+_COALESCED_METHODS = frozenset({'GET', 'HEAD'})
+_SKIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+FlightKey = tuple[str, str, str, str]
+
+
+def flight_key(request: httpx.Request) -> FlightKey | None:
+    if request.method not in _COALESCED_METHODS:
+        return None
+
+    return (
+        request.method,
+        str(request.url),
+        request.headers.get('Authorization', ''),
+        request.headers.get('If-None-Match', '')
+    )
+
+
+@dataclass
+class _Flight:
+    # done without a response or an error: the leader was interrupted
+    done: threading.Event = field(default_factory=threading.Event)
+    response: httpx.Response | None = None
+    error: Exception | None = None
+
+
+def _copy(response: httpx.Response, request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        response.status_code,
+        headers=[(name, value) for name, value in response.headers.items() if name.lower() not in _SKIPPED_HEADERS],
+        content=response.content,
+        request=request,
+        extensions={
+            **{name: value for name, value in response.extensions.items() if name != PARSED_EXTENSION},
+            COALESCE_EXTENSION: True
+        }
+    )
+
+
+class CoalescingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.BaseTransport | httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._flights: dict[FlightKey, _Flight] = {}
+        self._async_flights: dict[FlightKey, asyncio.Future[httpx.Response | None]] = {}
+        self.coalesced = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = flight_key(request)
+        if key is None:
+            return self._transport.handle_request(request)
+
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    break
+
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+
+            if flight.response is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return _copy(flight.response, request)
+
+        try:
+            response = self._transport.handle_request(request)
+            response.read()
+            flight.response = response
+            return response
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = flight_key(request)
+        if key is None:
+            return await self._transport.handle_async_request(request)
+
+        loop = asyncio.get_running_loop()
+        while True:
+            flight = self._async_flights.get(key)
+            if flight is None or flight.get_loop() is not loop:
+                break
+
+            response = await asyncio.shield(flight)
+            if response is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return _copy(response, request)
+
+        flight = self._async_flights[key] = loop.create_future()
+        try:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+            flight.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            # only the leader was cancelled: wake the others so one of them takes over
+            flight.set_result(None)
+            raise
+        except Exception as error:
+            flight.set_exception(error)
+            # the leader re-raises it; mark it retrieved in case nobody else was waiting
+            flight.exception()
+            raise
+        finally:
+            if self._async_flights.get(key) is flight:
+                del self._async_flights[key]
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
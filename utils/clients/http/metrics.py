@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from httpx import URL, Request, Response
+
+from utils.constants.routes import APIRoutes
+
+_START_EXTENSION = 'metrics_start'
+_ROUTE_NAMES = frozenset(route.value.strip('/') for route in APIRoutes)
+
+
+def normalize_route(url: URL) -> str:
+    """
+    Map a request URL onto its ``APIRoutes`` template, e.g.
+    ``/public/v2/users/42/posts`` -> ``/users/{id}/posts``.
+    """
+    segments = [segment for segment in url.path.split('/') if segment]
+    start = next((index for index, segment in enumerate(segments) if segment in _ROUTE_NAMES), None)
+    if start is None:
+        return '/' + '/'.join('{id}' if segment.isdigit() else segment for segment in segments)
+
+    return '/' + '/'.join(
+        segment if segment in _ROUTE_NAMES else '{id}' for segment in segments[start:]
+    )
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies in microseconds. Values below
+    ``2 ** precision_bits`` are counted exactly; above that every power of two
+    is split into ``2 ** (precision_bits - 1)`` buckets, which bounds the
+    relative error by ``2 ** -(precision_bits - 1)`` (under 2% by default).
+    Recording a value is a handful of integer operations.
+    """
+
+    def __init__(self, precision_bits: int = 7) -> None:
+        self._bits = precision_bits
+        self._exact = 1 << precision_bits
+        self._half = self._exact >> 1
+        self._counts: list[int] = [0] * self._exact
+        self.count = 0
+        self.max = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(int(seconds * 1_000_000), 0)
+        index = self._index(value)
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+
+        self._counts[index] += 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def counts(self) -> list[int]:
+        return list(self._counts)
+
+    def add_counts(self, counts: list[int], maximum: int) -> None:
+        """Add the bucket counts of a histogram with the same precision."""
+        if len(counts) > len(self._counts):
+            self._counts.extend([0] * (len(counts) - len(self._counts)))
+
+        for index, count in enumerate(counts):
+            self._counts[index] += count
+        self.count += sum(counts)
+        self.max = max(self.max, maximum)
+
+    def percentile(self, percentile: float) -> float:
+        """Return the ``percentile`` (0-100) latency in seconds."""
+        if self.count == 0:
+            return 0.0
+
+        rank = max(int(round(percentile / 100 * self.count)), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._value(index), self.max) / 1_000_000
+
+        return self.max / 1_000_000
+
+    def _index(self, value: int) -> int:
+        if value < self._exact:
+            return value
+
+        shift = value.bit_length() - self._bits
+        return self._exact + (shift - 1) * self._half + ((value >> shift) - self._half)
+
+    def _value(self, index: int) -> int:
+        """Midpoint of the values counted in bucket ``index``."""
+        if index < self._exact:
+            return index
+
+        shift, sub_bucket = divmod(index - self._exact, self._half)
+        shift += 1
+        lowest = (sub_bucket + self._half) << shift
+        return lowest + (1 << shift) // 2
+
+
+class RequestMetrics:
+    """
+    Per-route/per-method latency histograms and per-status counters, fed by
+    httpx event hooks. Latency is measured up to the response headers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._statuses: Counter[tuple[str, str, int]] = Counter()
+
+    def on_request(self, request: Request) -> None:
+        request.extensions[_START_EXTENSION] = time.perf_counter()
+
+    def on_response(self, response: Response) -> None:
+        start = response.request.extensions.get(_START_EXTENSION)
+        if start is None:
+            return
+
+        self.record(
+            response.request.method,
+            normalize_route(response.request.url),
+            response.status_code,
+            time.perf_counter() - start
+        )
+
+    async def on_request_async(self, request: Request) -> None:
+        self.on_request(request)
+
+    async def on_response_async(self, response: Response) -> None:
+        self.on_response(response)
+
+    def record(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((method, route))
+            if histogram is None:
+                histogram = self._histograms[(method, route)] = LatencyHistogram()
+
+            histogram.record(seconds)
+            self._statuses[(method, route, status_code)] += 1
+
+    def counters(self) -> list[dict[str, Any]]:
+        """Histograms and status counts in a form xdist can send to the controller."""
+        with self._lock:
+            return [
+                {
+                    'method': method,
+                    'route': route,
+                    'counts': histogram.counts(),
+                    'max': histogram.max,
+                    'statuses': {
+                        status: count
+                        for (status_method, status_route, status), count in self._statuses.items()
+                        if (status_method, status_route) == (method, route)
+                    },
+                }
+                for (method, route), histogram in self._histograms.items()
+            ]
+
+    def add_counters(self, counters: list[dict[str, Any]]) -> None:
+        """Add the histograms and status counts of another process (an xdist worker)."""
+        with self._lock:
+            for entry in counters:
+                key = (entry['method'], entry['route'])
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+
+                histogram.add_counts(entry['counts'], entry['max'])
+                for status, count in entry['statuses'].items():
+                    self._statuses[(*key, int(status))] += count
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            routes = []
+            for (method, route), histogram in sorted(self._histograms.items(), key=lambda item: item[0][::-1]):
+                routes.append({
+                    'method': method,
+                    'route': route,
+                    'count': histogram.count,
+                    'statuses': {
+                        str(status): count
+                        for (status_method, status_route, status), count in sorted(self._statuses.items())
+                        if (status_method, status_route) == (method, route)
+                    },
+                    'p50_ms': round(histogram.percentile(50) * 1000, 3),
+                    'p95_ms': round(histogram.percentile(95) * 1000, 3),
+                    'p99_ms': round(histogram.percentile(99) * 1000, 3),
+                    'max_ms': round(histogram.max / 1000, 3),
+                })
+
+            return {'routes': routes}
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,84 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+from httpx import Response
+
+PAGES_HEADER = 'X-Pagination-Pages'
+
+
+def pagination_params(page: int | None = None, per_page: int | None = None) -> dict[str, int] | None:
+    params = {
+        name: value for name, value in (('page', page), ('per_page', per_page)) if value is not None
+    }
+    return params or None
+
+
+def _total_pages(response: Response) -> int:
+    return int(response.headers.get(PAGES_HEADER, 1))
+
+
+def iter_pages(fetch_page: Callable[[int], Response], prefetch: int = 0) -> Iterator[Response]:
+    """
+    Yield every page of a GoRest collection, following ``X-Pagination-Pages``.
+    While a page is being consumed the next ``prefetch`` pages are already
+    being fetched in the background, so at most ``prefetch + 1`` pages are
+    held in memory.
+    """
+    first = fetch_page(1)
+    first.raise_for_status()
+    yield first
+
+    pages = _total_pages(first)
+    if prefetch <= 0:
+        for page in range(2, pages + 1):
+            response = fetch_page(page)
+            response.raise_for_status()
+            yield response
+        return
+
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    pending: deque[Future[Response]] = deque()
+    next_page = 2
+    try:
+        while next_page <= pages and len(pending) < prefetch:
+            pending.append(executor.submit(fetch_page, next_page))
+            next_page += 1
+
+        while pending:
+            response = pending.popleft().result()
+            if next_page <= pages:
+                pending.append(executor.submit(fetch_page, next_page))
+                next_page += 1
+
+            response.raise_for_status()
+            yield response
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[Response]],
+    prefetch: int = 0
+) -> AsyncIterator[Response]:
+    """Async twin of ``iter_pages`` that prefetches pages as tasks."""
+    first = await fetch_page(1)
+    first.raise_for_status()
+    yield first
+
+    pages = _total_pages(first)
+    pending: deque[asyncio.Task[Response]] = deque()
+    next_page = 2
+    try:
+        while pending or next_page <= pages:
+            while next_page <= pages and len(pending) <= prefetch:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+
+            response = await pending.popleft()
+            response.raise_for_status()
+            yield response
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,146 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from httpx import Client, HTTPError, HTTPTransport, Limits, Request
+
+from models.authentication import Authentication
+from settings import base_settings
+from utils.clients.http.builder import AuthMethod, get_client_kwargs
+from utils.clients.http.client import HTTPClient
+
+DEFAULT_LIMITS = Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+ClientKey = tuple[str, AuthMethod | None, str | None]
+
+
+Trace = Callable[[str, dict[str, Any]], None]
+
+
+@dataclass
+class PoolStats:
+    """
+    Client registry hits and connection use as seen by httpcore. Requests
+    answered without the network (mocks, cassette replays, cache hits) open
+    and reuse nothing.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    requests: int = 0
+    prewarmed: int = 0
+    connections: int = 0
+    reused_connections: int = 0
+
+    def __str__(self) -> str:
+        line = f'clients: {self.hits} hits / {self.misses} misses'
+        if self.prewarmed or self.connections or self.reused_connections:
+            line += (
+                f', connections: {self.prewarmed} prewarmed, {self.connections} opened / '
+                f'{self.reused_connections} reused over {self.requests} requests'
+            )
+        else:
+            line += f', no connections over {self.requests} requests (mocked or replayed)'
+
+        return line
+
+
+class ClientPool:
+    """
+    Registry of ``HTTPClient`` instances keyed by (base_url, auth method, token).
+    Every client shares one connection pool, so clients built for different
+    fixtures reuse the same keep-alive connections.
+    """
+
+    def __init__(self, limits: Limits = DEFAULT_LIMITS) -> None:
+        self._lock = threading.Lock()
+        # request hooks and connection traces fire on whichever thread sends
+        self._stats_lock = threading.Lock()
+        self._limits = limits
+        self._transport = HTTPTransport(limits=limits, trust_env=True)
+        self._clients: dict[ClientKey, HTTPClient] = {}
+        self.stats = PoolStats()
+
+    def get_client(
+        self,
+        auth: Authentication | None = None,
+        base_url: str = base_settings.api_url,
+        auth_method: AuthMethod = AuthMethod.BEARER_TOKEN
+    ) -> HTTPClient:
+        key: ClientKey = (
+            (base_url, None, None) if auth is None else (base_url, auth_method, auth.user.token)
+        )
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.stats.hits += 1
+                return client
+
+            self.stats.misses += 1
+            client = HTTPClient(
+                **get_client_kwargs(auth, base_url, auth_method),
+                transport=self._transport,
+                event_hooks={'request': [self._on_request]}
+            )
+            self._clients[key] = client
+            return client
+
+    def prewarm(self, base_url: str = base_settings.api_url, connections: int | None = None) -> None:
+        """
+        Open keep-alive connections up front so the first tests skip the TCP+TLS handshake.
+
+        The HEADs go straight to the shared transport: they neither wait for
+        nor update the rate limiter, are not recorded in a cassette and only
+        show up in ``stats`` as prewarmed connections.
+        """
+        connections = connections or self._limits.max_keepalive_connections or 1
+        # not closed: that would close the shared transport with it
+        client = Client(transport=self._transport)
+
+        def connect(_: int) -> None:
+            try:
+                client.head(base_url, extensions={'trace': self._prewarm_trace})
+            except HTTPError:
+                pass
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(connect, range(connections)))
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+
+            self._clients.clear()
+            self._transport.close()
+
+    def _on_request(self, request: Request) -> None:
+        with self._stats_lock:
+            self.stats.requests += 1
+        request.extensions['trace'] = self._request_trace()
+
+    def _prewarm_trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            with self._stats_lock:
+                self.stats.prewarmed += 1
+
+    def _request_trace(self) -> Trace:
+        """Count a connection as reused when a request is sent on it without connecting first."""
+        connected = False
+
+        def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal connected
+            if event_name == 'connection.connect_tcp.complete':
+                connected = True
+                with self._stats_lock:
+                    self.stats.connections += 1
+            elif event_name.endswith('.send_request_headers.started'):
+                # retries send the same request again, maybe on another connection
+                reused, connected = not connected, False
+                if reused:
+                    with self._stats_lock:
+                        self.stats.reused_connections += 1
+
+        return trace
@@ -0,0 +1,93 @@
+"""
+Is the live GoRest API usable, or do we run against the mocks?
+
+The probe is one GET with a short connect timeout that only looks at the
+status, the headers and the first bytes of the body. Its verdict is cached
+in a file guarded by a ``FileLock`` for ``probe_cache_ttl`` seconds, so
+parallel runs and later runs on the same machine reuse it, and xdist
+workers receive the controller's verdict without probing at all. Only CI
+runs probe (see ``api_mode``), so a blocked verdict never silently turns a
+local run into a mocked one.
+"""
+import json
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import httpx
+from filelock import FileLock
+
+from settings import base_settings
+
+PROBE_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+HEAD_BYTES = 1024
+_CHALLENGE_MARKERS = (b'Just a moment', b'cf-chl', b'challenge-platform')
+
+
+@dataclass
+class ProbeVerdict:
+    url: str
+    blocked: bool
+    reason: str
+    checked_at: float
+    cached: bool = False
+
+    def describe(self) -> str:
+        source = f'probe cached {time.time() - self.checked_at:.0f}s ago' if self.cached else 'probe'
+        return f'{self.reason} from {self.url}, {source}'
+
+
+def looks_blocked(status_code: int, headers: httpx.Headers, head: bytes = b'') -> bool:
+    """Whether a response is a Cloudflare challenge/block page rather than an API answer."""
+    if 'cf-mitigated' in headers:
+        return True
+
+    if status_code not in (403, 429, 503) or 'cloudflare' not in headers.get('server', '').lower():
+        return False
+
+    return not head or any(marker in head for marker in _CHALLENGE_MARKERS)
+
+
+def probe(url: str, token: str) -> ProbeVerdict:
+    headers = {'Authorization': f'Bearer {token}'}
+    try:
+        with httpx.stream('GET', url, headers=headers, timeout=PROBE_TIMEOUT) as response:
+            head = b''
+            for chunk in response.iter_bytes():
+                head += chunk
+                if len(head) >= HEAD_BYTES:
+                    break
+
+            blocked = looks_blocked(response.status_code, response.headers, head[:HEAD_BYTES])
+            reason = f'HTTP {response.status_code}'
+    except httpx.HTTPError as error:
+        blocked, reason = True, type(error).__name__
+
+    return ProbeVerdict(url=url, blocked=blocked, reason=reason, checked_at=time.time())
+
+
+def cached_probe(url: str, token: str, cache_path: Path, ttl: float) -> ProbeVerdict:
+    """Return a verdict younger than ``ttl`` from ``cache_path``, probing (once, under a lock) if there is none."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(f'{cache_path}.lock'):
+        if cache_path.exists():
+            try:
+                verdict = ProbeVerdict(**json.loads(cache_path.read_text()))
+            except (ValueError, TypeError):
+                verdict = None
+
+            if verdict is not None and verdict.url == url and time.time() - verdict.checked_at < ttl:
+                return replace(verdict, cached=True)
+
+        verdict = probe(url, token)
+        cache_path.write_text(json.dumps(asdict(verdict)))
+        return verdict
+
+
+def api_verdict() -> ProbeVerdict:
+    return cached_probe(
+        f'{base_settings.api_url}posts',
+        base_settings.test_user_token,
+        Path(base_settings.probe_cache_path),
+        base_settings.probe_cache_ttl
+    )
@@ -0,0 +1,109 @@
+"""
+Client-side rate limiting against the token's GoRest budget.
+
+``RateLimitingTransport`` sits below the retries, so every attempt takes a
+token and reports the budget it was answered with; cache hits and
+coalesced followers never reach it and spend nothing.
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every client and fed by the GoRest
+    ``X-RateLimit-Limit``/``X-RateLimit-Remaining``/``X-RateLimit-Reset``
+    headers of every response. Until the API has reported a budget (e.g.
+    against the mocks) it never waits. ``share`` is the fraction of the
+    budget this process may spend, so parallel workers using one token do
+    not trip 429s together.
+    """
+
+    def __init__(self, share: float = 1.0) -> None:
+        self._lock = threading.Lock()
+        self._share = share
+        self._capacity: int | None = None
+        self._tokens: float = 0
+        self._window: float = 0.0
+        self._reset_at: float = 0.0
+
+    def acquire(self) -> float:
+        """Take a token and return how many seconds the caller must wait for it."""
+        with self._lock:
+            if self._capacity is None:
+                return 0.0
+
+            now = time.monotonic()
+            if now >= self._reset_at:
+                self._tokens = self._capacity
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            delay = self._reset_at - now
+            self._reset_at += self._window
+            self._tokens = self._capacity - 1
+            return delay
+
+    def set_share(self, share: float) -> None:
+        with self._lock:
+            self._share = min(max(share, 0.0), 1.0)
+
+    def update(self, status_code: int, headers: httpx.Headers) -> None:
+        limit = headers.get('X-RateLimit-Limit')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if limit is None or remaining is None or reset is None:
+            return
+
+        try:
+            limit, remaining, reset = int(limit), int(remaining), float(reset)
+        except ValueError:
+            return
+
+        with self._lock:
+            self._capacity = max(int(limit * self._share), 1)
+            self._tokens = 0 if status_code == 429 else min(remaining * self._share, self._capacity)
+            self._window = max(self._window, reset)
+            self._reset_at = time.monotonic() + reset
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        limiter: RateLimiter = rate_limiter
+    ) -> None:
+        self._transport = transport
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._limiter.acquire()
+        if delay > 0:
+            time.sleep(delay)
+
+        response = self._transport.handle_request(request)
+        self._limiter.update(response.status_code, response.headers)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self._limiter.acquire()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = await self._transport.handle_async_request(request)
+        self._limiter.update(response.status_code, response.headers)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,34 @@
+"""
+Typed decoding of API responses.
+
+Bodies are validated straight from ``response.content`` by pydantic's JSON
+parser, so there is no intermediate ``response.json()`` dict. Adapters are
+built once per model and the parsed value is memoized on the response, so
+asking for the same model twice does not parse the body twice.
+"""
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from httpx import Response
+from pydantic import TypeAdapter
+
+T = TypeVar('T')
+
+PARSED_EXTENSION = 'parsed'
+
+
+@lru_cache(maxsize=None)
+def get_adapter(model: type[T]) -> TypeAdapter[T]:
+    return TypeAdapter(model)
+
+
+def parse_response(response: Response, model: type[T]) -> T:
+    """
+    Validate the body of ``response`` as ``model``, e.g. ``DefaultUser`` or
+    ``DefaultUsersList``. Repeated calls return the same object.
+    """
+    parsed: dict[Any, Any] = response.extensions.setdefault(PARSED_EXTENSION, {})
+    if model not in parsed:
+        parsed[model] = get_adapter(model).validate_json(response.content)
+
+    return parsed[model]
@@ -0,0 +1,162 @@
+"""
+Retries for transient API failures (429, 5xx and dropped connections).
+
+Only idempotent methods are retried by default; any other request opts in
+with ``extensions={'retry': True}``. Waits honor ``Retry-After`` and
+otherwise use decorrelated jitter, and every retry spends from a run-wide
+``RetryBudget`` so a degraded API cannot turn the suite into a retry storm.
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from settings import base_settings
+
+RETRY_EXTENSION = 'retry'
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout, httpx.RemoteProtocolError)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = field(default_factory=lambda: base_settings.retry_max_attempts)
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    methods: frozenset[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'DELETE'})
+
+    def allows(self, request: httpx.Request) -> bool:
+        opt_in = request.extensions.get(RETRY_EXTENSION)
+        return opt_in if opt_in is not None else request.method in self.methods
+
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: random between the base delay and three times the previous one."""
+        return min(self.max_delay, random.uniform(self.base_delay, max(previous, self.base_delay) * 3))
+
+
+class RetryBudget:
+    """
+    Allow retries up to ``min_retries`` plus ``ratio`` of all requests sent so
+    far, for the whole run.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10) -> None:
+        self._lock = threading.Lock()
+        self._ratio = ratio
+        self._min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.retries >= self._min_retries + self._ratio * self.requests:
+                return False
+
+            self.retries += 1
+            return True
+
+
+retry_budget = RetryBudget(ratio=base_settings.retry_budget_ratio)
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Wrap a sync or async transport and retry transient failures."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport,
+        policy: RetryPolicy | None = None,
+        budget: RetryBudget = retry_budget
+    ) -> None:
+        self._transport = transport
+        self._policy = policy or RetryPolicy()
+        self._budget = budget
+
+    def _wait(self, request: httpx.Request, attempt: int, previous: float, response: httpx.Response | None) -> float | None:
+        """Return how long to wait before the next attempt, or ``None`` to give up."""
+        if attempt >= self._policy.max_attempts or not self._policy.allows(request):
+            return None
+
+        delay = retry_after(response) if response is not None else None
+        if delay is None:
+            delay = self._policy.next_delay(previous)
+        elif delay > self._policy.max_delay:
+            return None
+
+        return delay if self._budget.try_spend() else None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._budget.record_request()
+        attempt, delay = 1, 0.0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except RETRY_ERRORS:
+                delay = self._wait(request, attempt, delay, None)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+
+                delay = self._wait(request, attempt, delay, response)
+                if delay is None:
+                    return response
+
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._budget.record_request()
+        attempt, delay = 1, 0.0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except RETRY_ERRORS:
+                delay = self._wait(request, attempt, delay, None)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+
+                delay = self._wait(request, attempt, delay, response)
+                if delay is None:
+                    return response
+
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
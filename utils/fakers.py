@@ -1,10 +1,35 @@
-from random import choice, randint
+import secrets
+from functools import lru_cache
+from itertools import accumulate
+from random import Random, choice, choices, randint
 from string import ascii_letters, digits
-from faker import Faker
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from faker import Faker
 
-fake = Faker()
+_ALPHANUMERIC = ascii_letters + digits
+# Maps the first 248 byte values (4 * 62) onto the alphabet; the rest are
+# dropped by bytes.translate so every character is equally likely.
+_ALPHANUMERIC_TABLE = (_ALPHANUMERIC * 4).encode() + bytes(8)
+_REJECTED_BYTES = bytes(range(248, 256))
+_EMAIL_DOMAINS = ('example.com', 'example.org', 'example.net', 'test.io', 'mail.test')
+_GENDERS = ('male', 'female')
+_STATUSES = ('active', 'inactive')
+_TODO_STATUSES = ('pending', 'completed')
+# due dates of seeded todos count from here instead of from now, so a seed always gives the same dates
+SEEDED_START = datetime(2030, 1, 1)
+# part of every generated email, so seeded users of an earlier run do not collide on the live API (422)
+RUN_SALT = secrets.token_hex(3)
+
+
+@lru_cache(maxsize=None)
+def get_faker() -> 'Faker':
+    """Import and build ``Faker`` on first use; it is the slowest import of the suite."""
+    from faker import Faker
+
+    return Faker()
 
 
 def random_number(start: int = 100, end: int = 1000) -> int:
@@ -12,27 +37,116 @@ def random_number(start: int = 100, end: int = 1000) -> int:
 
 
 def random_string(start: int = 9, end: int = 15) -> str:
-    return ''.join(choice(ascii_letters + digits) for _ in range(randint(start, end)))
+    return ''.join(choices(_ALPHANUMERIC, k=randint(start, end)))
 
 
 def random_email() -> str:
-    return fake.email()
+    return get_faker().email()
 
 
 def random_gender() -> str:
-    return choice(['male', 'female'])
+    return choice(_GENDERS)
 
 
 def random_status() -> str:
-    return choice(['active', 'inactive'])
+    return choice(_STATUSES)
+
 
 def random_todo_status() -> str:
-    return choice(['pending', 'completed'])
+    return choice(_TODO_STATUSES)
+
+
+def _format_due_date(days_ahead: int, now: datetime) -> str:
+    # Format: YYYY-MM-DDTHH:MM:SS.000+05:30
+    return (now + timedelta(days=days_ahead)).strftime("%Y-%m-%dT%H:%M:%S.000+05:30")
 
 
 def random_due_date() -> str:
     """Generate a random due date in ISO format with timezone"""
-    days_ahead = randint(1, 365)
-    due_date = datetime.now() + timedelta(days=days_ahead)
-    # Format: YYYY-MM-DDTHH:MM:SS.000+05:30
-    return str(due_date.strftime("%Y-%m-%dT%H:%M:%S.000+05:30"))
\ No newline at end of file
+    return _format_due_date(randint(1, 365), datetime.now())
+
+
+# === Bulk generation ===
+#
+# The generators below build n values per field in one pass: lengths and
+# choices come from single ``Random.choices`` calls, characters are sliced
+# out of one random byte buffer, and models are assembled with
+# ``model_construct`` (the values are valid by construction). The same
+# seed always yields the same payloads within a run; emails also carry
+# ``RUN_SALT`` and differ from one run (or xdist worker) to the next.
+
+
+def _random_alphanumeric(rng: Random, size: int) -> str:
+    buffer = b''
+    while len(buffer) < size:
+        missing = size - len(buffer)
+        buffer += rng.randbytes(missing + missing // 16 + 16).translate(_ALPHANUMERIC_TABLE, _REJECTED_BYTES)
+
+    return buffer[:size].decode()
+
+
+def random_strings(n: int, rng: Random, start: int = 9, end: int = 15) -> list[str]:
+    lengths = rng.choices(range(start, end + 1), k=n)
+    buffer = _random_alphanumeric(rng, sum(lengths))
+    offsets = [0, *accumulate(lengths)]
+    return [buffer[offsets[i]:offsets[i + 1]] for i in range(n)]
+
+
+def random_emails(n: int, rng: Random) -> list[str]:
+    """Unique emails: a random local part, the item index, the run salt and a pooled domain."""
+    local_parts = random_strings(n, rng, 6, 10)
+    domains = rng.choices(_EMAIL_DOMAINS, k=n)
+    return [
+        f'{local.lower()}.{index}.{RUN_SALT}@{domain}'
+        for index, (local, domain) in enumerate(zip(local_parts, domains))
+    ]
+
+
+def random_due_dates(n: int, rng: Random, start: datetime) -> list[str]:
+    start = start.replace(microsecond=0)
+    pool = [_format_due_date(days_ahead, start) for days_ahead in range(1, 366)]
+    return rng.choices(pool, k=n)
+
+
+def generate_users(n: int, seed: int | None = None) -> list['DefaultUser']:
+    from models.users import DefaultUser
+
+    rng = Random(seed)
+    return [
+        DefaultUser.model_construct(id=user_id, name=name, email=email, gender=gender, status=status)
+        for user_id, name, email, gender, status in zip(
+            rng.choices(range(100, 1001), k=n),
+            random_strings(n, rng),
+            random_emails(n, rng),
+            rng.choices(_GENDERS, k=n),
+            rng.choices(_STATUSES, k=n),
+        )
+    ]
+
+
+def generate_posts(n: int, seed: int | None = None) -> list['UpdatePost']:
+    from models.posts import UpdatePost
+
+    rng = Random(seed)
+    return [
+        UpdatePost.model_construct(title=title, body=body)
+        for title, body in zip(random_strings(n, rng), random_strings(n, rng))
+    ]
+
+
+def generate_todos(n: int, seed: int | None = None, start: datetime | None = None) -> list['UpdateTodo']:
+    """Due dates fall within a year after ``start``: now, or ``SEEDED_START`` when seeded."""
+    from models.todos import UpdateTodo
+
+    if start is None:
+        start = datetime.now() if seed is None else SEEDED_START
+
+    rng = Random(seed)
+    return [
+        UpdateTodo.model_construct(title=title, due_on=due_on, status=status)
+        for title, due_on, status in zip(
+            random_strings(n, rng),
+            random_due_dates(n, rng, start),
+            rng.choices(_TODO_STATUSES, k=n),
+        )
+    ]
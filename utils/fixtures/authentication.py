@@ -2,13 +2,14 @@ import pytest
 
 from base.api.users_api import UsersClient
 from models.authentication import Authentication, AuthUser
-from utils.clients.http.builder import AuthMethod, get_http_client
+from utils.clients.http.builder import AuthMethod
+from utils.clients.http.pool import ClientPool
 
 
 @pytest.fixture(scope="class")
-def bearer_token_client() -> UsersClient:
+def bearer_token_client(client_pool: ClientPool) -> UsersClient:
     """Client using HTTP Bearer Token authentication."""
-    client = get_http_client(
+    client = client_pool.get_client(
         auth=Authentication(),
         auth_method=AuthMethod.BEARER_TOKEN
     )
@@ -16,9 +17,9 @@ def bearer_token_client() -> UsersClient:
 
 
 @pytest.fixture(scope="class")
-def query_param_client() -> UsersClient:
+def query_param_client(client_pool: ClientPool) -> UsersClient:
     """Client using Query Parameter authentication."""
-    client = get_http_client(
+    client = client_pool.get_client(
         auth=Authentication(),
         auth_method=AuthMethod.QUERY_PARAM
     )
@@ -26,10 +27,10 @@ def query_param_client() -> UsersClient:
 
 
 @pytest.fixture(scope="function")
-def invalid_bearer_client() -> UsersClient:
+def invalid_bearer_client(client_pool: ClientPool) -> UsersClient:
     """Client using invalid Bearer Token."""
     invalid_auth = Authentication(user=AuthUser(token="invalid_token_12345"))
-    client = get_http_client(
+    client = client_pool.get_client(
         auth=invalid_auth,
         auth_method=AuthMethod.BEARER_TOKEN
     )
@@ -37,10 +38,10 @@ def invalid_bearer_client() -> UsersClient:
 
 
 @pytest.fixture(scope="function")
-def invalid_query_param_client() -> UsersClient:
+def invalid_query_param_client(client_pool: ClientPool) -> UsersClient:
     """Client using invalid query parameter token."""
     invalid_auth = Authentication(user=AuthUser(token="invalid_token_12345"))
-    client = get_http_client(
+    client = client_pool.get_client(
         auth=invalid_auth,
         auth_method=AuthMethod.QUERY_PARAM
     )
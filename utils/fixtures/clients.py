@@ -0,0 +1,148 @@
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from models.authentication import Authentication
+from settings import base_settings
+from utils.cleanup import CleanupRegistry
+from utils.clients.http.breaker import circuit_breaker
+from utils.clients.http.cassette import close_cassette
+from utils.clients.http.metrics import request_metrics
+from utils.clients.http.pool import ClientPool, PoolStats
+from utils.plugins.durations import history_nodeid
+from utils.steps import InstrumentationLevel, begin_test, set_instrumentation_level
+
+pool_stats_key = pytest.StashKey[PoolStats]()
+cleanup_key = pytest.StashKey[CleanupRegistry]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    level = base_settings.instrumentation_level or (
+        InstrumentationLevel.FULL if config.getoption('allure_report_dir', None) else InstrumentationLevel.OFF
+    )
+    set_instrumentation_level(level, base_settings.instrumentation_sample_every)
+
+
+@pytest.fixture(autouse=True)
+def instrumentation() -> None:
+    begin_test()
+
+
+@pytest.fixture(scope='session')
+def client_pool(request: pytest.FixtureRequest, use_mocking: bool) -> Iterator[ClientPool]:
+    pool = ClientPool()
+    if not use_mocking and base_settings.cassette_mode != 'replay':
+        pool.prewarm()
+
+    yield pool
+
+    pool.close()
+    request.config.stash[pool_stats_key] = pool.stats
+
+
+@pytest.fixture(scope='session')
+def cleanup_registry(request: pytest.FixtureRequest, client_pool: ClientPool) -> Iterator[CleanupRegistry]:
+    """Resources created through the API clients, deleted at class end and at session end."""
+    registry = CleanupRegistry(client_pool.get_client(auth=Authentication()), batch_size=base_settings.cleanup_batch_size)
+    yield registry
+
+    registry.drain()
+    request.config.stash[cleanup_key] = registry
+
+
+@pytest.fixture(scope='class')
+def class_cleanup(cleanup_registry: CleanupRegistry) -> Iterator[CleanupRegistry]:
+    """The cleanup registry for the API client fixtures, drained when their class is done."""
+    yield cleanup_registry
+    cleanup_registry.drain()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cassette() -> Iterator[None]:
+    """Flush the cassette index when recording."""
+    yield
+    close_cassette()
+
+
+@pytest.fixture(autouse=True)
+def cassette_seed(request: pytest.FixtureRequest) -> None:
+    """Make generated payloads repeatable per test so a replay matches its recording."""
+    if base_settings.cassette_mode != 'off':
+        from faker import Faker
+
+        nodeid = history_nodeid(request.node.nodeid)
+        random.seed(nodeid)
+        Faker.seed(nodeid)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def http_latency_report(request: pytest.FixtureRequest) -> Iterator[None]:
+    """
+    Attach p50/p95/p99 latency per route to the allure report. Under ``-n``
+    every worker attaches its own share; ``latency_report_path`` gets the
+    whole run, see ``pytest_sessionfinish``.
+    """
+    yield
+
+    if request.config.getoption('allure_report_dir', None):
+        import allure
+
+        summary = json.dumps(request_metrics.summary(), indent=2)
+        allure.attach(summary, name='HTTP latency summary', attachment_type=allure.attachment_type.JSON)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    stats = config.stash.get(pool_stats_key, None)
+    if stats is not None:
+        terminalreporter.write_sep('-', 'HTTP client pool')
+        terminalreporter.write_line(str(stats))
+
+    registry = config.stash.get(cleanup_key, None)
+    if registry is not None:
+        terminalreporter.write_sep('-', 'Cleanup')
+        terminalreporter.write_line(f'deleted: {registry.deleted}, leaked: {len(registry.leaks)}')
+        for leak in registry.leaks:
+            terminalreporter.write_line(f'  {leak}', red=True)
+
+    if circuit_breaker.opened:
+        terminalreporter.write_sep('-', 'Circuit breaker')
+        terminalreporter.write_line(
+            f'opened {circuit_breaker.opened} times, {circuit_breaker.short_circuited} requests '
+            f'not sent upstream ({base_settings.circuit_breaker_mode}), now {circuit_breaker.state.value}',
+            yellow=True
+        )
+
+    if circuit_breaker.fallback_served:
+        terminalreporter.write_sep('!', 'FAKE BACKEND USED', red=True, bold=True)
+        terminalreporter.write_line(
+            f'{circuit_breaker.fallback_served} requests were answered by the fake backend instead of '
+            f'{base_settings.api_url}; results of this run do not reflect the live API',
+            red=True, bold=True
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    worker_output = getattr(session.config, 'workeroutput', None)
+    if worker_output is not None:
+        # the controller prints the summary
+        worker_output['circuit_breaker'] = circuit_breaker.counters()
+        worker_output['request_metrics'] = request_metrics.counters()
+        return
+
+    if base_settings.latency_report_path:
+        Path(base_settings.latency_report_path).write_text(json.dumps(request_metrics.summary(), indent=2))
+
+    if circuit_breaker.fallback_served and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error) -> None:
+    worker_output = getattr(node, 'workeroutput', {})
+    if 'circuit_breaker' in worker_output:
+        circuit_breaker.add_counters(worker_output['circuit_breaker'])
+    if 'request_metrics' in worker_output:
+        request_metrics.add_counters(worker_output['request_metrics'])
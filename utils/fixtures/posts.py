@@ -1,18 +1,21 @@
+from typing import AsyncIterator
+
 import pytest
-import time
 
-from base.api.posts_api import PostsClient
+from base.api.posts_api import AsyncPostsClient, PostsClient
 from models.authentication import Authentication
 from models.posts import DefaultPost
 from models.users import DefaultUser
-from utils.clients.http.builder import get_http_client
+from utils.clients.http.builder import get_async_http_client
+from utils.cleanup import CleanupRegistry
+from utils.clients.http.pool import ClientPool
     
 
 @pytest.fixture(scope="class")
-def class_posts_client() -> PostsClient:
-    client = get_http_client(auth=Authentication())
+def class_posts_client(client_pool: ClientPool, class_cleanup: CleanupRegistry) -> PostsClient:
+    client = client_pool.get_client(auth=Authentication())
 
-    return PostsClient(client=client)
+    return PostsClient(client=client, cleanup=class_cleanup)
 
 @pytest.fixture(scope='function')
 def function_post(function_user: DefaultUser,
@@ -22,8 +25,8 @@ def function_post(function_user: DefaultUser,
     post = class_posts_client.create_post(user_id)
     yield post
 
-@pytest.fixture(autouse=True)
-def rate_limit_delay():
-    """Add delay between tests to avoid rate limiting"""
-    yield
-    time.sleep(0.5)
\ No newline at end of file
+
+@pytest.fixture(scope='function')
+async def async_posts_client(class_cleanup: CleanupRegistry) -> AsyncIterator[AsyncPostsClient]:
+    async with get_async_http_client(auth=Authentication()) as client:
+        yield AsyncPostsClient(client=client, cleanup=class_cleanup)
\ No newline at end of file
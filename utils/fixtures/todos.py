@@ -1,18 +1,21 @@
+from typing import AsyncIterator
+
 import pytest
-import time
 
-from base.api.todos_api import TodosClient
+from base.api.todos_api import AsyncTodosClient, TodosClient
 from models.authentication import Authentication
 from models.todos import DefaultTodo
 from models.users import DefaultUser
-from utils.clients.http.builder import get_http_client
+from utils.clients.http.builder import get_async_http_client
+from utils.cleanup import CleanupRegistry
+from utils.clients.http.pool import ClientPool
     
 
 @pytest.fixture(scope="class")
-def class_todos_client() -> TodosClient:
-    client = get_http_client(auth=Authentication())
+def class_todos_client(client_pool: ClientPool, class_cleanup: CleanupRegistry) -> TodosClient:
+    client = client_pool.get_client(auth=Authentication())
 
-    return TodosClient(client=client)
+    return TodosClient(client=client, cleanup=class_cleanup)
 
 @pytest.fixture(scope='function')
 def function_todo(function_user: DefaultUser,
@@ -22,10 +25,8 @@ def function_todo(function_user: DefaultUser,
     todo = class_todos_client.create_todo(user_id)
     yield todo
 
-    class_todos_client.delete_todo_api(user_id, todo.id)
 
-@pytest.fixture(autouse=True)
-def rate_limit_delay():
-    """Add delay between tests to avoid rate limiting"""
-    yield
-    time.sleep(0.5)
\ No newline at end of file
+@pytest.fixture(scope='function')
+async def async_todos_client(class_cleanup: CleanupRegistry) -> AsyncIterator[AsyncTodosClient]:
+    async with get_async_http_client(auth=Authentication()) as client:
+        yield AsyncTodosClient(client=client, cleanup=class_cleanup)
\ No newline at end of file
@@ -1,27 +1,56 @@
+import os
+from typing import AsyncIterator, Iterator
+
 import pytest
-import time
 
-from base.api.users_api import UsersClient
+from base.api.users_api import AsyncUsersClient, UsersClient
 from models.authentication import Authentication
 from models.users import DefaultUser
-from utils.clients.http.builder import get_http_client
+from utils.clients.http.builder import get_async_http_client
+from settings import base_settings
+from utils.cleanup import CleanupRegistry
+from utils.clients.http.pool import ClientPool
+from utils.plugins.durations import history_nodeid
+from utils.user_pool import UserPool
     
 
 @pytest.fixture(scope="class")
-def class_users_client() -> UsersClient:
-    client = get_http_client(auth=Authentication())
+def class_users_client(client_pool: ClientPool, class_cleanup: CleanupRegistry) -> UsersClient:
+    client = client_pool.get_client(auth=Authentication())
+
+    return UsersClient(client=client, cleanup=class_cleanup)
+
+@pytest.fixture(scope='session')
+def user_pool(tmp_path_factory: pytest.TempPathFactory, use_mocking: bool) -> Iterator[UserPool]:
+    # Every xdist worker runs its own mock backend, so only share users of the live API.
+    state_path = None
+    if os.getenv('PYTEST_XDIST_WORKER') and not use_mocking:
+        state_path = tmp_path_factory.getbasetemp().parent / 'user_pool.json'
 
-    return UsersClient(client=client)
+    pool = UserPool(size=base_settings.user_pool_size, state_path=state_path)
+    pool.fill()
+    yield pool
+
+    pool.release()
 
 @pytest.fixture(scope='function')
-def function_user(class_users_client: UsersClient) -> DefaultUser:
-    user = class_users_client.create_user()
-    yield user
+def function_user(request: pytest.FixtureRequest,
+                  user_pool: UserPool,
+                  class_users_client: UsersClient) -> DefaultUser:
+    """
+    A user leased from the session pool, or a fresh one for tests
+    marked with ``mutates_user``.
+    """
+    if request.node.get_closest_marker('mutates_user') is None:
+        # keyed by test so a cassette replays the same user whatever ran before
+        yield user_pool.lease(history_nodeid(request.node.nodeid))
+        return
+
+    # deleted with the rest of the class's resources by the cleanup registry
+    yield class_users_client.create_user()
 
-    class_users_client.delete_user_api(user.id)
 
-@pytest.fixture(autouse=True)
-def rate_limit_delay():
-    """Add delay between tests to avoid rate limiting"""
-    yield
-    time.sleep(0.5)
\ No newline at end of file
+@pytest.fixture(scope='function')
+async def async_users_client(class_cleanup: CleanupRegistry) -> AsyncIterator[AsyncUsersClient]:
+    async with get_async_http_client(auth=Authentication()) as client:
+        yield AsyncUsersClient(client=client, cleanup=class_cleanup)
\ No newline at end of file
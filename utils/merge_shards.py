@@ -0,0 +1,73 @@
+"""
+Combine the output of ``--shard i/n`` runs.
+
+    python -m utils.merge_shards \\
+        --allure-results shard-1/allure-results shard-2/allure-results \\
+        --caches shard-1/.pytest_cache shard-2/.pytest_cache
+
+Allure result files are uniquely named per test, so the directories are
+simply copied into one; shared files such as ``environment.properties``
+are taken from the first shard that has them. The timings every shard
+stored in its pytest cache are merged into the durations history of
+``--cache-output`` (the local ``.pytest_cache`` by default), on top of the
+history already there, ready to balance the next sharded run.
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+from utils.plugins.durations import HISTORY_KEY
+from utils.plugins.sharding import SHARD_TIMINGS_KEY
+
+
+def cache_value_path(cache_dir: Path, key: str) -> Path:
+    """Where ``pytest.Cache`` keeps ``key`` under ``cache_dir``."""
+    return cache_dir / 'v' / key
+
+
+def merge_allure_results(sources: list[Path], output: Path) -> int:
+    output.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source in sources:
+        for path in sorted(source.iterdir()):
+            target = output / path.name
+            if path.is_file() and not target.exists():
+                shutil.copy2(path, target)
+                copied += 1
+
+    return copied
+
+
+def merge_timings(caches: list[Path], output: Path) -> int:
+    history_path = cache_value_path(output, HISTORY_KEY)
+    merged: dict[str, list[float]] = json.loads(history_path.read_text()) if history_path.exists() else {}
+    for cache_dir in caches:
+        timings = cache_value_path(cache_dir, SHARD_TIMINGS_KEY)
+        if timings.exists():
+            merged.update(json.loads(timings.read_text()))
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history_path.write_text(json.dumps(merged, indent=2, sort_keys=True))
+    return len(merged)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Merge allure results and timings of sharded runs.')
+    parser.add_argument('--allure-results', nargs='*', type=Path, default=[], help='allure-results directory of every shard')
+    parser.add_argument('--allure-output', type=Path, default=Path('allure-results'))
+    parser.add_argument('--caches', nargs='*', type=Path, default=[], help='.pytest_cache directory of every shard')
+    parser.add_argument('--cache-output', type=Path, default=Path('.pytest_cache'))
+    args = parser.parse_args(argv)
+
+    if args.allure_results:
+        copied = merge_allure_results(args.allure_results, args.allure_output)
+        print(f'{copied} allure result files -> {args.allure_output}')
+
+    if args.caches:
+        tests = merge_timings(args.caches, args.cache_output)
+        print(f'timings of {tests} tests -> {args.cache_output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,505 @@
+"""
+Stateful in-memory model of the GoRest API served through an httpx transport.
+"""
+import hashlib
+import itertools
+import json
+import math
+import re
+import threading
+from typing import Any, Iterable
+
+import httpx
+
+from settings import base_settings
+from utils.mocks.router import Router
+
+_INVALID_TOKEN_PREFIX = "invalid_token"
+_MAX_LENGTH = 200
+_DEFAULT_PER_PAGE = 10
+_MAX_PER_PAGE = 100
+_EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+_JSON_HEADERS = [(b'Content-Type', b'application/json')]
+_NOT_FOUND_BODY = b'{"message":"Resource not found"}'
+_UNAUTHORIZED_BODY = b'{"message":"Authentication failed"}'
+
+Record = dict[str, Any]
+Errors = list[dict[str, str]]
+Snapshot = tuple[int, int, int]
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _json_response(status_code: int, body: bytes, headers: list[tuple[bytes, bytes]] | None = None) -> httpx.Response:
+    return httpx.Response(status_code, content=body, headers=_JSON_HEADERS + (headers or []))
+
+
+def _with_etag(request: httpx.Request, response: httpx.Response) -> httpx.Response:
+    """Tag a GET response like GoRest (Rack::ETag) and honor ``If-None-Match``."""
+    etag = f'W/"{hashlib.blake2b(response.content, digest_size=16).hexdigest()}"'
+    if request.headers.get('If-None-Match') == etag:
+        return httpx.Response(304, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
+    return response
+
+
+def _is_authenticated(request: httpx.Request) -> bool:
+    """Check if request has valid authentication."""
+    auth_header = request.headers.get("Authorization")
+    if auth_header is not None and auth_header.startswith("Bearer "):
+        token = auth_header[7:]
+    elif request.url.query:
+        token = request.url.params.get("access_token", "")
+    else:
+        return False
+
+    return token != "" and not token.startswith(_INVALID_TOKEN_PREFIX)
+
+
+def _not_found() -> httpx.Response:
+    return _json_response(404, _NOT_FOUND_BODY)
+
+
+def _unauthorized() -> httpx.Response:
+    return _json_response(401, _UNAUTHORIZED_BODY)
+
+
+def _unprocessable(errors: Errors) -> httpx.Response:
+    return _json_response(422, _encode(errors))
+
+
+def _read_json(request: httpx.Request) -> dict[str, Any]:
+    try:
+        data = json.loads(request.content)
+    except (json.JSONDecodeError, TypeError, UnicodeDecodeError):
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def _check_text(errors: Errors, data: dict[str, Any], field: str, partial: bool) -> None:
+    if partial and field not in data:
+        return
+
+    value = data.get(field)
+    if value is None or value == "":
+        errors.append({"field": field, "message": "can't be blank"})
+    elif len(str(value)) > _MAX_LENGTH:
+        errors.append({"field": field, "message": f"is too long (maximum is {_MAX_LENGTH} characters)"})
+
+
+def _check_choice(errors: Errors, data: dict[str, Any], field: str, choices: tuple[str, ...], partial: bool) -> None:
+    if partial and field not in data:
+        return
+
+    if data.get(field) not in choices:
+        errors.append({"field": field, "message": f"can't be blank, can be {' or '.join(choices)}"})
+
+
+class Table:
+    """
+    Id-indexed records kept in insertion (= id) order, with the JSON encoding
+    of every record cached until it changes so list responses are assembled
+    from pre-serialized bytes.
+    """
+
+    def __init__(self, unique: tuple[str, ...] = ()) -> None:
+        self.records: dict[int, Record] = {}
+        self.indexes: dict[str, dict[Any, int]] = {field: {} for field in unique}
+        self._encoded: dict[int, bytes] = {}
+        self._journal: list[tuple[int, Record | None]] = []
+
+    def __contains__(self, record_id: int) -> bool:
+        return record_id in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, record_id: int) -> Record | None:
+        return self.records.get(record_id)
+
+    def find(self, field: str, value: Any) -> int | None:
+        return self.indexes[field].get(value)
+
+    def put(self, record: Record) -> None:
+        self._journal.append((record["id"], self.records.get(record["id"])))
+        self._store(record["id"], record)
+
+    def pop(self, record_id: int) -> Record | None:
+        record = self.records.get(record_id)
+        if record is not None:
+            self._journal.append((record_id, record))
+            self._store(record_id, None)
+
+        return record
+
+    def checkpoint(self) -> int:
+        return len(self._journal)
+
+    def rollback(self, checkpoint: int) -> None:
+        """Undo every change made since ``checkpoint`` in O(number of changes)."""
+        reinserted = False
+        while len(self._journal) > checkpoint:
+            record_id, previous = self._journal.pop()
+            reinserted |= previous is not None and record_id not in self.records
+            self._store(record_id, previous)
+
+        if reinserted:
+            self.records = dict(sorted(self.records.items()))
+
+    def _store(self, record_id: int, record: Record | None) -> None:
+        previous = self.records.get(record_id)
+        if previous is not None:
+            for field, index in self.indexes.items():
+                index.pop(previous[field], None)
+
+        if record is None:
+            self.records.pop(record_id, None)
+        else:
+            self.records[record_id] = record
+            for field, index in self.indexes.items():
+                index[record[field]] = record_id
+
+        self._encoded.pop(record_id, None)
+
+    def encode(self, record_id: int) -> bytes:
+        encoded = self._encoded.get(record_id)
+        if encoded is None:
+            encoded = self._encoded[record_id] = _encode(self.records[record_id])
+
+        return encoded
+
+    def encode_many(self, record_ids: Iterable[int]) -> bytes:
+        return b'[' + b','.join(self.encode(record_id) for record_id in record_ids) + b']'
+
+
+router = Router()
+
+
+class FakeGoRest:
+    """
+    In-memory GoRest backend: id-indexed users, posts and todos with
+    auto-increment ids, email uniqueness and user foreign keys.
+    """
+
+    def __init__(self, base_url: str = base_settings.api_url) -> None:
+        self._prefix = httpx.URL(base_url).path.rstrip('/')
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all data and re-create the seed records."""
+        with self._lock:
+            self.users = Table(unique=("email",))
+            self.posts = Table()
+            self.todos = Table()
+            self._ids = itertools.count(1)
+            self._seed()
+
+    def snapshot(self) -> Snapshot:
+        """Mark the current state so ``restore`` can roll back to it."""
+        with self._lock:
+            return self.users.checkpoint(), self.posts.checkpoint(), self.todos.checkpoint()
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Roll the store back to ``snapshot``. Ids keep increasing so an id is
+        never handed out twice in a session.
+        """
+        with self._lock:
+            for table, checkpoint in zip((self.users, self.posts, self.todos), snapshot):
+                table.rollback(checkpoint)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if not path.startswith(self._prefix):
+            return _not_found()
+
+        match = router.match(request.method, path[len(self._prefix):])
+        if match is None:
+            return _not_found()
+
+        if request.method != 'GET' and not _is_authenticated(request):
+            return _unauthorized()
+
+        handler, params = match
+        with self._lock:
+            response = handler(self, request, **params)
+
+        if request.method == 'GET' and response.status_code == 200:
+            return _with_etag(request, response)
+
+        return response
+
+    def _seed(self) -> None:
+        for name, email, gender in (
+            ("Test User", "test.user@example.com", "male"),
+            ("Jane Doe", "jane.doe@example.com", "female"),
+        ):
+            self.users.put({
+                "id": next(self._ids), "name": name, "email": email, "gender": gender, "status": "active"
+            })
+
+        first_user_id = next(iter(self.users.records))
+        for title, body in (("Test Post", "Test body content"), ("Another Post", "More content")):
+            self.posts.put({"id": next(self._ids), "user_id": first_user_id, "title": title, "body": body})
+
+        self.todos.put({
+            "id": next(self._ids), "user_id": first_user_id, "title": "Test Todo",
+            "due_on": "2024-12-31T23:59:59.000+05:30", "status": "pending"
+        })
+
+    # === Helpers ===
+
+    @staticmethod
+    def _paginate(request: httpx.Request, table: Table, record_ids: list[int]) -> httpx.Response:
+        """Return records newest first, paginated like GoRest via ``page``/``per_page``."""
+        page, per_page = 1, _DEFAULT_PER_PAGE
+        if request.url.query:
+            try:
+                page = max(int(request.url.params.get('page', page)), 1)
+                per_page = min(max(int(request.url.params.get('per_page', per_page)), 1), _MAX_PER_PAGE)
+            except ValueError:
+                page, per_page = 1, _DEFAULT_PER_PAGE
+
+        total = len(record_ids)
+        start = (page - 1) * per_page
+        page_ids = record_ids[::-1][start:start + per_page]
+        headers = [
+            (b'X-Pagination-Total', str(total).encode()),
+            (b'X-Pagination-Pages', str(math.ceil(total / per_page)).encode()),
+            (b'X-Pagination-Page', str(page).encode()),
+            (b'X-Pagination-Limit', str(per_page).encode()),
+        ]
+        return _json_response(200, table.encode_many(page_ids), headers)
+
+    @staticmethod
+    def _get(table: Table, record_id: int) -> httpx.Response:
+        if record_id not in table:
+            return _not_found()
+
+        return _json_response(200, table.encode(record_id))
+
+    @staticmethod
+    def _delete(table: Table, record_id: int) -> httpx.Response:
+        if table.pop(record_id) is None:
+            return _not_found()
+
+        return httpx.Response(204)
+
+    def _insert(self, table: Table, fields: tuple[str, ...], data: dict[str, Any]) -> httpx.Response:
+        record = {"id": next(self._ids), **{field: data.get(field) for field in fields}}
+        table.put(record)
+        return _json_response(201, table.encode(record["id"]))
+
+    @staticmethod
+    def _update(table: Table, fields: tuple[str, ...], record_id: int, data: dict[str, Any]) -> httpx.Response:
+        table.put({**table.get(record_id), **{field: data[field] for field in fields if field in data}})
+        return _json_response(200, table.encode(record_id))
+
+    def _validate_user(self, data: dict[str, Any], partial: bool = False, user_id: int | None = None) -> Errors:
+        errors: Errors = []
+        _check_text(errors, data, "name", partial)
+        _check_text(errors, data, "email", partial)
+        if "email" in data and not any(error["field"] == "email" for error in errors):
+            email = str(data["email"])
+            owner = self.users.find("email", email)
+            if not _EMAIL_PATTERN.match(email):
+                errors.append({"field": "email", "message": "is invalid"})
+            elif owner is not None and owner != user_id:
+                errors.append({"field": "email", "message": "has already been taken"})
+
+        _check_choice(errors, data, "gender", ("male", "female"), partial)
+        _check_choice(errors, data, "status", ("active", "inactive"), partial)
+        return errors
+
+    def _validate_post(self, data: dict[str, Any], partial: bool = False) -> Errors:
+        errors: Errors = []
+        if not partial and data.get("user_id") not in self.users.records:
+            errors.append({"field": "user", "message": "must exist"})
+
+        _check_text(errors, data, "title", partial)
+        _check_text(errors, data, "body", partial)
+        return errors
+
+    def _validate_todo(self, data: dict[str, Any], partial: bool = False) -> Errors:
+        errors: Errors = []
+        if not partial and data.get("user_id") not in self.users.records:
+            errors.append({"field": "user", "message": "must exist"})
+
+        _check_text(errors, data, "title", partial)
+        _check_choice(errors, data, "status", ("pending", "completed"), partial)
+        return errors
+
+    @staticmethod
+    def _owned_by(table: Table, user_id: int) -> list[int]:
+        return [record_id for record_id, record in table.records.items() if record["user_id"] == user_id]
+
+    # === Users ===
+
+    _USER_FIELDS = ("name", "email", "gender", "status")
+
+    @router.route('GET', '/users')
+    def _list_users(self, request: httpx.Request) -> httpx.Response:
+        return self._paginate(request, self.users, list(self.users.records))
+
+    @router.route('GET', '/users/{user_id:int}')
+    def _get_user(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        return self._get(self.users, user_id)
+
+    @router.route('POST', '/users')
+    def _create_user(self, request: httpx.Request) -> httpx.Response:
+        data = _read_json(request)
+        errors = self._validate_user(data)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._insert(self.users, self._USER_FIELDS, data)
+
+    @router.route('PATCH', '/users/{user_id:int}')
+    @router.route('PUT', '/users/{user_id:int}')
+    def _update_user(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        if user_id not in self.users:
+            return _not_found()
+
+        data = _read_json(request)
+        errors = self._validate_user(data, partial=True, user_id=user_id)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._update(self.users, self._USER_FIELDS, user_id, data)
+
+    @router.route('DELETE', '/users/{user_id:int}')
+    def _delete_user(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        if self.users.pop(user_id) is None:
+            return _not_found()
+
+        for table in (self.posts, self.todos):
+            for record_id in self._owned_by(table, user_id):
+                table.pop(record_id)
+
+        return httpx.Response(204)
+
+    # === Posts ===
+
+    _POST_FIELDS = ("user_id", "title", "body")
+
+    @router.route('GET', '/posts')
+    def _list_posts(self, request: httpx.Request) -> httpx.Response:
+        return self._paginate(request, self.posts, list(self.posts.records))
+
+    @router.route('GET', '/users/{user_id:int}/posts')
+    def _list_user_posts(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        return self._paginate(request, self.posts, self._owned_by(self.posts, user_id))
+
+    @router.route('GET', '/posts/{post_id:int}')
+    def _get_post(self, request: httpx.Request, post_id: int) -> httpx.Response:
+        return self._get(self.posts, post_id)
+
+    @router.route('POST', '/posts')
+    def _create_post(self, request: httpx.Request) -> httpx.Response:
+        data = _read_json(request)
+        errors = self._validate_post(data)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._insert(self.posts, self._POST_FIELDS, data)
+
+    @router.route('POST', '/users/{user_id:int}/posts')
+    def _create_user_post(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        data = {**_read_json(request), "user_id": user_id}
+        errors = self._validate_post(data)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._insert(self.posts, self._POST_FIELDS, data)
+
+    @router.route('PATCH', '/posts/{post_id:int}')
+    @router.route('PUT', '/posts/{post_id:int}')
+    def _update_post(self, request: httpx.Request, post_id: int) -> httpx.Response:
+        if post_id not in self.posts:
+            return _not_found()
+
+        data = _read_json(request)
+        errors = self._validate_post(data, partial=True)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._update(self.posts, ("title", "body"), post_id, data)
+
+    @router.route('DELETE', '/posts/{post_id:int}')
+    def _delete_post(self, request: httpx.Request, post_id: int) -> httpx.Response:
+        return self._delete(self.posts, post_id)
+
+    # === Todos ===
+
+    _TODO_FIELDS = ("user_id", "title", "due_on", "status")
+
+    @router.route('GET', '/todos')
+    def _list_todos(self, request: httpx.Request) -> httpx.Response:
+        return self._paginate(request, self.todos, list(self.todos.records))
+
+    @router.route('GET', '/users/{user_id:int}/todos')
+    def _list_user_todos(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        return self._paginate(request, self.todos, self._owned_by(self.todos, user_id))
+
+    @router.route('GET', '/todos/{todo_id:int}')
+    def _get_todo(self, request: httpx.Request, todo_id: int) -> httpx.Response:
+        return self._get(self.todos, todo_id)
+
+    @router.route('POST', '/todos')
+    def _create_todo(self, request: httpx.Request) -> httpx.Response:
+        data = _read_json(request)
+        errors = self._validate_todo(data)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._insert(self.todos, self._TODO_FIELDS, data)
+
+    @router.route('POST', '/users/{user_id:int}/todos')
+    def _create_user_todo(self, request: httpx.Request, user_id: int) -> httpx.Response:
+        data = {**_read_json(request), "user_id": user_id}
+        errors = self._validate_todo(data)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._insert(self.todos, self._TODO_FIELDS, data)
+
+    @router.route('PATCH', '/todos/{todo_id:int}')
+    @router.route('PUT', '/todos/{todo_id:int}')
+    def _update_todo(self, request: httpx.Request, todo_id: int) -> httpx.Response:
+        if todo_id not in self.todos:
+            return _not_found()
+
+        data = _read_json(request)
+        errors = self._validate_todo(data, partial=True)
+        if errors:
+            return _unprocessable(errors)
+
+        return self._update(self.todos, ("title", "due_on", "status"), todo_id, data)
+
+    @router.route('DELETE', '/todos/{todo_id:int}')
+    def _delete_todo(self, request: httpx.Request, todo_id: int) -> httpx.Response:
+        return self._delete(self.todos, todo_id)
+
+
+class FakeGoRestTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve requests from a ``FakeGoRest`` instead of the network."""
+
+    def __init__(self, server: 'FakeGoRest | None' = None) -> None:
+        self.server = server or fake_gorest
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        return self.server.handle(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return self.server.handle(request)
+
+
+fake_gorest = FakeGoRest()
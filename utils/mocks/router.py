@@ -0,0 +1,108 @@
+"""
+Method + path-segment trie used to dispatch mocked requests.
+"""
+from typing import Any, Callable
+
+Converter = Callable[[str], Any]
+
+
+def _to_int(segment: str) -> int:
+    if not segment.isdigit():
+        raise ValueError(segment)
+
+    return int(segment)
+
+
+CONVERTERS: dict[str, Converter] = {
+    'int': _to_int,
+    'str': str,
+}
+
+
+class _Node:
+    __slots__ = ('static', 'params', 'handlers')
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node] = {}
+        self.params: list[tuple[str, Converter, _Node]] = []
+        self.handlers: dict[str, Callable] = {}
+
+
+class Router:
+    """
+    Routes are compiled into a trie of path segments when they are added, so
+    dispatch costs O(path depth) regardless of how many routes exist and does
+    not depend on registration order. Templates use typed parameters, e.g.
+    ``/users/{user_id:int}/posts``; a segment that fails conversion simply
+    does not match, and neither does a route without a handler for the
+    method, so e.g. ``GET /users/me`` still reaches ``/users/{user_id:str}``
+    when ``/users/me`` only has a ``POST``.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+
+    def add(self, method: str, template: str, handler: Callable) -> None:
+        node = self._root
+        for segment in template.strip('/').split('/'):
+            if segment.startswith('{') and segment.endswith('}'):
+                name, _, kind = segment[1:-1].partition(':')
+                converter = CONVERTERS[kind or 'str']
+                child = next(
+                    (child for param, conv, child in node.params if param == name and conv is converter),
+                    None
+                )
+                if child is None:
+                    child = _Node()
+                    node.params.append((name, converter, child))
+            else:
+                child = node.static.setdefault(segment, _Node())
+
+            node = child
+
+        node.handlers[method.upper()] = handler
+
+    def route(self, method: str, template: str) -> Callable[[Callable], Callable]:
+        def decorator(handler: Callable) -> Callable:
+            self.add(method, template, handler)
+            return handler
+
+        return decorator
+
+    def match(self, method: str, path: str) -> tuple[Callable, dict[str, Any]] | None:
+        segments = path.strip('/').split('/')
+        params: dict[str, Any] = {}
+        node = self._match(self._root, method, segments, 0, params)
+        return None if node is None else (node.handlers[method], params)
+
+    def _match(
+        self,
+        node: _Node,
+        method: str,
+        segments: list[str],
+        index: int,
+        params: dict[str, Any]
+    ) -> _Node | None:
+        if index == len(segments):
+            return node if method in node.handlers else None
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._match(child, method, segments, index + 1, params)
+            if found is not None:
+                return found
+
+        for name, converter, child in node.params:
+            try:
+                params[name] = converter(segment)
+            except ValueError:
+                continue
+
+            found = self._match(child, method, segments, index + 1, params)
+            if found is not None:
+                return found
+
+            del params[name]
+
+        return None
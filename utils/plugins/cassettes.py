@@ -0,0 +1,70 @@
+"""
+Keep cassettes independent of test selection and xdist.
+
+Requests are counted per test (by node id, without xdist's ``@group``
+suffix) and per class/session fixture while that fixture is set up or torn
+down, so ``pytest tests/test_posts.py`` or ``pytest -n 4`` replays the same
+responses that a full serial run recorded. Under xdist each worker records
+its own cassette and the controller merges them at the end of the run.
+"""
+from pathlib import Path
+
+import pytest
+
+from settings import base_settings
+from utils.clients.http.cassette import (cassette_scope, merge_cassettes, set_cassette_scope,
+                                         worker_cassette_paths)
+from utils.plugins.durations import history_nodeid
+
+# scopes interrupted by class/session fixture teardowns, innermost last
+_teardown_scopes: list[str] = []
+
+
+def _enabled() -> bool:
+    return base_settings.cassette_mode != 'off'
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if base_settings.cassette_mode == 'record' and not hasattr(config, 'workerinput'):
+        # left over by an earlier run with more workers
+        for path in worker_cassette_paths():
+            path.unlink()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    if not _enabled():
+        return (yield)
+
+    with cassette_scope(history_nodeid(item.nodeid)):
+        return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest):
+    if not _enabled() or fixturedef.scope == 'function':
+        return (yield)
+
+    scope = f'{fixturedef.scope}:{fixturedef.argname}'
+    try:
+        with cassette_scope(scope):
+            return (yield)
+    finally:
+        # finalizers run last-in first-out, so this one runs before the fixture's own teardown
+        fixturedef.addfinalizer(lambda: _teardown_scopes.append(set_cassette_scope(scope)))
+
+
+def pytest_fixture_post_finalizer(fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest) -> None:
+    if _enabled() and fixturedef.scope != 'function' and _teardown_scopes:
+        set_cassette_scope(_teardown_scopes.pop())
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if base_settings.cassette_mode != 'record' or hasattr(session.config, 'workerinput'):
+        return
+
+    sources = worker_cassette_paths()
+    if sources:
+        merge_cassettes(sources, Path(base_settings.cassette_path))
+        for path in sources:
+            path.unlink()
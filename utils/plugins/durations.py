@@ -0,0 +1,111 @@
+"""
+Test duration history and longest-processing-time-first scheduling.
+
+Setup, call and teardown durations of every test are stored in the pytest
+cache (``.pytest_cache``) at the end of each run. Once there is a history,
+``pytest -n N`` hands out the longest tests first (LPT), which keeps every
+worker busy until the end instead of leaving them idle at the tail: under
+``--dist load`` (the default) single tests, under ``--dist loadgroup`` (see
+``xdist_group_size``) whole ``xdist_group`` chunks. The terminal summary
+compares the predicted critical path with the actual one. Set
+``longest_first_scheduling=false`` to keep xdist's own order.
+"""
+import heapq
+from collections import Counter
+from statistics import mean
+
+import pytest
+
+from settings import base_settings
+
+HISTORY_KEY = 'gorest/durations'
+PHASES = ('setup', 'call', 'teardown')
+
+durations_key = pytest.StashKey['DurationHistory']()
+
+
+def history_nodeid(nodeid: str) -> str:
+    """Drop the ``@group`` suffix xdist adds under ``--dist loadgroup``."""
+    at = nodeid.rfind('@')
+    return nodeid[:at] if at > nodeid.rfind(']') else nodeid
+
+
+def makespan(durations: list[float], workers: int) -> tuple[float, list[float]]:
+    """Longest-first greedy assignment: return the busiest worker's load and every worker's load."""
+    loads = [0.0] * max(workers, 1)
+    heapq.heapify(loads)
+    for duration in sorted(durations, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+
+    return max(loads), sorted(loads, reverse=True)
+
+
+class DurationHistory:
+    def __init__(self, cache: pytest.Cache | None) -> None:
+        self._cache = cache
+        self.previous: dict[str, list[float]] = cache.get(HISTORY_KEY, {}) if cache is not None else {}
+        self.current: dict[str, list[float]] = {}
+        self.worker_totals: Counter[str] = Counter()
+        self.predicted: float | None = None
+        known = [sum(phases) for phases in self.previous.values()]
+        self._default = mean(known) if known else 1.0
+
+    def predict(self, nodeid: str) -> float:
+        phases = self.previous.get(history_nodeid(nodeid))
+        return sum(phases) if phases is not None else self._default
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        phases = self.current.setdefault(history_nodeid(report.nodeid), [0.0] * len(PHASES))
+        phases[PHASES.index(report.when)] = round(report.duration, 4)
+
+        node = getattr(report, 'node', None)
+        self.worker_totals[node.gateway.id if node is not None else 'main'] += report.duration
+
+    def pytest_sessionfinish(self) -> None:
+        if self._cache is not None and self.current:
+            self._cache.set(HISTORY_KEY, {**self.previous, **self.current})
+
+    def pytest_terminal_summary(self, terminalreporter: pytest.TerminalReporter) -> None:
+        if self.predicted is None or not self.worker_totals:
+            return
+
+        worker, actual = self.worker_totals.most_common(1)[0]
+        terminalreporter.write_sep('-', 'Critical path')
+        terminalreporter.write_line(
+            f'predicted: {self.predicted:.2f}s, actual: {actual:.2f}s ({worker}) '
+            f'over {len(self.worker_totals)} workers'
+        )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # workers report to the controller, which keeps the history
+    if hasattr(config, 'workerinput'):
+        return
+
+    history = DurationHistory(getattr(config, 'cache', None))
+    config.stash[durations_key] = history
+    config.pluginmanager.register(history, 'gorest-durations')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log):
+    dist = config.getoption('dist')
+    history = config.stash.get(durations_key, None)
+    if not base_settings.longest_first_scheduling or dist not in ('load', 'loadgroup'):
+        return None
+
+    if history is None or not history.previous:
+        # nothing to go by on the first run
+        return None
+
+    from utils.plugins.scheduler import LongestFirstLoadScheduling, LongestFirstScheduling, supports_longest_first
+
+    if not supports_longest_first():
+        config.issue_config_time_warning(
+            pytest.PytestWarning(f'this pytest-xdist lacks the internals LPT relies on, falling back to plain {dist}'),
+            stacklevel=2
+        )
+        return None
+
+    scheduling = LongestFirstScheduling if dist == 'loadgroup' else LongestFirstLoadScheduling
+    return scheduling(config, log, history=history)
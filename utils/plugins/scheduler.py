@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Callable
+
+from xdist.scheduler import LoadGroupScheduling, LoadScheduling
+
+from utils.plugins.durations import DurationHistory, makespan
+
+# ``workqueue``, ``pending``, ``_assign_work_unit`` and ``_send_tests`` are xdist
+# internals, checked against pytest-xdist 3.x (pinned below 4 in requirements.txt)
+WorkQueue = OrderedDict[str, dict[str, bool]]
+
+
+def supports_longest_first() -> bool:
+    """Whether the installed xdist still has the internals the override relies on."""
+    return callable(getattr(LoadGroupScheduling, '_assign_work_unit', None)) \
+        and callable(getattr(LoadScheduling, '_send_tests', None))
+
+
+def order_longest_first(workqueue: WorkQueue, predict: Callable[[str], float]) -> dict[str, float]:
+    """Reorder ``workqueue`` in place, longest predicted work unit first, and return the predictions."""
+    predicted = {
+        scope: sum(predict(nodeid) for nodeid in work_unit)
+        for scope, work_unit in workqueue.items()
+    }
+    ordered = sorted(workqueue.items(), key=lambda item: predicted[item[0]], reverse=True)
+    workqueue.clear()
+    workqueue.update(ordered)
+    return predicted
+
+
+class LongestFirstScheduling(LoadGroupScheduling):
+    """
+    ``--dist loadgroup`` that hands out the work unit with the longest
+    recorded duration first (LPT), so the last units to finish are short ones.
+    """
+
+    def __init__(self, config, log=None, *, history: DurationHistory) -> None:
+        super().__init__(config, log)
+        self._history = history
+        self._ordered = False
+
+    def _assign_work_unit(self, node) -> None:
+        # the first call comes once the queue is built, before anything is handed out
+        workqueue = getattr(self, 'workqueue', None)
+        if not self._ordered and isinstance(workqueue, OrderedDict):
+            self._ordered = True
+            predicted = order_longest_first(workqueue, self._history.predict)
+            self._history.predicted, _ = makespan(list(predicted.values()), len(self.nodes))
+
+        super()._assign_work_unit(node)
+
+
+class LongestFirstLoadScheduling(LoadScheduling):
+    """
+    ``--dist load`` that sends the tests with the longest recorded duration
+    first (LPT), still in xdist's chunks.
+    """
+
+    def __init__(self, config, log=None, *, history: DurationHistory) -> None:
+        super().__init__(config, log)
+        self._history = history
+        self._ordered = False
+
+    def _send_tests(self, node, num: int) -> None:
+        # the first call comes once the pending list is built, before anything is sent
+        if not self._ordered and self.collection is not None:
+            self._ordered = True
+            predicted = [self._history.predict(nodeid) for nodeid in self.collection]
+            self.pending.sort(key=predicted.__getitem__, reverse=True)
+            self._history.predicted, _ = makespan(predicted, len(self.nodes))
+
+        super()._send_tests(node, num)
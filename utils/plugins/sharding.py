@@ -0,0 +1,109 @@
+"""
+``--shard i/n``: run the i-th of n balanced slices of the suite (1-based).
+
+Every test (down to each parametrize case) goes to the shard that ranks
+highest for its node id under rendezvous hashing, unless that shard is
+already over ``(1 + SHARD_SLACK)`` times its fair share of the predicted
+duration, in which case it falls through to the next shard in its ranking.
+Tests are placed longest first with the durations history kept in the
+pytest cache (see ``utils.plugins.durations``), so every machine sharing
+that cache computes the same split, and adding a test only moves a few
+others.
+
+Each shard also stores the timings of just the tests it ran under
+``SHARD_TIMINGS_KEY``; ``python -m utils.merge_shards`` folds them (and the
+shards' allure-results) into one cache for the next run.
+"""
+import hashlib
+from statistics import mean
+
+import pytest
+
+from utils.plugins.durations import HISTORY_KEY, durations_key, history_nodeid
+
+SHARD_SLACK = 0.1
+SHARD_TIMINGS_KEY = 'gorest/shard-durations'
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    index, _, total = value.partition('/')
+    try:
+        shard = int(index), int(total)
+    except ValueError:
+        raise pytest.UsageError(f'--shard expects "i/n", got "{value}"') from None
+
+    if not 1 <= shard[0] <= shard[1]:
+        raise pytest.UsageError(f'--shard index must be between 1 and n, got "{value}"')
+
+    return shard
+
+
+def load_durations(config: pytest.Config) -> dict[str, float]:
+    # read straight from the cache: xdist workers collect too and must agree on the split
+    cache = getattr(config, 'cache', None)
+    if cache is None:
+        return {}
+
+    return {nodeid: sum(phases) for nodeid, phases in cache.get(HISTORY_KEY, {}).items()}
+
+
+def _rank(nodeid: str, shard: int) -> int:
+    return int.from_bytes(hashlib.blake2b(f'{nodeid}\0{shard}'.encode(), digest_size=8).digest(), 'big')
+
+
+def assign_shards(nodeids: list[str], durations: dict[str, float], total: int) -> dict[str, int]:
+    """Map every node id to a shard in ``range(total)`` (bounded-load rendezvous hashing)."""
+    default = mean(durations.values()) if durations else 1.0
+    weights = {nodeid: durations.get(nodeid, default) for nodeid in nodeids}
+    capacity = (1 + SHARD_SLACK) * sum(weights.values()) / total
+    loads = [0.0] * total
+    assignment = {}
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-weights[nodeid], nodeid)):
+        ranking = sorted(range(total), key=lambda shard: _rank(nodeid, shard), reverse=True)
+        shard = next(
+            (shard for shard in ranking if loads[shard] + weights[nodeid] <= capacity),
+            min(ranking, key=lambda shard: loads[shard])
+        )
+        loads[shard] += weights[nodeid]
+        assignment[nodeid] = shard
+
+    return assignment
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.getgroup('gorest').addoption(
+        '--shard',
+        default=None,
+        help='Run only shard "i/n" (1-based) of the suite, balanced by recorded durations.'
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    value = config.getoption('shard')
+    if value is None:
+        return
+
+    index, total = parse_shard(value)
+    assignment = assign_shards(
+        [history_nodeid(item.nodeid) for item in items],
+        load_durations(config),
+        total
+    )
+    selected, deselected = [], []
+    for item in items:
+        (selected if assignment[history_nodeid(item.nodeid)] == index - 1 else deselected).append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    value = session.config.getoption('shard')
+    history = session.config.stash.get(durations_key, None)
+    cache = getattr(session.config, 'cache', None)
+    if value is None or history is None or cache is None or not history.current:
+        return
+
+    cache.set(SHARD_TIMINGS_KEY, history.current)
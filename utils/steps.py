@@ -0,0 +1,168 @@
+"""
+Allure steps that cost (almost) nothing when nobody collects them.
+
+The instrumentation level decides which tests record steps:
+
+- ``off``: no test does; decorated calls go straight to the wrapped function
+  and step names are never formatted.
+- ``sampled``: every ``sample_every``-th test does.
+- ``full``: every test does.
+
+``begin_test`` is called once per test and flips a single flag that the
+decorators check on every call. ``allure`` itself is only imported once a
+step is actually opened.
+
+``allure.step`` nests every step under the last one opened in the thread,
+so steps of coroutines running concurrently (``asyncio.gather``) would end
+up inside each other. ``async_step`` therefore keeps the open step of each
+task in a context variable, which tasks inherit from the code that created
+them, and adds its steps to that step (or to the step or test that was
+open when the first one started) itself.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from enum import Enum
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ContextManager, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from allure_commons.model2 import ExecutableItem
+
+T = TypeVar('T')
+
+
+class InstrumentationLevel(str, Enum):
+    OFF = 'off'
+    SAMPLED = 'sampled'
+    FULL = 'full'
+
+
+_level = InstrumentationLevel.FULL
+_sample_every = 10
+_tests_seen = 0
+_enabled = True
+_task_step: ContextVar['ExecutableItem | None'] = ContextVar('task_step', default=None)
+
+
+def set_instrumentation_level(level: InstrumentationLevel | str, sample_every: int | None = None) -> None:
+    global _level, _sample_every, _enabled
+    _level = InstrumentationLevel(level)
+    if sample_every is not None:
+        _sample_every = max(sample_every, 1)
+
+    _enabled = _level is InstrumentationLevel.FULL
+
+
+def get_instrumentation_level() -> InstrumentationLevel:
+    return _level
+
+
+def begin_test() -> None:
+    """Decide whether the test that is about to run records steps."""
+    global _tests_seen, _enabled
+    if _level is InstrumentationLevel.SAMPLED:
+        _enabled = _tests_seen % _sample_every == 0
+        _tests_seen += 1
+    else:
+        _enabled = _level is InstrumentationLevel.FULL
+
+
+def steps_enabled() -> bool:
+    return _enabled
+
+
+def _step_title(title: str, func: Callable, args: tuple, kwargs: dict) -> tuple[str, dict[str, str]]:
+    from allure_commons.utils import func_parameters, represent
+
+    params = func_parameters(func, *args, **kwargs)
+    return title.format(*map(represent, args), **params), params
+
+
+def _open_step(title: str, func: Callable, args: tuple, kwargs: dict) -> ContextManager:
+    import allure
+
+    return allure.step(_step_title(title, func, args, kwargs)[0])
+
+
+def _current_item() -> 'ExecutableItem | None':
+    """The step or test the allure pytest plugin would nest a new step under, if it is running."""
+    from allure_commons import plugin_manager
+    from allure_commons.model2 import ExecutableItem
+
+    for plugin in plugin_manager.get_plugins():
+        reporter = getattr(plugin, 'allure_logger', None)
+        if reporter is not None:
+            return reporter.get_last_item(ExecutableItem)
+
+    return None
+
+
+@contextmanager
+def _open_task_step(title: str, func: Callable, args: tuple, kwargs: dict) -> Iterator[None]:
+    from allure_commons.model2 import Parameter, TestStepResult
+    from allure_commons.utils import now
+    from allure_pytest.utils import get_status, get_status_details
+
+    parent = _task_step.get() or _current_item()
+    if parent is None:
+        yield
+        return
+
+    name, params = _step_title(title, func, args, kwargs)
+    step = TestStepResult(
+        name=name, start=now(), parameters=[Parameter(name=key, value=value) for key, value in params.items()]
+    )
+    parent.steps.append(step)
+    token = _task_step.set(step)
+    try:
+        yield
+    except BaseException as error:
+        step.status = get_status(error)
+        step.statusDetails = get_status_details(type(error), error, error.__traceback__)
+        raise
+    else:
+        step.status = get_status(None)
+    finally:
+        _task_step.reset(token)
+        step.stop = now()
+
+
+def step_context(title: str) -> ContextManager:
+    if not _enabled:
+        return nullcontext()
+
+    import allure
+
+    return allure.step(title)
+
+
+def step(title: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """``allure.step`` that only formats and opens the step when steps are enabled."""
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @wraps(func)
+        def impl(*args: Any, **kwargs: Any) -> T:
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with _open_step(title, func, args, kwargs):
+                return func(*args, **kwargs)
+
+        return impl
+
+    return decorator
+
+
+def async_step(title: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """``step`` for coroutines: the step stays open until the coroutine finishes, and is task-local."""
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def impl(*args: Any, **kwargs: Any) -> T:
+            if not _enabled:
+                return await func(*args, **kwargs)
+
+            with _open_task_step(title, func, args, kwargs):
+                return await func(*args, **kwargs)
+
+        return impl
+
+    return decorator
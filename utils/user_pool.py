@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+import json
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+from filelock import FileLock
+
+from base.api.users_api import AsyncUsersClient
+from models.authentication import Authentication
+from models.users import DefaultUser
+from utils.clients.http.builder import get_async_http_client
+
+
+class UserPool:
+    """
+    Users created once per session and leased round-robin to tests that only
+    need a parent resource (e.g. for posts and todos).
+
+    With ``state_path`` set the pool is shared between ``pytest-xdist``
+    workers: the first worker creates the users and stores them in that file,
+    the others reuse them, and the last worker to finish deletes them.
+    """
+
+    def __init__(self, size: int, state_path: Path | None = None, cleanup: bool = True) -> None:
+        self.size = size
+        self.cleanup = cleanup
+        self._state_path = state_path
+        self._lock = threading.Lock()
+        self._users: list[DefaultUser] = []
+        self._leases: Iterator[DefaultUser] | None = None
+
+    def fill(self) -> None:
+        with self._lock:
+            if self._leases is None:
+                # sorted, so a key leases the same user however the creates completed
+                self._users = sorted(self._acquire_users(), key=lambda user: user.id)
+                self._leases = itertools.cycle(self._users)
+
+    def lease(self, key: str | None = None) -> DefaultUser:
+        """Next user round-robin, or always the same user for the same ``key`` (e.g. a test id)."""
+        self.fill()
+        with self._lock:
+            if key is not None:
+                return self._users[zlib.crc32(key.encode()) % len(self._users)]
+
+            return next(self._leases)
+
+    def release(self) -> None:
+        """Give the pool back, deleting its users if nobody else uses them."""
+        with self._lock:
+            if self._leases is None:
+                return
+
+            self._leases = None
+            if self._state_path is None:
+                users = self._users
+            else:
+                users = self._release_shared()
+
+            if self.cleanup and users:
+                asyncio.run(self._delete_users(users))
+
+    def _acquire_users(self) -> list[DefaultUser]:
+        if self._state_path is None:
+            return asyncio.run(self._create_users())
+
+        with FileLock(f'{self._state_path}.lock'):
+            if self._state_path.exists():
+                state = json.loads(self._state_path.read_text())
+            else:
+                users = asyncio.run(self._create_users())
+                state = {'users': [user.model_dump() for user in users], 'workers': 0}
+
+            state['workers'] += 1
+            self._state_path.write_text(json.dumps(state))
+
+        return [DefaultUser(**user) for user in state['users']]
+
+    def _release_shared(self) -> list[DefaultUser]:
+        with FileLock(f'{self._state_path}.lock'):
+            state = json.loads(self._state_path.read_text())
+            state['workers'] -= 1
+            if state['workers'] > 0:
+                self._state_path.write_text(json.dumps(state))
+                return []
+
+            self._state_path.unlink()
+            return self._users
+
+    async def _create_users(self) -> list[DefaultUser]:
+        async with get_async_http_client(auth=Authentication()) as client:
+            users_client = AsyncUsersClient(client=client)
+            results = await asyncio.gather(
+                *(users_client.create_user() for _ in range(self.size)),
+                return_exceptions=True
+            )
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if not errors:
+                return list(results)
+
+            # the pool is never filled, so nobody would release the users that were created
+            if self.cleanup:
+                await asyncio.gather(
+                    *(users_client.delete_user_api(user.id) for user in results if isinstance(user, DefaultUser)),
+                    return_exceptions=True
+                )
+            raise errors[0]
+
+    async def _delete_users(self, users: list[DefaultUser]) -> None:
+        async with get_async_http_client(auth=Authentication()) as client:
+            users_client = AsyncUsersClient(client=client)
+            await asyncio.gather(
+                *(users_client.delete_user_api(user.id) for user in users)
+            )